@@ -0,0 +1,232 @@
+"""
+Record/replay of BAML function calls and streams.
+
+In record mode every call made through the agents' BAML clients goes to the model and is saved to a cassette
+(a json file) together with its timing: the total duration and, for streams, when each partial result arrived.
+In replay mode the same calls are answered from the cassette, optionally with the original timing scaled by
+`speed` (1.0 = as recorded, 0 = instant), so the whole pipeline runs offline.
+
+    with use_cassette(path, mode="record"):
+        await handle_user_message(...)
+
+Calls are matched by function name and a hash of their arguments; when the arguments changed (e.g. a prompt
+was edited) the next unused recording of the same function is used instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+
+from breba_app.llm_cache import cache_key
+from breba_app.llm_metrics import instrument
+
+logger = logging.getLogger(__name__)
+
+# Modules whose `b` is the instrumented BAML client, and the generated client each one wraps
+PATCHED_MODULES = {
+    "breba_app.coder_agent.agent": "breba_app.coder_agent.baml_client.async_client",
+    "breba_app.coder_agent.scaffold": "breba_app.coder_agent.baml_client.async_client",
+    "breba_app.template_agent.agent": "breba_app.template_agent.baml_client.async_client",
+}
+
+
+class ReplayMissError(LookupError):
+    pass
+
+
+def to_json(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {"__type__": f"{cls.__module__}:{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    return value
+
+
+def from_json(value: Any) -> Any:
+    if isinstance(value, dict) and "__type__" in value:
+        module, name = value["__type__"].split(":")
+        return getattr(importlib.import_module(module), name).model_validate(value["data"])
+    if isinstance(value, list):
+        return [from_json(v) for v in value]
+    return value
+
+
+@dataclass
+class Recording:
+    function: str
+    key: str
+    result: Any
+    duration_ms: float
+    # (ms since the call started, partial result) for streams, None for plain calls
+    partials: list[tuple[float, Any]] | None = None
+
+
+@dataclass
+class Cassette:
+    path: Path
+    recordings: list[Recording] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._by_key: dict[tuple[str, str], deque[Recording]] = defaultdict(deque)
+        self._by_function: dict[str, deque[Recording]] = defaultdict(deque)
+        for recording in self.recordings:
+            self._by_key[(recording.function, recording.key)].append(recording)
+            self._by_function[recording.function].append(recording)
+        self._used: set[int] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        recordings = []
+        if path.exists():
+            for item in json.loads(path.read_text(encoding="utf-8")):
+                partials = item.get("partials")
+                recordings.append(Recording(
+                    function=item["function"], key=item["key"], result=item["result"],
+                    duration_ms=item["duration_ms"],
+                    partials=[(t, value) for t, value in partials] if partials is not None else None))
+        return cls(path, recordings)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps([asdict(recording) for recording in self.recordings], indent=2),
+                             encoding="utf-8")
+
+    def add(self, recording: Recording) -> None:
+        self.recordings.append(recording)
+
+    def _take(self, queue: deque[Recording]) -> Recording | None:
+        while queue:
+            recording = queue.popleft()
+            if id(recording) not in self._used:
+                self._used.add(id(recording))
+                return recording
+        return None
+
+    def next(self, function: str, key: str) -> Recording:
+        recording = self._take(self._by_key[(function, key)])
+        if recording is None:
+            recording = self._take(self._by_function[function])
+            if recording is not None:
+                logger.warning(f"Arguments of {function} changed since recording, replaying the next recording")
+        if recording is None:
+            raise ReplayMissError(f"No recording left for {function} in {self.path}")
+        return recording
+
+
+def _key(function: str, args: tuple, kwargs: dict) -> str:
+    return cache_key(function, "", args, kwargs)
+
+
+class _RecordingStream:
+    def __init__(self, function: str, key: str, stream, cassette: Cassette):
+        self._function, self._key, self._stream, self._cassette = function, key, stream, cassette
+        self._started = time.perf_counter()
+        self._partials: list[tuple[float, Any]] = []
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    async def __aiter__(self):
+        async for partial in self._stream:
+            self._partials.append((self._elapsed_ms(), to_json(partial)))
+            yield partial
+
+    async def get_final_response(self):
+        result = await self._stream.get_final_response()
+        self._cassette.add(Recording(self._function, self._key, to_json(result), self._elapsed_ms(), self._partials))
+        return result
+
+
+class _ReplayStream:
+    def __init__(self, recording: Recording, speed: float):
+        self._recording, self._speed = recording, speed
+        self._started = time.perf_counter()
+
+    async def _until(self, ms: float) -> None:
+        delay = ms * self._speed / 1000 - (time.perf_counter() - self._started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __aiter__(self):
+        for at_ms, partial in self._recording.partials or []:
+            await self._until(at_ms)
+            yield from_json(partial)
+
+    async def get_final_response(self):
+        await self._until(self._recording.duration_ms)
+        return from_json(self._recording.result)
+
+
+class _ReplayStreamClient:
+    def __init__(self, stream_client, cassette: Cassette, mode: str, speed: float):
+        self._stream_client, self._cassette, self._mode, self._speed = stream_client, cassette, mode, speed
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            return getattr(self._stream_client, name)
+
+        def stream(*args, baml_options: dict | None = None, **kwargs):
+            key = _key(name, args, kwargs)
+            if self._mode == "record":
+                return _RecordingStream(name, key, getattr(self._stream_client, name)(
+                    *args, baml_options=baml_options or {}, **kwargs), self._cassette)
+            return _ReplayStream(self._cassette.next(name, key), self._speed)
+
+        return stream
+
+
+class ReplayBamlClient:
+    """Stands in for a generated BamlAsyncClient, recording to or replaying from a cassette"""
+
+    def __init__(self, client, cassette: Cassette, *, mode: str = "replay", speed: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode {mode}")
+        self._client, self.cassette, self._mode, self._speed = client, cassette, mode, speed
+        self.stream = _ReplayStreamClient(client.stream, cassette, mode, speed)
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            return getattr(self._client, name)
+
+        async def call(*args, baml_options: dict | None = None, **kwargs):
+            key = _key(name, args, kwargs)
+            if self._mode == "record":
+                started = time.perf_counter()
+                result = await getattr(self._client, name)(*args, baml_options=baml_options or {}, **kwargs)
+                self.cassette.add(Recording(name, key, to_json(result), (time.perf_counter() - started) * 1000))
+                return result
+            recording = self.cassette.next(name, key)
+            await asyncio.sleep(recording.duration_ms * self._speed / 1000)
+            return from_json(recording.result)
+
+        return call
+
+
+@contextmanager
+def use_cassette(path: Path, *, mode: str = "replay", speed: float = 1.0) -> Iterator[Cassette]:
+    """Route the agents' BAML calls through a cassette, recordings are saved on exit in record mode"""
+    cassette = Cassette.load(path) if mode == "replay" else Cassette(path)
+    originals = {}
+    for module_name, client_module in PATCHED_MODULES.items():
+        module = importlib.import_module(module_name)
+        client = importlib.import_module(client_module).b
+        originals[module] = module.b
+        module.b = instrument(ReplayBamlClient(client, cassette, mode=mode, speed=speed))
+    try:
+        yield cassette
+    finally:
+        for module, original in originals.items():
+            module.b = original
+        if mode == "record":
+            cassette.save()
@@ -0,0 +1,134 @@
+"""
+Offline end-to-end benchmark of the agent pipeline (edit_product, start_product, handle_file_upload).
+
+Model calls are replayed from cassettes in benchmarks/cassettes (see benchmarks/baml_replay.py) and the files
+live in an InMemoryFileStore, so nothing leaves the machine. Every scenario runs twice: with the recorded model
+timing, and with instant model responses. The second number is our own overhead (prompt building, file
+selection, edit application, ...) separated from model latency.
+
+    python -m benchmarks.pipeline             # replay the cassettes
+    python -m benchmarks.pipeline --record    # call the models and (re)record the cassettes, needs API keys
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+from benchmarks.baml_replay import use_cassette
+from breba_app.filesystem import in_memory_store, InMemoryFileStore
+from breba_app.orchestrator import handle_user_message, handle_file_upload, save_state, OrchestratorState
+from breba_app.template_agent.memory_store import save_state as save_template_state, TemplateAgentState
+from evals.loader import load_initial_files, load_messages
+
+ROOT = Path(__file__).parent.parent
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+CASES_DIR = ROOT / "evals" / "cases" / "orchestrator_evals"
+
+USER_NAME = "benchmark_user"
+NEW_SITE_REQUEST = ("Build a one page website for a neighborhood bakery called Crumb & Co. "
+                    "It needs a hero, a menu with prices, opening hours and a contact section.")
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[], Awaitable[None]]
+
+
+async def _coder_completed(_user_name, _product_id, _file_store):
+    return
+
+
+async def _consume(stream_or_text):
+    if hasattr(stream_or_text, "__aiter__"):
+        async for _ in stream_or_text:
+            pass
+
+
+def _load_case_state(case: str, product_id: str):
+    case_dir = CASES_DIR / case
+    store = in_memory_store.from_raw_strings(load_initial_files(case_dir))
+    save_state(USER_NAME, product_id, OrchestratorState([], "", store))
+    return case_dir
+
+
+async def run_edit_product() -> None:
+    case_dir = _load_case_state("modify_text", "bench_edit")
+    message = next(m.content for m in reversed(load_messages(case_dir)) if m.role == "user")
+    await handle_user_message(USER_NAME, "bench_edit", message, _coder_completed, _consume)
+
+
+async def run_start_product() -> None:
+    save_state(USER_NAME, "bench_start", OrchestratorState([], "", InMemoryFileStore()))
+    save_template_state(USER_NAME, "bench_start", TemplateAgentState(messages=[]))
+    await handle_user_message(USER_NAME, "bench_start", NEW_SITE_REQUEST, _coder_completed, _consume)
+
+
+async def run_file_upload() -> None:
+    case_dir = _load_case_state("upload_files", "bench_upload")
+    message = next(m.content for m in reversed(load_messages(case_dir)) if m.role == "user")
+    assets = case_dir / "assets"
+    files = [(str(assets / "Limitations.jpeg"), "home.png"), (str(assets / "Goals.jpeg"), "Goals.jpeg")]
+    with patch("breba_app.tools.upload_files.save_image_file_to_private",
+               side_effect=["https://example.com/file1.jpeg", "https://example.com/file2.jpeg"]):
+        await handle_file_upload(USER_NAME, "bench_upload", files, message, _coder_completed, _consume)
+
+
+SCENARIOS = [
+    Scenario("edit_product", run_edit_product),
+    Scenario("start_product", run_start_product),
+    Scenario("handle_file_upload", run_file_upload),
+]
+
+
+async def _no_executive_summary_write(*_args, **_kwargs):
+    return
+
+
+async def _timed(scenario: Scenario, *, mode: str, speed: float) -> float:
+    started = time.perf_counter()
+    # The executive summary is written to Mongo, everything else already runs in memory
+    with patch("breba_app.orchestrator.set_product_executive_summary", _no_executive_summary_write), \
+            use_cassette(CASSETTES_DIR / f"{scenario.name}.json", mode=mode, speed=speed):
+        await scenario.run()
+    return time.perf_counter() - started
+
+
+async def run(names: list[str], *, record: bool, repeat: int) -> None:
+    for scenario in SCENARIOS:
+        if names and scenario.name not in names:
+            continue
+        if record:
+            elapsed = await _timed(scenario, mode="record", speed=1.0)
+            print(f"{scenario.name:<20} recorded in {elapsed:.2f}s")
+            continue
+        if not (CASSETTES_DIR / f"{scenario.name}.json").exists():
+            print(f"{scenario.name:<20} no cassette, record one with --record")
+            continue
+        wall = await _timed(scenario, mode="replay", speed=1.0)
+        overhead = statistics.median([await _timed(scenario, mode="replay", speed=0) for _ in range(repeat)])
+        print(f"{scenario.name:<20} wall {wall:7.2f}s  overhead {overhead * 1000:8.1f}ms  "
+              f"model {max(0.0, wall - overhead):7.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"any of {[s.name for s in SCENARIOS]}, all by default")
+    parser.add_argument("--record", action="store_true", help="call the models and record new cassettes")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of the instant replay, the median is reported")
+    args = parser.parse_args()
+
+    # Also silences the ui_bus signals that fail without a chainlit context
+    logging.disable(logging.ERROR)
+    asyncio.run(run(args.scenarios, record=args.record, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Benchmarks for the search/replace editing engine (breba_app/search_replace_editing.py).
+
+Runs synthetic coder responses against generated HTML pages of increasing size, plus the recorded
+coder responses from tests/, and compares the timings with benchmarks/baselines/search_replace.json.
+
+    python -m benchmarks.search_replace                    # compare with the baseline, exit 1 on regressions
+    python -m benchmarks.search_replace --update-baseline  # record a new baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from breba_app.search_replace_editing import (
+    update_blocks_gen, apply_edits_many, replace_most_similar_chunk, try_dotdotdots, find_similar_lines,
+    apply_search_replace_many, ApplyEditsError, HEAD_ERR, DIVIDER_ERR, UPDATED_ERR,
+)
+
+ROOT = Path(__file__).parent.parent
+BASELINE_PATH = Path(__file__).parent / "baselines" / "search_replace.json"
+
+SIZES = (1_000, 10_000, 100_000)
+# A case regresses when it is both THRESHOLD slower (relative) and NOISE_FLOOR_S slower (absolute) than the baseline
+THRESHOLD = 0.5
+NOISE_FLOOR_S = 0.005
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]
+    repeat: int = 5
+
+
+# ----------------------------- Generated inputs ----------------------------- #
+
+def generate_html(lines: int) -> str:
+    """A landing-page-like document with nested, indented sections, exactly `lines` lines long"""
+    head = ["<!DOCTYPE html>", '<html lang="en">', "<head>", '    <meta charset="UTF-8">',
+            "    <title>Benchmark Page</title>", '    <link rel="stylesheet" href="styles.css">', "</head>", "<body>"]
+    tail = ['    <script src="script.js"></script>', "</body>", "</html>"]
+    section = [
+        '    <section id="section-{i}" class="section">',
+        '        <div class="container">',
+        '            <h2 class="section-title">Section {i}</h2>',
+        '            <p class="lead">Short description of section {i} for the page.</p>',
+        '            <ul class="features">',
+        '                <li class="feature">Feature A of {i}</li>',
+        '                <li class="feature">Feature B of {i}</li>',
+        "            </ul>",
+        '            <a class="btn btn-primary" href="#contact">Contact us</a>',
+        "        </div>",
+        "    </section>",
+    ]
+    body = []
+    i = 0
+    while len(body) + len(section) <= lines - len(head) - len(tail):
+        body.extend(line.format(i=i) for line in section)
+        i += 1
+    while len(body) < lines - len(head) - len(tail):
+        body.append("    <!-- filler -->")
+    return "\n".join(head + body + tail) + "\n"
+
+
+def section_lines(i: int) -> str:
+    return (f'            <h2 class="section-title">Section {i}</h2>\n'
+            f'            <p class="lead">Short description of section {i} for the page.</p>\n')
+
+
+def block(path: str, search: str, replace: str) -> str:
+    return f"{path}\n```html\n{HEAD_ERR}\n{search}{DIVIDER_ERR}\n{replace}{UPDATED_ERR}\n```\n\n"
+
+
+def synthetic_response(sections: int, blocks: int) -> str:
+    """A coder response with `blocks` exact-match edits spread over the page"""
+    step = max(1, sections // blocks)
+    response = "I will update the section titles.\n\n"
+    for i in range(0, step * blocks, step):
+        response += block("index.html", section_lines(i), section_lines(i).replace("Section", "Chapter"))
+    return response
+
+
+def strip_indent(text: str) -> str:
+    return "".join(line.lstrip(" ") for line in text.splitlines(keepends=True))
+
+
+# ---------------------------------- Cases ---------------------------------- #
+
+def synthetic_cases(lines: int) -> list[Case]:
+    page = generate_html(lines)
+    sections = (lines - 11) // 11
+    last = sections - 1
+    response = synthetic_response(sections, blocks=20)
+    edits = list(update_blocks_gen(response))
+
+    exact = section_lines(last)
+    drift = strip_indent(exact)
+    elided = (f'            <h2 class="section-title">Section {last}</h2>\n...\n'
+              f'                <li class="feature">Feature B of {last}</li>\n')
+    elided_replace = (f'            <h2 class="section-title">Chapter {last}</h2>\n...\n'
+                      f'                <li class="feature">Feature Z of {last}</li>\n')
+    missing = ('            <h2 class="section-title">Section missing</h2>\n'
+               '            <p class="lead">This description does not exist on the page.</p>\n')
+
+    def failure_hint():
+        try:
+            apply_search_replace_many({"index.html": page}, block("index.html", missing, exact))
+        except ApplyEditsError as e:
+            return e
+
+    repeat = 1 if lines >= 100_000 else 5
+    return [
+        Case(f"update_blocks_gen/20_blocks/{lines}", lambda: list(update_blocks_gen(response)), repeat),
+        Case(f"apply_edits_many/20_exact/{lines}", lambda: apply_edits_many({"index.html": page}, edits), repeat),
+        Case(f"replace_most_similar_chunk/exact/{lines}",
+             lambda: replace_most_similar_chunk(page, exact, exact.upper()), repeat),
+        Case(f"replace_most_similar_chunk/whitespace_drift/{lines}",
+             lambda: replace_most_similar_chunk(page, drift, drift.upper()), repeat),
+        Case(f"try_dotdotdots/elision/{lines}", lambda: try_dotdotdots(page, elided, elided_replace), repeat),
+        Case(f"find_similar_lines/{lines}", lambda: find_similar_lines(missing, page), repeat),
+        Case(f"apply_search_replace_many/failure_hint/{lines}", failure_hint, repeat),
+    ]
+
+
+def load_dir_texts(dir_path: Path) -> dict[str, str]:
+    if not dir_path.exists():
+        return {}
+    return {p.relative_to(dir_path).as_posix(): p.read_text(encoding="utf-8")
+            for p in dir_path.rglob("*") if p.is_file()}
+
+
+def recorded_cases() -> list[Case]:
+    """Coder responses recorded for the integration tests, applied to their initial files"""
+    cases = []
+    cases_root = ROOT / "tests" / "integration" / "coder_agent_test_cases"
+    for case_dir in sorted(p for p in cases_root.iterdir() if p.is_dir()):
+        initial = load_dir_texts(case_dir / "initial")
+        llm_output = (case_dir / "llm_output.txt").read_text(encoding="utf-8")
+
+        def run(initial=initial, llm_output=llm_output):
+            try:
+                return apply_search_replace_many(dict(initial), llm_output)
+            except ApplyEditsError as e:
+                return e
+
+        cases.append(Case(f"recorded/{case_dir.name}", run))
+
+    fixtures = ROOT / "tests" / "fixtures"
+    original = (fixtures / "original_two_sections.html").read_text(encoding="utf-8")
+    two_sections = (fixtures / "search_replace_two_sections.txt").read_text(encoding="utf-8")
+    cases.append(Case("recorded/two_sections",
+                      lambda: apply_search_replace_many({"index.html": original}, two_sections)))
+    return cases
+
+
+# -------------------------------- Runner ----------------------------------- #
+
+def time_case(case: Case) -> float:
+    """Median wall time in seconds"""
+    timings = []
+    for _ in range(case.repeat):
+        start = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def find_regressions(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    regressions = []
+    for name, seconds in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if seconds > expected * (1 + threshold) and seconds - expected > NOISE_FLOOR_S:
+            regressions.append(f"{name}: {seconds * 1000:.1f}ms vs baseline {expected * 1000:.1f}ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Generated page sizes in lines")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args(argv)
+    # the engine logs whole file contents on failed matches, which would drown the report
+    logging.disable(logging.ERROR)
+
+    cases = recorded_cases()
+    for size in args.sizes:
+        cases.extend(synthetic_cases(size))
+
+    results: dict[str, float] = {}
+    for case in cases:
+        results[case.name] = time_case(case)
+        print(f"{case.name:<60} {results[case.name] * 1000:>10.2f}ms")
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+        baseline.update(results)
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print(f"No baseline at {BASELINE_PATH}, run with --update-baseline first")
+        return 0
+
+    regressions = find_regressions(results, json.loads(BASELINE_PATH.read_text(encoding="utf-8")), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"- {regression}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import AsyncIterable
+from typing import AsyncIterable, Callable
 
 from baml_py import BamlStream
 
-from breba_app.coder_agent.baml_client.async_client import b
-from breba_app.coder_agent.baml_client.types import LLMMessage
-from breba_app.filesystem import FileStore
-from breba_app.search_replace_editing import apply_search_replace_many, ApplyEditsError
+from breba_app.coder_agent.baml_client.async_client import b as baml_client
+from breba_app.coder_agent.baml_client.inlinedbaml import get_baml_files
+from breba_app.coder_agent.baml_client.types import LLMMessage, FileList, FileEditTask
+from breba_app.coder_agent.file_ranker import select_files_to_edit, latest_user_request
+from breba_app.coder_agent.file_windows import render_file_window, render_file_regions
+from breba_app.coder_agent.live_preview import LivePreview
+from breba_app.coder_agent.model_router import model_router, RoutingFeatures
+from breba_app.coder_agent.quick_edits import match_quick_edit, QuickEdit
+from breba_app.coder_agent.scaffold import scaffold_site
+from breba_app.coder_agent.site_outline import page_spec, relevant_sections
+from breba_app.filesystem import FileStore, OverlayFileStore
+from breba_app.llm_cache import cached_llm_call, baml_client_of
+from breba_app.llm_executor import llm_executor, SHORT_DEADLINE_SECONDS
+from breba_app.llm_metrics import instrument
+from breba_app.search_replace_editing import apply_search_replace_many, apply_edits_many, ApplyEditsError, \
+    EditRequest, find_similar_region
 
 logger = logging.getLogger(__name__)
 
+b = instrument(baml_client)
+
 NO_FILES_TO_MODIFY_MSG = "No files to modify for this request"
 MAX_RETRIES = 3
-
-
-def _snapshot(fs: FileStore) -> dict[str, str]:
-    return {p: fs.read_text(p) for p in fs.list_files()}
-
-
-def _modified_files(before: dict[str, str], after: dict[str, str]) -> list[str]:
-    out: list[str] = []
-    for path, after_content in after.items():
-        before_content = before.get(path)
-        if before_content is None or before_content != after_content:
-            out.append(path)
-    return sorted(out)
+# Planning costs an extra round trip, per-file generation only pays off when several files change
+MIN_PARALLEL_FILES = 3
+MAX_PARALLEL_FILE_EDITS = 4
+SUPPORT_FILES = frozenset({"sitemap.xml", "robots.txt"})
 
 
 def _render_file(file_name: str, file_content: str) -> str:
@@ -37,26 +44,107 @@ def _render_file(file_name: str, file_content: str) -> str:
 """
 
 
-def _render_files(files: set[str], filestore: FileStore) -> str:
-    response = ""
-    for file_name in files:
+def _render_file_blocks(files: set[str], filestore: FileStore, *, query: str = "", widen: int = 0) -> dict[str, str]:
+    """
+    Rendered file per path, in path order so the same files always produce the same prompt text.
+    With a query, large files are reduced to the regions relevant to it, widen grows those regions (see file_windows)
+    """
+    blocks = {}
+    for file_name in sorted(files):
         if not filestore.file_exists(file_name):
             continue
         file_content = filestore.read_text(file_name)
-        response += _render_file(file_name, file_content)
-    return response
+        window = render_file_window(file_name, file_content, query, widen=widen) if query else None
+        blocks[file_name] = window or _render_file(file_name, file_content)
+    return blocks
+
+
+def _render_files(files: set[str], filestore: FileStore, *, query: str = "", widen: int = 0) -> str:
+    return "".join(_render_file_blocks(files, filestore, query=query, widen=widen).values())
 
 
 def _retry_err_message(e: Exception | str) -> str:
     return f"I tried to use your search and replace blocks and ran into the following errors, please fix them:\n{str(e)}"
 
 
+def _first_line(text: str) -> str:
+    return next((line.strip() for line in text.splitlines() if line.strip()), "")
+
+
+def _applied_edits_summary(edits: list[EditRequest]) -> str:
+    if not edits:
+        return ""
+    summary = "\nThese edits are already applied, the files below include them:\n"
+    for edit in edits:
+        if edit.search:
+            summary += f"- {edit.path}: `{_first_line(edit.search)}` -> `{_first_line(edit.replace)}`\n"
+        else:
+            summary += f"- {edit.path}: added `{_first_line(edit.replace)}`\n"
+    return summary
+
+
+def _render_retry_files(e: ApplyEditsError, files: FileStore, *, query: str, widen: int) -> dict[str, str]:
+    """
+    Only the files the failed blocks targeted, in their current (partially edited) state.
+    Large files are reduced to the regions around the closest matches of the failed SEARCH blocks.
+    """
+    contents: dict[str, str] = {}
+    regions: dict[str, list[tuple[int, int]]] = {}
+    unlocated = set()
+    for failed in e.failed_edits:
+        path = failed.edit.path
+        if not files.file_exists(path):
+            continue
+        if path not in contents:
+            contents[path] = files.read_text(path)
+            regions[path] = []
+        # failed.region is relative to the content the edit was tried on, the edits that applied after it in the
+        # same batch may have moved the lines since
+        region = find_similar_region(failed.edit.search, contents[path]) if failed.edit.search else None
+        if region:
+            regions[path].append(region)
+        else:
+            unlocated.add(path)
+
+    blocks = {}
+    for path in sorted(regions):
+        content = contents[path]
+        if path in unlocated:
+            # A failed block without a close match gives no region, fall back to the request based window
+            window = render_file_window(path, content, query, widen=widen)
+        else:
+            window = render_file_regions(path, content, regions[path], widen=widen)
+        blocks[path] = window or _render_file(path, content)
+    return blocks
+
+
+def _block_digest(block: str) -> str:
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()
+
+
+def _unsent_blocks(blocks: dict[str, str], sent: set[str]) -> str:
+    """The blocks whose exact text is not in the prompt yet, sent is updated with them"""
+    response = ""
+    for block in blocks.values():
+        digest = _block_digest(block)
+        if digest not in sent:
+            sent.add(digest)
+            response += block
+    return response
+
+
 def _files_to_edit_message(file_contents: str) -> LLMMessage:
     return LLMMessage(role="user",
                       content=f"The following files are available for editing. Do not edit any other files.\n"
                               f"<files_available_for_editing>\n{file_contents}\n</files_available_for_editing>")
 
 
+def _retry_files_message(file_contents: str) -> LLMMessage:
+    return LLMMessage(role="user",
+                      content=f"The files your blocks targeted now look like this.\n"
+                              f"<files_available_for_editing>\n{file_contents}\n</files_available_for_editing>")
+
+
 async def _get_first_word(stream: AsyncIterable[str]):
     buffer = ""
     async for token in stream:
@@ -76,16 +164,28 @@ async def _to_user_stream(first_msg: str, stream: AsyncIterable[str]) -> AsyncIt
 async def stream_user_response_or_coder(*, messages: list[LLMMessage], filestore: FileStore) \
         -> BamlStream:
     # TODO: should read spec
-    if filestore.file_exists("index.html"):
-        spec = filestore.read_text("index.html")
-    else:
-        spec = ""
-    return b.stream.UserResponseOrCoder(messages, spec, filestore.list_files())
+    # Large pages are sent as an outline so the router prompt does not grow with the page. The outline comes
+    # before the conversation and only changes with the page, the sections of the latest request come after it
+    spec = page_spec(filestore, "index.html")
+    sections = relevant_sections(filestore, "index.html", messages)
+    await llm_executor.acquire()
+    return b.stream.UserResponseOrCoder(messages, spec, filestore.list_files(), sections)
 
     logger.info(f"Empty message received: {await stream.get_final_response()}")
     return "Something went wrong, empty message received"
 
 
+@cached_llm_call("DetermineFilesToEdit", client=baml_client_of(get_baml_files(), "DetermineFilesToEdit"))
+async def _determine_files_to_edit(messages: list[LLMMessage], files_list: list[str]) -> FileList:
+    return await llm_executor.run("DetermineFilesToEdit", lambda: b.DetermineFilesToEdit(messages, files_list),
+                                  deadline=SHORT_DEADLINE_SECONDS, hedge=True)
+
+
+@cached_llm_call("CoderNotes", client=baml_client_of(get_baml_files(), "CoderNotes"))
+async def _coder_notes(messages: list[LLMMessage], executive_summary: str) -> str:
+    return await llm_executor.run("CoderNotes", lambda: b.CoderNotes(messages, executive_summary))
+
+
 async def read_files_to_edit(*, original_context: list[LLMMessage], filestore: FileStore) -> tuple[str, set[str]]:
     max_depth = 5
     files_list = filestore.list_files()
@@ -93,12 +193,18 @@ async def read_files_to_edit(*, original_context: list[LLMMessage], filestore: F
         # This indicates that we just don't have files.
         return NO_FILES_TO_MODIFY_MSG, set()
 
+    # Skip the DetermineFilesToEdit round trips when the local ranker is confident about the working set
+    selected_files = select_files_to_edit(messages=original_context, filestore=filestore)
+    if selected_files:
+        logger.info(f"Files to edit selected locally: {sorted(selected_files)}")
+        return _render_files(selected_files, filestore), selected_files
+
     safe_context = original_context.copy()
     file_contents = ""
 
     seen_files = set()
     for _ in range(max_depth):
-        files_response = await b.DetermineFilesToEdit(safe_context, files_list)
+        files_response = await _determine_files_to_edit(safe_context, files_list)
 
         if not files_response.files:
             # There are no new files to read for this task
@@ -123,34 +229,141 @@ async def read_files_to_edit(*, original_context: list[LLMMessage], filestore: F
 
     return file_contents or NO_FILES_TO_MODIFY_MSG, seen_files
 
+def _should_plan_file_edits(files_working_set: set[str]) -> bool:
+    return len(files_working_set - SUPPORT_FILES) >= MIN_PARALLEL_FILES
+
+
+async def _generate_file_edits(task: FileEditTask, context: list[LLMMessage], files: FileStore, query: str,
+                               semaphore: asyncio.Semaphore, preview: LivePreview | None = None) -> str:
+    async with semaphore:
+        if files.file_exists(task.path):
+            file_contents = _render_files({task.path}, files, query=query)
+        else:
+            file_contents = f"{task.path}\n(new file)\n"
+        file_context = context + [
+            _files_to_edit_message(file_contents),
+            LLMMessage(role="user", content=f"Only edit {task.path} now, other files are handled separately.\n"
+                                            f"{task.instructions}"),
+        ]
+        features = RoutingFeatures(request=f"{query}\n{task.instructions}", file_count=1,
+                                   context_chars=len(file_contents))
+        return await _generate_search_replace_blocks(file_context, features,
+                                                     on_partial=preview.feeder(task.path) if preview else None)
+
+
+async def _stream_search_replace_blocks(messages: list[LLMMessage], client: str, progress: Callable[[], None],
+                                        on_partial: Callable[[str], None]) -> str:
+    stream = b.stream.GenerateSearchReplaceBlocks(messages, baml_options={"client": client})
+    async for partial in stream:
+        progress()
+        if partial:
+            on_partial(partial)
+    return await stream.get_final_response()
+
+
+async def _generate_search_replace_blocks(messages: list[LLMMessage], features: RoutingFeatures,
+                                          on_partial: Callable[[str], None] | None = None) -> str:
+    """
+    GenerateSearchReplaceBlocks on the client the router picks for this call.
+    on_partial: receives the partial response while it streams (see live_preview), the call is not streamed without it
+    """
+    def call(client: str, progress: Callable[[], None]):
+        if on_partial is None:
+            return b.GenerateSearchReplaceBlocks(messages, baml_options={"client": client})
+        return _stream_search_replace_blocks(messages, client, progress, on_partial)
+
+    # The router watches the stream for stalls, the executor adds rate limiting and retry-after
+    return await model_router.call(
+        "GenerateSearchReplaceBlocks", features,
+        lambda client, progress: llm_executor.run("GenerateSearchReplaceBlocks", lambda: call(client, progress),
+                                                  deadline=None),
+        streamed=on_partial is not None)
+
+
+async def generate_search_replace_per_file(*, messages: list[LLMMessage], files_working_set: set[str],
+                                           files: FileStore, query: str,
+                                           preview: LivePreview | None = None) -> str | None:
+    """
+    Plan the change as one task per file and generate each file's SEARCH/REPLACE blocks concurrently,
+    so the wall time tracks the largest file instead of the sum of all files.
+    Returns the merged blocks, or None when the plan does not split into several files or planning or any of the
+    generations failed, the caller then falls back to a single GenerateSearchReplaceBlocks call.
+    """
+    try:
+        plan = await llm_executor.run("PlanFileEdits", lambda: b.PlanFileEdits(messages, sorted(files_working_set)),
+                                      deadline=SHORT_DEADLINE_SECONDS, hedge=True)
+    except Exception:
+        logger.exception("PlanFileEdits failed, falling back to a single generation")
+        return None
+    tasks = [task for task in plan.tasks if task.path and task.instructions]
+    if len(tasks) < 2:
+        return None
+
+    logger.info(f"Generating edits for {len(tasks)} files in parallel")
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_FILE_EDITS)
+    generations = [asyncio.ensure_future(_generate_file_edits(task, messages, files, query, semaphore, preview))
+                   for task in tasks]
+    try:
+        outputs = await asyncio.gather(*generations)
+    except Exception:
+        logger.exception("Per-file generation failed, falling back to a single generation")
+        return None
+    finally:
+        # One failed file fails the plan, the other files must not keep generating (and billing)
+        for generation in generations:
+            generation.cancel()
+        await asyncio.gather(*generations, return_exceptions=True)
+    return "\n\n".join(outputs)
+
+
 async def generate_executive_summary(*, messages: list[LLMMessage], executive_summary: str | None) -> str:
-    return await b.CoderNotes(messages, executive_summary or "")
+    return await _coder_notes(messages, executive_summary or "")
 
-async def run_coder_agent(*, messages: list[LLMMessage], filestore: FileStore) -> LLMMessage:
+async def run_coder_agent(*, messages: list[LLMMessage], filestore: FileStore,
+                          files_to_edit: tuple[str, set[str]] | None = None,
+                          preview: LivePreview | None = None) -> LLMMessage:
     """
     Stateless agent.
+    files_to_edit: result of read_files_to_edit when it was already started (e.g. speculatively) by the caller
+    preview: receives the edits while they are generated, the caller closes it
     Success: returns a string listing updated files.
     Failure: returns an error string.
     """
-    # TODO: use decorator to sanitize inputs with proper deepcopy
-    safe_context = messages.copy()
-
-    latest_file_contents, files_working_set = await read_files_to_edit(original_context=messages, filestore=filestore)
-
-    files = _snapshot(filestore)
-    before = dict(files)
-    file_contents_index = None
+    if files_to_edit is None:
+        files_to_edit = await read_files_to_edit(original_context=messages, filestore=filestore)
+    latest_file_contents, files_working_set = files_to_edit
+    # Large files are sent as windows around the regions relevant to the request, widened on every retry
+    query = latest_user_request(messages)
+    sent_blocks: set[str] = set()
+    if files_working_set:
+        latest_file_contents = _unsent_blocks(_render_file_blocks(files_working_set, filestore, query=query),
+                                              sent_blocks)
+
+    # Stable content goes first and retries only append, so every attempt shares the prompt prefix of the
+    # previous one and the providers' prompt caching applies (see cached_input_tokens in llm_metrics)
+    safe_context = [_files_to_edit_message(latest_file_contents)] + messages
+
+    # Edits land in a copy-on-write overlay, so nothing reaches the filestore unless an attempt fully succeeds
+    files = OverlayFileStore(filestore)
+    applied_edits: list[EditRequest] = []
 
     for attempt in range(MAX_RETRIES):
         try:
-            # Remove the file contents message so we can add it back with the latest file contents
-            if file_contents_index:
-                safe_context.pop(file_contents_index)
-            safe_context.append(_files_to_edit_message(latest_file_contents))
-            # This is used for removing the file contents message on retry
-            file_contents_index = len(safe_context) - 1
-
-            search_replace_text = await b.GenerateSearchReplaceBlocks(safe_context)
+            if preview:
+                preview.start(files)
+            search_replace_text = None
+            if attempt == 0 and _should_plan_file_edits(files_working_set):
+                search_replace_text = await generate_search_replace_per_file(
+                    messages=messages, files_working_set=files_working_set, files=files, query=query,
+                    preview=preview)
+            if search_replace_text is None:
+                if preview and attempt == 0:
+                    # Drops the partial results of a per-file generation that failed
+                    preview.start(files)
+                features = RoutingFeatures(request=query, file_count=len(files_working_set),
+                                           context_chars=len(latest_file_contents), retry=attempt)
+                search_replace_text = await _generate_search_replace_blocks(
+                    safe_context, features, on_partial=preview.feeder() if preview else None)
 
             safe_context.append(LLMMessage(role="assistant", content=search_replace_text))
             edits = apply_search_replace_many(files, search_replace_text)
@@ -161,20 +374,62 @@ async def run_coder_agent(*, messages: list[LLMMessage], filestore: FileStore) -
             logging.exception(f"Failed to apply code changes ({attempt} of {MAX_RETRIES})")
 
             if attempt == MAX_RETRIES - 1:
-                # rollback to the last known good spec in case partially_updated_spec was used at any of the retries
+                # rollback the partially applied edits from all the retries
+                files.rollback()
                 logger.error("All attempts to apply code")
                 return LLMMessage(role="assistant",
                                   content=f"ERROR: All edit attempts failed. Try making a more specific request.")
 
-            safe_context.append(LLMMessage(role="user", content=_retry_err_message(e)))
-            latest_file_contents = _render_files(files_working_set, filestore)
+            applied_edits.extend(e.passed)
+            safe_context.append(LLMMessage(role="user",
+                                           content=_retry_err_message(e) + _applied_edits_summary(applied_edits)))
+            # Retries only resend what the failed blocks targeted, and nothing the prompt already contains
+            retry_blocks = (_render_retry_files(e, files, query=query, widen=attempt + 1)
+                            or _render_file_blocks(files_working_set, files, query=query, widen=attempt + 1))
+            latest_file_contents = _unsent_blocks(retry_blocks, sent_blocks)
+            if latest_file_contents:
+                safe_context.append(_retry_files_message(latest_file_contents))
 
-    modified = _modified_files(before, files)
+    # Write back only changed/new files
+    return _updated_files_message(files.commit())
+
+
+def _updated_files_message(modified: list[str]) -> LLMMessage:
     if not modified:
         return LLMMessage(role="assistant", content="UPDATED_FILES:\n(none)")
 
-    # Write back only changed/new files
-    for path in modified:
-        filestore.write_text(path, files[path])
-
     return LLMMessage(role="assistant", content="UPDATED_FILES:\n" + "\n".join(f"- {p}" for p in modified))
+
+
+def run_quick_edit(*, request: str, filestore: FileStore) -> tuple[QuickEdit, LLMMessage] | None:
+    """
+    Apply a trivial edit without any LLM call (see quick_edits).
+    Returns None when the request is not trivial, or its edits did not apply, and the coder should handle it.
+    """
+    quick_edit = match_quick_edit(request, filestore)
+    if quick_edit is None:
+        return None
+    files = OverlayFileStore(filestore)
+    try:
+        apply_edits_many(files, quick_edit.edits)
+    except ApplyEditsError:
+        logger.exception(f"Quick {quick_edit.intent} edit did not apply, falling back to the coder")
+        files.rollback()
+        return None
+    logger.info(f"Quick {quick_edit.intent} edit applied with confidence {quick_edit.confidence:.2f}")
+    return quick_edit, _updated_files_message(files.commit())
+
+
+async def run_scaffold_agent(*, spec: str, filestore: FileStore, assets: str = "") -> LLMMessage | None:
+    """
+    First build of a new site, generated section by section in parallel (see scaffold.py).
+    Returns None when the regular coder should build the site instead.
+    """
+    try:
+        modified = await scaffold_site(spec=spec, filestore=filestore, assets=assets)
+    except Exception:
+        logger.exception("Sectioned build failed, falling back to the coder")
+        return None
+    if modified is None:
+        return None
+    return _updated_files_message(modified)
@@ -127,19 +127,64 @@ class BamlAsyncClient:
                 "messages": messages,
             })
             return typing.cast(str, __result__.cast_to(types, types, stream_types, False, __runtime__))
-    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
+    async def GenerateSection(self, spec: str,plan: types.SitePlan,section: types.SiteSection,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> types.SectionCode:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            # Use streaming internally when on_tick is provided
+            __stream__ = self.stream.GenerateSection(spec=spec,plan=plan,section=section,assets=assets,
+                baml_options=baml_options)
+            return await __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="GenerateSection", args={
+                "spec": spec,"plan": plan,"section": section,"assets": assets,
+            })
+            return typing.cast(types.SectionCode, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    async def PlanFileEdits(self, messages: typing.List["types.LLMMessage"],files: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> types.FileEditPlan:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            # Use streaming internally when on_tick is provided
+            __stream__ = self.stream.PlanFileEdits(messages=messages,files=files,
+                baml_options=baml_options)
+            return await __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="PlanFileEdits", args={
+                "messages": messages,"files": files,
+            })
+            return typing.cast(types.FileEditPlan, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    async def PlanSiteSections(self, spec: str,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> types.SitePlan:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            # Use streaming internally when on_tick is provided
+            __stream__ = self.stream.PlanSiteSections(spec=spec,assets=assets,
+                baml_options=baml_options)
+            return await __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="PlanSiteSections", args={
+                "spec": spec,"assets": assets,
+            })
+            return typing.cast(types.SitePlan, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],sections: str,
         baml_options: BamlCallOptions = {},
     ) -> typing.Union["types.ResponseToUser", "types.Coder"]:
         # Check if on_tick is provided
         if 'on_tick' in baml_options:
             # Use streaming internally when on_tick is provided
-            __stream__ = self.stream.UserResponseOrCoder(messages=messages,spec=spec,files=files,
+            __stream__ = self.stream.UserResponseOrCoder(messages=messages,spec=spec,files=files,sections=sections,
                 baml_options=baml_options)
             return await __stream__.get_final_response()
         else:
             # Original non-streaming code
             __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="UserResponseOrCoder", args={
-                "messages": messages,"spec": spec,"files": files,
+                "messages": messages,"spec": spec,"files": files,"sections": sections,
             })
             return typing.cast(typing.Union["types.ResponseToUser", "types.Coder"], __result__.cast_to(types, types, stream_types, False, __runtime__))
     async def UserResponseOrCoder2(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
@@ -202,11 +247,47 @@ class BamlStreamClient:
           lambda x: typing.cast(str, x.cast_to(types, types, stream_types, False, __runtime__)),
           __ctx__,
         )
-    def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
+    def GenerateSection(self, spec: str,plan: types.SitePlan,section: types.SiteSection,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[stream_types.SectionCode, types.SectionCode]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="GenerateSection", args={
+            "spec": spec,"plan": plan,"section": section,"assets": assets,
+        })
+        return baml_py.BamlStream[stream_types.SectionCode, types.SectionCode](
+          __result__,
+          lambda x: typing.cast(stream_types.SectionCode, x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(types.SectionCode, x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
+    def PlanFileEdits(self, messages: typing.List["types.LLMMessage"],files: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[stream_types.FileEditPlan, types.FileEditPlan]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="PlanFileEdits", args={
+            "messages": messages,"files": files,
+        })
+        return baml_py.BamlStream[stream_types.FileEditPlan, types.FileEditPlan](
+          __result__,
+          lambda x: typing.cast(stream_types.FileEditPlan, x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(types.FileEditPlan, x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
+    def PlanSiteSections(self, spec: str,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[stream_types.SitePlan, types.SitePlan]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="PlanSiteSections", args={
+            "spec": spec,"assets": assets,
+        })
+        return baml_py.BamlStream[stream_types.SitePlan, types.SitePlan](
+          __result__,
+          lambda x: typing.cast(stream_types.SitePlan, x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(types.SitePlan, x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
+    def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],sections: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.BamlStream[typing.Union["stream_types.ResponseToUser", "stream_types.Coder"], typing.Union["types.ResponseToUser", "types.Coder"]]:
         __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="UserResponseOrCoder", args={
-            "messages": messages,"spec": spec,"files": files,
+            "messages": messages,"spec": spec,"files": files,"sections": sections,
         })
         return baml_py.BamlStream[typing.Union["stream_types.ResponseToUser", "stream_types.Coder"], typing.Union["types.ResponseToUser", "types.Coder"]](
           __result__,
@@ -255,11 +336,32 @@ class BamlHttpRequestClient:
             "messages": messages,
         }, mode="request")
         return __result__
-    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
+    async def GenerateSection(self, spec: str,plan: types.SitePlan,section: types.SiteSection,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="GenerateSection", args={
+            "spec": spec,"plan": plan,"section": section,"assets": assets,
+        }, mode="request")
+        return __result__
+    async def PlanFileEdits(self, messages: typing.List["types.LLMMessage"],files: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="PlanFileEdits", args={
+            "messages": messages,"files": files,
+        }, mode="request")
+        return __result__
+    async def PlanSiteSections(self, spec: str,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="PlanSiteSections", args={
+            "spec": spec,"assets": assets,
+        }, mode="request")
+        return __result__
+    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],sections: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
         __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="UserResponseOrCoder", args={
-            "messages": messages,"spec": spec,"files": files,
+            "messages": messages,"spec": spec,"files": files,"sections": sections,
         }, mode="request")
         return __result__
     async def UserResponseOrCoder2(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
@@ -298,11 +400,32 @@ class BamlHttpStreamRequestClient:
             "messages": messages,
         }, mode="stream")
         return __result__
-    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
+    async def GenerateSection(self, spec: str,plan: types.SitePlan,section: types.SiteSection,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="GenerateSection", args={
+            "spec": spec,"plan": plan,"section": section,"assets": assets,
+        }, mode="stream")
+        return __result__
+    async def PlanFileEdits(self, messages: typing.List["types.LLMMessage"],files: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="PlanFileEdits", args={
+            "messages": messages,"files": files,
+        }, mode="stream")
+        return __result__
+    async def PlanSiteSections(self, spec: str,assets: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="PlanSiteSections", args={
+            "spec": spec,"assets": assets,
+        }, mode="stream")
+        return __result__
+    async def UserResponseOrCoder(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],sections: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
         __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="UserResponseOrCoder", args={
-            "messages": messages,"spec": spec,"files": files,
+            "messages": messages,"spec": spec,"files": files,"sections": sections,
         }, mode="stream")
         return __result__
     async def UserResponseOrCoder2(self, messages: typing.List["types.LLMMessage"],spec: str,files: typing.List[str],
@@ -12,11 +12,12 @@
 
 _file_map = {
 
-    "chat.baml": "class Coder {\n  invoke_coder bool\n}\n\nclass ResponseToUser {\n  response_to_user string\n}\n\ntemplate_string  ChatSystemInfo() #\"<system_info>\n    Keep in mind, this project is an html page that follows best practices.\n    Breba app is producing a production ready website that geared towards search engine discoverabilty and core web vitals.\n    The website is static in nature, but can use plugin for dynamic functionality.\n</system_info>\n\"#\n\nfunction UserResponseOrCoder(messages: LLMMessage[], spec: string, files: string[]) -> ResponseToUser | Coder{\n  client Gpt5Low\n  prompt #\"You are an AI agent within Breba App. \nYou will talk with user and when appropriate route them to the coder agent (coder).\nThe user you are talking to is non-technical, avoid using technical jargon unless necessary. The user likely doesn't know anything about code or libraries.\nIf the request is ambiguous, ask questions.\nAsk one question at a time and wait for the answer before asking the next question. \nQuestions should be very simple and easy to answer with one word or a short phrase.\n\nYou may also answer user questions about the current state of the website.\n\nOnce you understand the request you MUST either invoke Coder agent or respond to the user with a question or an answer.\n\nIMPORTANT: You ARE NOT WRITING ANY CODE YOURSELF.\nIMPORTANT: If something doesn't make sense, ask questions until it does. First address anything that just doesn't make sense.\nIMPORTANT: You are the only one who can talk to the user. So ask questions or respond to the user as needed and only after all questions are settled invoke Coder agent.\nIMPORTANT: You don't have to ask questions. Ask only if request is ambiguous or too vague.\nIMPORTANT: User doesn't know anything about code. For implementation details, defer to coder.\n\n\n\n{{ChatSystemInfo()}}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  {% if spec %}\n    {{ _.role(\"user\") }}\n    I have the following specification for the website:\n  {{ spec }}\n\n    {{ _.role(\"assistant\") }}\n    Ok. I understand the context of the website.\n  {% endif %}\n\n  {% if files %}\n    {{ _.role(\"user\") }}\n    Here are the files that exist in the project:\n    {{ files }}\n    \n    {{ _.role(\"assistant\") }}\n    Great this helps me understand the state of the project.\n  {% endif %}\n\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n  {{ ctx.output_format }}\n\n\n  \"#\n}\n\n\nfunction UserResponseOrCoder2(messages: LLMMessage[], spec: string, files: string[]) -> ResponseToUser | Coder{\n  client Gpt5Low\n  prompt #\"You are a website change assistant for a website. \n  Your role is to understand and clarify website change requests from non-technical users before they are passed to a developer.\nYou have three sources of context: the conversation history, an executive summary of the site, and a stripped representation of the HTML structure showing the site's sections, components, and content.\nYour job is to confirm that each request is specific, unambiguous, and actionable before marking it ready for implementation. You are not implementing anything yourself.\nWhen a user submits a request, evaluate it against these criteria:\nIt is clear what needs to change\nIt is clear where on the page the change applies\nIt does not contradict the site's purpose or existing structure\nIt does not require information or assets not yet provided\n\nIf the request meets all criteria, summarize it back to the user in plain language and confirm it is ready to pass on.\nIf the request is vague or ambiguous, ask one focused question at a time to resolve it. Do not ask multiple questions at once.\nDo not explain HTML, CSS, or technical implementation details to the user. Do not suggest how the change will be made. Do not make assumptions about intent — ask instead.\n\n\n{{ChatSystemInfo()}}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  {% if spec %}\n    {{ _.role(\"user\") }}\n    I have the following executive summary for the website:\n  {{ spec }}\n\n    {{ _.role(\"assistant\") }}\n    Ok. I understand the context of the website.\n  {% endif %}\n\n  {% if files %}\n    {{ _.role(\"user\") }}\n    Here are the files that exist in the project:\n    {{ files }}\n    \n    {{ _.role(\"assistant\") }}\n    Great this helps me understand the state of the project.\n  {% endif %}\n\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n  {{ ctx.output_format }}\n\n\n  \"#\n}\n\n\ntest BuildHelloWorldSite {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me.\"#\n      }\n    ],\n    spec \"This is a brand new project without a spec\",\n    files []\n\n  }\n  \n}\n\n\ntest BuildHelloWorldSiteNoQuestions {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me. Do not ask questions\"#\n      }\n    ],\n    spec #\"This is a brand new project without a spec\"#,\n    files []\n  }\n}\n\ntest BuildHelloWorldSiteMultiTurn {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the main purpose of your Hello World website (for example: personal profile, business landing page, or just a simple demo)?\"\"#\n      },\n      {\n        role \"user\"\n        content #\"This is a simple demo. It doesn't matter\"#\n      },\n    ],\n    spec #\"This is a brand new project without a spec\"#,\n    files []\n  }\n}\n\n\ntest BuildLandingPage {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"I would like to build a landing page for my startup.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the name of your startup?\"#\n      },\n      {\n        role \"user\"\n        content #\"The name of my startup is TechNova.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the main product or service offered by TechNova?\"#\n      },\n      {\n        role \"user\"\n        content #\"We offer innovative AI solutions for businesses.\"#\n      },\n    ],\n    spec #\"\"#,\n    files []    \n  }\n}\n\ntest BuildLandingPageConfusion{\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Rename Gravel Guard to Gravel Success.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"Got it, you want to rename the brand.\\n\\nShould we change **every occurrence** of “GravelGuard” to **“Gravel Success”** across the whole site (including title, headings, footer, schema, and form subject), or only the **visible text** on the page?\"#\n      },\n      {\n        role \"user\"\n        content #\"Everywhere. I'm rebranding\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"# GravelGuard — Product Specification\n\n## 1. Product Intent\n\n**GravelGuard** is a mobile gravel-road maintenance service focused on **small but critical access roads** (trailheads, rural properties, recreation access) that are underserved by traditional contractors.\n\nThe website’s sole job is to:\n\n1. Clearly explain *what problem GravelGuard solves*\n2. Establish *credibility and trust*\n3. Convert visitors into *qualified inbound leads*\n\nPrimary conversion outcome:\n**A visitor submits a request for a road assessment**\n\n---\n\n## 2. Target Users & Use Cases\n\n### Primary User Segments\n\n* Public land agencies and counties\n* Rural property owners and HOAs\n* Outdoor brands, clubs, and trail organizations\n\n### Core Use Cases\n\n* A land manager needs fast repair of a short gravel segment\n* A property owner wants predictable access for guests\n* An outdoor brand wants to sponsor and visibly support access roads\n\n---\n\n## 3. User Preferences (Non-negotiable)\n\n* Content must feel **field-tested, professional, and practical**\n* Tone must avoid:\n\n  * Startup hype\n  * “Tech platform” language\n  * Playfulness or novelty\n* Users prefer:\n\n  * Clear scopes and timelines\n  * Plain language explanations\n  * Concrete examples (roads, trailheads, miles, days)\n\n---\n\n## 4. Core Invariants (Must Always Hold)\n\nThese are *product truths* that must not be violated by design or content changes:\n\n1. **Clarity over cleverness**\n   Users should understand the service in under 10 seconds.\n\n2. **Lead capture is primary**\n   Every major section must reinforce or support the primary CTA.\n\n3. **Trust before pricing precision**\n   Pricing is indicative, flexible, and contextual—not rigid or transactional.\n\n4. **Small-segment specialization**\n   GravelGuard is explicitly *not* a general road contractor.\n\n5. **Fast response is a differentiator**\n   Assessment and deployment speed is central to the value proposition.\n\n---\n\n## 5. Content Constraints\n\n* Single narrative flow from:\n  **Problem → Solution → Proof → Cost → Action**\n* One primary call to action:\n  **“Request a Road Assessment”**\n* Secondary CTAs may exist, but must never compete with the primary CTA.\n* All copy must support one of:\n\n  * Understanding\n  * Trust\n  * Conversion\n\n---\n\n## 6. Information Architecture (Conceptual)\n\nThe page is a **single linear experience** composed of these conceptual sections:\n\n1. **Value Proposition**\n\n   * What GravelGuard does\n   * Who it’s for\n   * Why speed and focus matter\n\n2. **Benefits**\n\n   * Risk reduction (vehicles, guests)\n   * Speed and flexibility\n   * Fit for agencies and outdoor partners\n\n3. **Process**\n\n   * Simple, low-friction, three-step flow\n   * Emphasis on minimal effort from the customer\n\n4. **Social Proof**\n\n   * Testimonials representing each major user segment\n   * Realistic language, understated tone\n\n5. **Pricing Orientation**\n\n   * Example tiers to set expectations\n   * Clear message: exact pricing requires assessment\n\n6. **Objection Handling**\n\n   * FAQs addressing scope, speed, eligibility, and pricing logic\n\n---\n\n## 7. Conversion Model\n\n### Primary Action\n\n* User submits a road assessment request containing:\n\n  * Contact information\n  * Road location\n  * Description of issues\n\n### Conversion Principles\n\n* The form must feel:\n\n  * Low effort\n  * Non-binding\n  * Consultative, not salesy\n* Submission feedback must be immediate and reassuring.\n\n---\n\n## 8. Trust Signals (Required)\n\nAt least one of each must be present:\n\n* **Operational credibility**\n\n  * Equipment, crews, real-world constraints\n* **Social proof**\n\n  * Testimonials from agencies, owners, and sponsors\n* **Professional restraint**\n\n  * No exaggerated claims or guarantees beyond stated timelines\n\n---\n\n## 9. SEO & Discoverability (Conceptual)\n\nThe product must be clearly associated with:\n\n* Gravel road repair\n* Trailhead and recreation access\n* Rural and remote access maintenance\n\nSEO is supportive, not the primary UX driver:\n\n* Content must read naturally to humans first.\n* Keywords must reinforce meaning, not distort it.\n\n---\n\n## 10. Non-Goals (Explicit Exclusions)\n\nThe website is **not** intended to:\n\n* Fully quote or book services\n* Educate on road engineering theory\n* Serve as a content blog or documentation hub\n* Present GravelGuard as a generalized construction firm\n\n---\n\n## 11. Success Criteria\n\nThe specification is successful if:\n\n* A first-time visitor understands the service quickly\n* The service feels credible without over-explaining\n* Users consistently choose to submit the assessment form\n* The site attracts qualified, relevant inbound requests\n\"#\n    \n  }\n}\n\n\ntest BuildLandingPageXMLSpec{\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Make text green\"#\n      },\n      {\n        role \"assistant\"\n        content #\"Which text do you want to be green: all text on the website, or just certain parts (for example, headings, prices, or a specific section)?\n\n        \"#\n      },\n      {\n        role \"user\"\n        content #\"Make all icons green\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}\n\ntest BuildLandingPageXMLSpec2{\n  functions [UserResponseOrCoder2]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"I just uploaded files:\n          image1.png, image2.png, image3.png, image4.png, image5.png, image6.png\n\n          Add images to the corners of hero section\n        \"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"\n      GravelGuard — Executive Summary\nStatus: Demo/concept only. Not trading, no real customers.\nPurpose: Validates market positioning and service framing for a mobile gravel road repair business before a full build-out. The primary conversion signal is inbound assessment requests.\nTarget audience: A mix of institutional buyers (forest agencies, BLM/DNR, counties) and individual/small-org buyers (rural property owners, Airbnb hosts, HOAs, outdoor brand sponsors). Pricing and messaging serve both without a separate funnel for each.\nGeography: Pacific Northwest only. Service area not yet formally defined.\nTheme: Dark. No inline styles — all styling via Bootstrap utility classes and custom named classes.\nCTAs: Primary — \"Request a Road Assessment\" (modal contact form). Secondary — \"View Pricing\" (anchor scroll).\nTech stack: Static HTML/CSS/JS. Bootstrap 5.3.8 from jsDelivr CDN. Google Material Icons from Google Fonts CDN. System font stack — no external font files. Mobile-first responsive layout.\nSEO: Fully configured — index, follow, Open Graph, Twitter Card, and LocalBusiness JSON-LD schema.\nAnalytics: Google Analytics 4, property G-YDY6J4DY62. Actively monitored by the owner.\nIntegrations: Form submissions route to the owner's email inbox via staticforms.xyz. No CRM in the loop — lead follow-up is manual.\nTestimonials: Placeholder. Not from real customers.\nOwnership: All accounts (hosting, analytics, form backend, email) held directly by the business owner.\nCompliance: No cookie consent banner before GA4 fires. No privacy policy exists. The site is not currently receiving real traffic.\nDeployment: Managed via the Breba platform on a breba.site subdomain. No custom domain configured.\n\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}\n\ntest BuildLandingPageXMLSpec3{\n  functions [UserResponseOrCoder2]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change color of the headline to green.\n        \"#\n      },\n      {\n        role \"assistant\"\n        content #\"Which headline do you want to change to green: the main headline at the top of the page, or the section headline that says “Protect Vehicles and Guests”?\"#\n      },\n      {\n        role \"user\"\n        content #\"Yes, that one.\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"\n      GravelGuard — Executive Summary\nStatus: Demo/concept only. Not trading, no real customers.\nPurpose: Validates market positioning and service framing for a mobile gravel road repair business before a full build-out. The primary conversion signal is inbound assessment requests.\nTarget audience: A mix of institutional buyers (forest agencies, BLM/DNR, counties) and individual/small-org buyers (rural property owners, Airbnb hosts, HOAs, outdoor brand sponsors). Pricing and messaging serve both without a separate funnel for each.\nGeography: Pacific Northwest only. Service area not yet formally defined.\nTheme: Dark. No inline styles — all styling via Bootstrap utility classes and custom named classes.\nCTAs: Primary — \"Request a Road Assessment\" (modal contact form). Secondary — \"View Pricing\" (anchor scroll).\nTech stack: Static HTML/CSS/JS. Bootstrap 5.3.8 from jsDelivr CDN. Google Material Icons from Google Fonts CDN. System font stack — no external font files. Mobile-first responsive layout.\nSEO: Fully configured — index, follow, Open Graph, Twitter Card, and LocalBusiness JSON-LD schema.\nAnalytics: Google Analytics 4, property G-YDY6J4DY62. Actively monitored by the owner.\nIntegrations: Form submissions route to the owner's email inbox via staticforms.xyz. No CRM in the loop — lead follow-up is manual.\nTestimonials: Placeholder. Not from real customers.\nOwnership: All accounts (hosting, analytics, form backend, email) held directly by the business owner.\nCompliance: No cookie consent banner before GA4 fires. No privacy policy exists. The site is not currently receiving real traffic.\nDeployment: Managed via the Breba platform on a breba.site subdomain. No custom domain configured.\n\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}",
-    "clients.baml": "// Learn more about clients at https://docs.boundaryml.com/docs/snippets/clients/overview\n\nclient<llm> Gpt51CodexLow {\n  provider openai-responses\n  options {\n    model \"gpt-5.1-codex\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n  }\n}\n\nclient<llm> GptOss {\n  provider openai-responses\n  options {\n    model \"gpt-oss-120b\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n  }\n}\n\nclient<llm> Gpt5Medium {\n  provider openai-responses\n  options {\n    model \"gpt-5.1\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"medium\"\n    }\n  }\n}\n\nclient<llm> Gpt5Low {\n  provider openai-responses\n  options {\n    model \"gpt-5.1\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n    text {\n      verbosity: \"low\"\n    }\n  }\n}\n\n// Using the new OpenAI Responses API for enhanced formatting\nclient<llm> CustomGPT5 {\n  provider openai-responses\n  options {\n    model \"gpt-5\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"minimal\"\n    }\n  }\n}\n\nclient<llm> CustomGPT5Mini {\n  provider openai-responses\n  retry_policy Exponential\n  options {\n    model \"gpt-5-mini\"\n    api_key env.OPENAI_API_KEY\n    text {\n      verbosity: \"low\"\n    }\n    reasoning {\n      effort \"minimal\"\n    }\n  }\n}\n\n// Openai with chat completion\nclient<llm> CustomGPT5Chat {\n  provider openai\n  options {\n    model \"gpt-5\"\n    api_key env.OPENAI_API_KEY\n  }\n}\n\n// Latest Anthropic Claude 4 models\nclient<llm> CustomOpus4 {\n  provider anthropic\n  options {\n    model \"claude-opus-4-1-20250805\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\nclient<llm> CustomSonnet4 {\n  provider anthropic\n  options {\n    model \"claude-sonnet-4-20250514\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\nclient<llm> CustomHaiku {\n  provider anthropic\n  retry_policy Constant\n  options {\n    model \"claude-3-5-haiku-20241022\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\n// Example Google AI client (uncomment to use)\n// client<llm> CustomGemini {\n//   provider google-ai\n//   options {\n//     model \"gemini-2.5-pro\"\n//     api_key env.GOOGLE_API_KEY\n//   }\n// }\n\n// Example AWS Bedrock client (uncomment to use)\n// client<llm> CustomBedrock {\n//   provider aws-bedrock\n//   options {\n//     model \"anthropic.claude-sonnet-4-20250514-v1:0\"\n//     region \"us-east-1\"\n//     // AWS credentials are auto-detected from env vars\n//   }\n// }\n\n// Example Azure OpenAI client (uncomment to use)\n// client<llm> CustomAzure {\n//   provider azure-openai\n//   options {\n//     model \"gpt-5\"\n//     api_key env.AZURE_OPENAI_API_KEY\n//     base_url \"https://MY_RESOURCE_NAME.openai.azure.com/openai/deployments/MY_DEPLOYMENT_ID\"\n//     api_version \"2024-10-01-preview\"\n//   }\n// }\n\n// Example Vertex AI client (uncomment to use)\n// client<llm> CustomVertex {\n//   provider vertex-ai\n//   options {\n//     model \"gemini-2.5-pro\"\n//     location \"us-central1\"\n//     // Uses Google Cloud Application Default Credentials\n//   }\n// }\n\n// Example Ollama client for local models (uncomment to use)\n// client<llm> CustomOllama {\n//   provider openai-generic\n//   options {\n//     base_url \"http://localhost:11434/v1\"\n//     model \"llama4\"\n//     default_role \"user\" // Most local models prefer the user role\n//     // No API key needed for local Ollama\n//   }\n// }\n\n// https://docs.boundaryml.com/docs/snippets/clients/round-robin\nclient<llm> CustomFast {\n  provider round-robin\n  options {\n    // This will alternate between the two clients\n    strategy [CustomGPT5Mini, CustomHaiku]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/fallback\nclient<llm> OpenaiFallback {\n  provider fallback\n  options {\n    // This will try the clients in order until one succeeds\n    strategy [CustomGPT5Mini, CustomGPT5]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/retry\nretry_policy Constant {\n  max_retries 3\n  strategy {\n    type constant_delay\n    delay_ms 200\n  }\n}\n\nretry_policy Exponential {\n  max_retries 2\n  strategy {\n    type exponential_backoff\n    delay_ms 300\n    multiplier 1.5\n    max_delay_ms 10000\n  }\n}",
-    "coder.baml": "\nclass LLMMessage {\n  role \"user\" | \"assistant\"\n  content string\n}\n\nclass FileList {\n  reasoning string  @description(\"Explanation of why these files need to be edited or not in one short sentence.\")\n  files string[]  @description(\"List of file paths to edit.\")\n}\n\ntemplate_string SystemReminder() #\"<system_reminder>\n  # *SEARCH/REPLACE block* Rules:\n\nEvery *SEARCH/REPLACE block* must use this format:\n1. The *FULL* file path alone on a line, verbatim. No bold asterisks, no quotes around it, no escaping of characters, etc.\n2. The opening fence and code language, eg: ```python\n3. The start of search block: <<<<<<< SEARCH\n4. A contiguous chunk of lines to search for in the existing source code\n5. The dividing line: =======\n6. The lines to replace into the source code\n7. The end of the replace block: >>>>>>> REPLACE\n8. The closing fence: ```\n\nUse the *FULL* file path, as shown to you by the user.\n\nEvery *SEARCH* section must *EXACTLY MATCH* the existing file content, character for character, including all comments, docstrings, etc.\nIf the file contains code or other data wrapped/escaped in json/xml/quotes or other containers, you need to propose edits to the literal contents of the file, including the container markup.\n\n*SEARCH/REPLACE* blocks will *only* replace the first match occurrence.\nIncluding multiple unique *SEARCH/REPLACE* blocks if needed.\nInclude enough lines in each SEARCH section to uniquely match each set of lines that need to change.\n\nKeep *SEARCH/REPLACE* blocks concise.\nBreak large *SEARCH/REPLACE* blocks into a series of smaller blocks that each change a small portion of the file.\nInclude just the changing lines, and a few surrounding lines if needed for uniqueness.\nDo not include long runs of unchanging lines in *SEARCH/REPLACE* blocks.\n\n<moving_code_instructions>\nTo move code within a file, use 2 *SEARCH/REPLACE* blocks: 1 to delete it from its current location, 1 to insert it in the new location.\nMake sure that the *SEARCH/REPLACE* block that deletes the code goes first. \nWhen applying edits, we want to avoid situations where the first inserts the code in the new location, and then remove the code we just added instead of removing the original code. \n</moving_code_instructions>\n\n\nPay attention to which filenames the user wants you to edit.\n\nIf you want to put code in a new file or an empty file, use a *SEARCH/REPLACE block* with:\n- A new file path, including dir name if needed\n- An empty `SEARCH` section\n- The new file's contents in the `REPLACE` section\n\nReply only in English. ONLY EVER RETURN CODE IN A *SEARCH/REPLACE BLOCK*!\nIMPORTANT: We will use a search and replace algorithm, therefore the search and replace blocks need to have exact text, NOT udiff format!\n</system_reminder>\n\"#\n// index.html is the main file, but you can create other files to keep with the best practices.\ntemplate_string  SystemInfo() #\"<system_info>\n    Keep in mind, this project is a website that follows best practices.\n    This project has all css, html and javascript in a single index.html file (unless user specifies otherwise).\n    We are producing a production ready website that geared towards search engine discoverabilty and core web vitals.\n    You must make sure that all changes are clean and complete.\n</system_info>\n\"#\n\ntemplate_string StaticSiteBestPractices() #\"\n<static_website_best_practices>\nAlways make changes with the best practices in mind\n<website_structure>\n1. Keep HTML, CSS, and JavaScript in separate files.\n2. Use a logical and consistent file and folder structure.\n</website_structure>\n<html_best_practices>\n1. Use semantic HTML tags\n2. IMPORTANT: You must avoid using inline style attribute. Always try to use CSS classes.\n3. Never generate inline SVG. Instead use google icons or other publicly available icons.\n4. Use utility classes for layout and spacing, and component classes for reusable UI elements.\n5. Try to keep the code clean, dry, and concise\n6. Make sure your changes are taking into account existing code and make good holistic changes.\n7. When using styles, prefer \"rem\" units. Avoid \"em\" units, if possible.\n8. Use the html lang attribute. Default to english.\n9. Keep styles clean. Make sure we don't have style bloat and unnecessary duplication of properties.\n10. Make sure images and fonts are loaded in a way that is optimal for performance.\n11. Avoid styles that could cause horizontal scrolling.\n12. Make sure to optimize for SEO and core web vitals.\n13. Make sure to update sitemap.xml for any visible content changes.\n14. A production ready website must have robots.txt file.\n</html_best_practices>\n<third_party_libraries>\nWhen using third party libraries, do not make up integrity hashes. Only use integrity checks if provided by the user.\n</third_party_libraries>\n</static_website_best_practices>\n\"#\n\nfunction DetermineFilesToEdit(messages: LLMMessage[], files: string[]) -> FileList {\n  client CustomGPT5Mini\n  prompt #\"\nYou need to determine files to edit from the list of available files in the project and the file contents.\nRemember that if the project contains separate style files, style changes need to go into the appropriate style file. We will not be making inline style changes. All style changes need to go into appropriate css classes.\nWhen making changes to website content (not style only), we need to always update sitemap.xml.\n\nYour output will be a list of filepaths.\n\n {{ SystemInfo() }}\n\n  {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n  {% endfor %}\n\n  <available_files_list>\n  {% for file in files %}\n    {{ file }}\n  {% endfor %}\n  </available_files_list>    \n\n  {{ ctx.output_format }}\n  \"#\n\n}\n\nfunction GenerateSearchReplaceBlocks(messages: LLMMessage[]) -> string {\n  client Gpt5Low\n  prompt #\"\nYou are an agent working within Breba App. You are helping the user build and maintain their website.\nYou will be interacting with a user who is looking at the web page and not the code.\nThat means when the user is referencing something on the page, they are referencing contents of the rendered web page.\n\nAlways use best practices when coding.\nRespect and use existing conventions, libraries, etc that are already present in the code base.\nReply in English.\n\nTake requests for changes to the supplied code.\nDo not ask questions.\n\nWhen responding to the request you MUST:\n\n1. Think step-by-step and explain the needed changes in a few short sentences.\n\n2. Describe each change with a *SEARCH/REPLACE block* per the examples below.\n\nAll changes to files must use this *SEARCH/REPLACE block* format.\nONLY EVER RETURN CODE IN A *SEARCH/REPLACE BLOCK*!\n\n{{ SystemInfo() }}\n\n{{ StaticSiteBestPractices() }}\n    \n{{ SystemReminder() }}\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  \"#\n}\n\ntest BuildHelloWorldSite {\n  functions [GenerateSearchReplaceBlocks]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"Files available for editing:\"#\n      }\n      {\n        role \"user\"\n        content #\"Create a simple hello world site\"#\n      }\n    ]\n  }\n}\n\ntest ProduceFileList {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest TestFileListIncludesStyles {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest DoubleCheckFileList {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"reasoning\": \"The visible text change from “Hello World” to “Hello Universe” involves editing the HTML page (index.html). Because this is a visible change to end users, the sitemap must also be updated to reflect the new content.\",\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ],\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <link rel=\"stylesheet\" href=\"styles.css\">\n</head>\n<body>\n    <main>\n        <h1>Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\n\ntest DoubleCheckFileListWithFollowupStyles {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"index.html, styles.css, script.js, sitemap.xml\"#\n      }\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ]\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"\n        index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <link rel=\"stylesheet\" href=\"styles.css\">\n</head>\n<body>\n    <main>\n        <h1 class=\"text-green\">Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional css or javascript files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest DoubleCheckSinglularHTMLFile {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"index.html, script.js, sitemap.xml\"#\n      }\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ]\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"\n        index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <style>\n      .text-green {\n        color: green;\n      }\n</head>\n<body>\n    <main>\n        <h1 class=\"text-green\">Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional css or javascript files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"sitemap.xml\"]\n  }\n}",
+    "chat.baml": "class Coder {\n  invoke_coder bool\n}\n\nclass ResponseToUser {\n  response_to_user string\n}\n\ntemplate_string  ChatSystemInfo() #\"<system_info>\n    Keep in mind, this project is an html page that follows best practices.\n    Breba app is producing a production ready website that geared towards search engine discoverabilty and core web vitals.\n    The website is static in nature, but can use plugin for dynamic functionality.\n</system_info>\n\"#\n\nfunction UserResponseOrCoder(messages: LLMMessage[], spec: string, files: string[], sections: string) -> ResponseToUser | Coder{\n  client Gpt5Low\n  prompt #\"You are an AI agent within Breba App. \nYou will talk with user and when appropriate route them to the coder agent (coder).\nThe user you are talking to is non-technical, avoid using technical jargon unless necessary. The user likely doesn't know anything about code or libraries.\nIf the request is ambiguous, ask questions.\nAsk one question at a time and wait for the answer before asking the next question. \nQuestions should be very simple and easy to answer with one word or a short phrase.\n\nYou may also answer user questions about the current state of the website.\n\nOnce you understand the request you MUST either invoke Coder agent or respond to the user with a question or an answer.\n\nIMPORTANT: You ARE NOT WRITING ANY CODE YOURSELF.\nIMPORTANT: If something doesn't make sense, ask questions until it does. First address anything that just doesn't make sense.\nIMPORTANT: You are the only one who can talk to the user. So ask questions or respond to the user as needed and only after all questions are settled invoke Coder agent.\nIMPORTANT: You don't have to ask questions. Ask only if request is ambiguous or too vague.\nIMPORTANT: User doesn't know anything about code. For implementation details, defer to coder.\n\n\n\n{{ChatSystemInfo()}}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  {% if spec %}\n    {{ _.role(\"user\") }}\n    I have the following specification for the website:\n  {{ spec }}\n\n    {{ _.role(\"assistant\") }}\n    Ok. I understand the context of the website.\n  {% endif %}\n\n  {% if files %}\n    {{ _.role(\"user\") }}\n    Here are the files that exist in the project:\n    {{ files }}\n    \n    {{ _.role(\"assistant\") }}\n    Great this helps me understand the state of the project.\n  {% endif %}\n\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n  {% if sections %}\n    {{ _.role(\"system\") }}\n    Full text of the page sections the latest request refers to:\n    {{ sections }}\n  {% endif %}\n\n  {{ ctx.output_format }}\n\n\n  \"#\n}\n\n\nfunction UserResponseOrCoder2(messages: LLMMessage[], spec: string, files: string[]) -> ResponseToUser | Coder{\n  client Gpt5Low\n  prompt #\"You are a website change assistant for a website. \n  Your role is to understand and clarify website change requests from non-technical users before they are passed to a developer.\nYou have three sources of context: the conversation history, an executive summary of the site, and a stripped representation of the HTML structure showing the site's sections, components, and content.\nYour job is to confirm that each request is specific, unambiguous, and actionable before marking it ready for implementation. You are not implementing anything yourself.\nWhen a user submits a request, evaluate it against these criteria:\nIt is clear what needs to change\nIt is clear where on the page the change applies\nIt does not contradict the site's purpose or existing structure\nIt does not require information or assets not yet provided\n\nIf the request meets all criteria, summarize it back to the user in plain language and confirm it is ready to pass on.\nIf the request is vague or ambiguous, ask one focused question at a time to resolve it. Do not ask multiple questions at once.\nDo not explain HTML, CSS, or technical implementation details to the user. Do not suggest how the change will be made. Do not make assumptions about intent — ask instead.\n\n\n{{ChatSystemInfo()}}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  {% if spec %}\n    {{ _.role(\"user\") }}\n    I have the following executive summary for the website:\n  {{ spec }}\n\n    {{ _.role(\"assistant\") }}\n    Ok. I understand the context of the website.\n  {% endif %}\n\n  {% if files %}\n    {{ _.role(\"user\") }}\n    Here are the files that exist in the project:\n    {{ files }}\n    \n    {{ _.role(\"assistant\") }}\n    Great this helps me understand the state of the project.\n  {% endif %}\n\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n  {{ ctx.output_format }}\n\n\n  \"#\n}\n\n\ntest BuildHelloWorldSite {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me.\"#\n      }\n    ],\n    spec \"This is a brand new project without a spec\",\n    files []\n    sections \"\"\n\n  }\n  \n}\n\n\ntest BuildHelloWorldSiteNoQuestions {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me. Do not ask questions\"#\n      }\n    ],\n    spec #\"This is a brand new project without a spec\"#,\n    files []\n    sections \"\"\n  }\n}\n\ntest BuildHelloWorldSiteMultiTurn {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the main purpose of your Hello World website (for example: personal profile, business landing page, or just a simple demo)?\"\"#\n      },\n      {\n        role \"user\"\n        content #\"This is a simple demo. It doesn't matter\"#\n      },\n    ],\n    spec #\"This is a brand new project without a spec\"#,\n    files []\n    sections \"\"\n  }\n}\n\n\ntest BuildLandingPage {\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"I would like to build a landing page for my startup.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the name of your startup?\"#\n      },\n      {\n        role \"user\"\n        content #\"The name of my startup is TechNova.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What is the main product or service offered by TechNova?\"#\n      },\n      {\n        role \"user\"\n        content #\"We offer innovative AI solutions for businesses.\"#\n      },\n    ],\n    spec #\"\"#,\n    files []    \n    sections \"\"\n  }\n}\n\ntest BuildLandingPageConfusion{\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Rename Gravel Guard to Gravel Success.\"#\n      },\n      {\n        role \"assistant\"\n        content #\"Got it, you want to rename the brand.\\n\\nShould we change **every occurrence** of “GravelGuard” to **“Gravel Success”** across the whole site (including title, headings, footer, schema, and form subject), or only the **visible text** on the page?\"#\n      },\n      {\n        role \"user\"\n        content #\"Everywhere. I'm rebranding\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    sections \"\"\n    spec #\"# GravelGuard — Product Specification\n\n## 1. Product Intent\n\n**GravelGuard** is a mobile gravel-road maintenance service focused on **small but critical access roads** (trailheads, rural properties, recreation access) that are underserved by traditional contractors.\n\nThe website’s sole job is to:\n\n1. Clearly explain *what problem GravelGuard solves*\n2. Establish *credibility and trust*\n3. Convert visitors into *qualified inbound leads*\n\nPrimary conversion outcome:\n**A visitor submits a request for a road assessment**\n\n---\n\n## 2. Target Users & Use Cases\n\n### Primary User Segments\n\n* Public land agencies and counties\n* Rural property owners and HOAs\n* Outdoor brands, clubs, and trail organizations\n\n### Core Use Cases\n\n* A land manager needs fast repair of a short gravel segment\n* A property owner wants predictable access for guests\n* An outdoor brand wants to sponsor and visibly support access roads\n\n---\n\n## 3. User Preferences (Non-negotiable)\n\n* Content must feel **field-tested, professional, and practical**\n* Tone must avoid:\n\n  * Startup hype\n  * “Tech platform” language\n  * Playfulness or novelty\n* Users prefer:\n\n  * Clear scopes and timelines\n  * Plain language explanations\n  * Concrete examples (roads, trailheads, miles, days)\n\n---\n\n## 4. Core Invariants (Must Always Hold)\n\nThese are *product truths* that must not be violated by design or content changes:\n\n1. **Clarity over cleverness**\n   Users should understand the service in under 10 seconds.\n\n2. **Lead capture is primary**\n   Every major section must reinforce or support the primary CTA.\n\n3. **Trust before pricing precision**\n   Pricing is indicative, flexible, and contextual—not rigid or transactional.\n\n4. **Small-segment specialization**\n   GravelGuard is explicitly *not* a general road contractor.\n\n5. **Fast response is a differentiator**\n   Assessment and deployment speed is central to the value proposition.\n\n---\n\n## 5. Content Constraints\n\n* Single narrative flow from:\n  **Problem → Solution → Proof → Cost → Action**\n* One primary call to action:\n  **“Request a Road Assessment”**\n* Secondary CTAs may exist, but must never compete with the primary CTA.\n* All copy must support one of:\n\n  * Understanding\n  * Trust\n  * Conversion\n\n---\n\n## 6. Information Architecture (Conceptual)\n\nThe page is a **single linear experience** composed of these conceptual sections:\n\n1. **Value Proposition**\n\n   * What GravelGuard does\n   * Who it’s for\n   * Why speed and focus matter\n\n2. **Benefits**\n\n   * Risk reduction (vehicles, guests)\n   * Speed and flexibility\n   * Fit for agencies and outdoor partners\n\n3. **Process**\n\n   * Simple, low-friction, three-step flow\n   * Emphasis on minimal effort from the customer\n\n4. **Social Proof**\n\n   * Testimonials representing each major user segment\n   * Realistic language, understated tone\n\n5. **Pricing Orientation**\n\n   * Example tiers to set expectations\n   * Clear message: exact pricing requires assessment\n\n6. **Objection Handling**\n\n   * FAQs addressing scope, speed, eligibility, and pricing logic\n\n---\n\n## 7. Conversion Model\n\n### Primary Action\n\n* User submits a road assessment request containing:\n\n  * Contact information\n  * Road location\n  * Description of issues\n\n### Conversion Principles\n\n* The form must feel:\n\n  * Low effort\n  * Non-binding\n  * Consultative, not salesy\n* Submission feedback must be immediate and reassuring.\n\n---\n\n## 8. Trust Signals (Required)\n\nAt least one of each must be present:\n\n* **Operational credibility**\n\n  * Equipment, crews, real-world constraints\n* **Social proof**\n\n  * Testimonials from agencies, owners, and sponsors\n* **Professional restraint**\n\n  * No exaggerated claims or guarantees beyond stated timelines\n\n---\n\n## 9. SEO & Discoverability (Conceptual)\n\nThe product must be clearly associated with:\n\n* Gravel road repair\n* Trailhead and recreation access\n* Rural and remote access maintenance\n\nSEO is supportive, not the primary UX driver:\n\n* Content must read naturally to humans first.\n* Keywords must reinforce meaning, not distort it.\n\n---\n\n## 10. Non-Goals (Explicit Exclusions)\n\nThe website is **not** intended to:\n\n* Fully quote or book services\n* Educate on road engineering theory\n* Serve as a content blog or documentation hub\n* Present GravelGuard as a generalized construction firm\n\n---\n\n## 11. Success Criteria\n\nThe specification is successful if:\n\n* A first-time visitor understands the service quickly\n* The service feels credible without over-explaining\n* Users consistently choose to submit the assessment form\n* The site attracts qualified, relevant inbound requests\n\"#\n    \n  }\n}\n\n\ntest BuildLandingPageXMLSpec{\n  functions [UserResponseOrCoder]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Make text green\"#\n      },\n      {\n        role \"assistant\"\n        content #\"Which text do you want to be green: all text on the website, or just certain parts (for example, headings, prices, or a specific section)?\n\n        \"#\n      },\n      {\n        role \"user\"\n        content #\"Make all icons green\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    sections \"\"\n    spec #\"\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}\n\ntest BuildLandingPageXMLSpec2{\n  functions [UserResponseOrCoder2]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"I just uploaded files:\n          image1.png, image2.png, image3.png, image4.png, image5.png, image6.png\n\n          Add images to the corners of hero section\n        \"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"\n      GravelGuard — Executive Summary\nStatus: Demo/concept only. Not trading, no real customers.\nPurpose: Validates market positioning and service framing for a mobile gravel road repair business before a full build-out. The primary conversion signal is inbound assessment requests.\nTarget audience: A mix of institutional buyers (forest agencies, BLM/DNR, counties) and individual/small-org buyers (rural property owners, Airbnb hosts, HOAs, outdoor brand sponsors). Pricing and messaging serve both without a separate funnel for each.\nGeography: Pacific Northwest only. Service area not yet formally defined.\nTheme: Dark. No inline styles — all styling via Bootstrap utility classes and custom named classes.\nCTAs: Primary — \"Request a Road Assessment\" (modal contact form). Secondary — \"View Pricing\" (anchor scroll).\nTech stack: Static HTML/CSS/JS. Bootstrap 5.3.8 from jsDelivr CDN. Google Material Icons from Google Fonts CDN. System font stack — no external font files. Mobile-first responsive layout.\nSEO: Fully configured — index, follow, Open Graph, Twitter Card, and LocalBusiness JSON-LD schema.\nAnalytics: Google Analytics 4, property G-YDY6J4DY62. Actively monitored by the owner.\nIntegrations: Form submissions route to the owner's email inbox via staticforms.xyz. No CRM in the loop — lead follow-up is manual.\nTestimonials: Placeholder. Not from real customers.\nOwnership: All accounts (hosting, analytics, form backend, email) held directly by the business owner.\nCompliance: No cookie consent banner before GA4 fires. No privacy policy exists. The site is not currently receiving real traffic.\nDeployment: Managed via the Breba platform on a breba.site subdomain. No custom domain configured.\n\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}\n\ntest BuildLandingPageXMLSpec3{\n  functions [UserResponseOrCoder2]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change color of the headline to green.\n        \"#\n      },\n      {\n        role \"assistant\"\n        content #\"Which headline do you want to change to green: the main headline at the top of the page, or the section headline that says “Protect Vehicles and Guests”?\"#\n      },\n      {\n        role \"user\"\n        content #\"Yes, that one.\"#\n      },\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\", \"SPEC.md\"]\n    spec #\"\n      GravelGuard — Executive Summary\nStatus: Demo/concept only. Not trading, no real customers.\nPurpose: Validates market positioning and service framing for a mobile gravel road repair business before a full build-out. The primary conversion signal is inbound assessment requests.\nTarget audience: A mix of institutional buyers (forest agencies, BLM/DNR, counties) and individual/small-org buyers (rural property owners, Airbnb hosts, HOAs, outdoor brand sponsors). Pricing and messaging serve both without a separate funnel for each.\nGeography: Pacific Northwest only. Service area not yet formally defined.\nTheme: Dark. No inline styles — all styling via Bootstrap utility classes and custom named classes.\nCTAs: Primary — \"Request a Road Assessment\" (modal contact form). Secondary — \"View Pricing\" (anchor scroll).\nTech stack: Static HTML/CSS/JS. Bootstrap 5.3.8 from jsDelivr CDN. Google Material Icons from Google Fonts CDN. System font stack — no external font files. Mobile-first responsive layout.\nSEO: Fully configured — index, follow, Open Graph, Twitter Card, and LocalBusiness JSON-LD schema.\nAnalytics: Google Analytics 4, property G-YDY6J4DY62. Actively monitored by the owner.\nIntegrations: Form submissions route to the owner's email inbox via staticforms.xyz. No CRM in the loop — lead follow-up is manual.\nTestimonials: Placeholder. Not from real customers.\nOwnership: All accounts (hosting, analytics, form backend, email) held directly by the business owner.\nCompliance: No cookie consent banner before GA4 fires. No privacy policy exists. The site is not currently receiving real traffic.\nDeployment: Managed via the Breba platform on a breba.site subdomain. No custom domain configured.\n\n  <doc sitename=\"gravel.breba.site\" title=\"GravelGuard | Fast Gravel Road Repair for Trailheads and Rural Access\" url=\"https://gravel.breba.site\" hostname=\"breba.site\" description=\"GravelGuard provides fast gravel road repair for trailheads, campgrounds, rural driveways, and access roads, fixing potholes, washboards, and drainage issues.\" tags=\"gravel road repair, trailhead access, rural driveway maintenance, pothole repair, washboard road, recreation access, road grading, GravelGuard\" fingerprint=\"bc9f4c760db66305\">\n  <main>\n    <head rend=\"h3\">Protect Vehicles and Guests</head>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile Gravel Road Repair</p>\n    <p>GravelGuard sends mobile crews to repair potholes, washboards, and drainage failures on remote gravel roads so drivers, hikers, and guests can get through safely.</p>\n    <list rend=\"ul\">\n      <item>Trailheads, campgrounds, rural driveways, and recreation roads</item>\n      <item>Fast-response crews with compact graders and professional equipment</item>\n      <item>Flexible options for agencies, landowners, and outdoor sponsors</item>\n    </list>\n    <p>We focus on the rough, forgotten gravel roads that matter most for trail access, rural living, and outdoor tourism—and we keep them passable without big-contractor complexity.</p>\n    <p>Reduce tire blowouts, suspension damage, and scary access stories with properly graded, compacted gravel roads.</p>\n    <p>Mobile crews restore short road segments in 24–72 hours, ideal for trailheads, cabins, Airbnbs, and seasonal spikes.</p>\n    <p>Clear scopes, simple pricing, and sponsor options help agencies, clubs, and brands keep key recreation roads open.</p>\n    <p>From a rough GPS pin to a smooth, drivable road in a few simple steps.</p>\n    <p> 1 Share the Problem </p>\n    <p>Send us a map link or GPS pin for the bad road segment, plus a few photos or a brief description.</p>\n    <p> 2 Get a Fast Assessment </p>\n    <p>We review satellite imagery and your photos, then send a clear scope, estimated timeline, and pricing options.</p>\n    <p> 3 Crew Deploys and Repairs </p>\n    <p>Our mobile crew arrives with compact graders, water, and aggregate to fix potholes, break washboards, and restore drainage—often in a single day.</p>\n    <p> Want ongoing gravel road maintenance instead of one-off fixes? Ask about our seasonal subscriptions for rural driveway maintenance and recreation access roads. </p>\n    <p>From rural driveways to busy trailheads, GravelGuard helps keep access open.</p>\n    <p>“We had a trailhead road that everyone complained about for years. GravelGuard had it graded, compacted, and draining properly in a day, and the calls stopped.”</p>\n    <p>“Our Airbnb guests used to message us about the washboarded driveway. After GravelGuard’s subscription service, reviews mention the ‘easy access’ instead.”</p>\n    <p>“Sponsoring a popular trail access road with GravelGuard gave us real impact and great content. We can literally show customers the road we keep open.”</p>\n    <p>Every road is different. These example packages help you understand where most projects land. Exact pricing depends on length, condition, and material needs.</p>\n    <p>Most Popular</p>\n    <p>Starting from $3,000</p>\n    <p>For 0.5–3 miles of rough gravel road leading to trailheads, campgrounds, and recreation areas.</p>\n    <list rend=\"ul\">\n      <item>Pothole filling and washboard removal</item>\n      <item>Basic re-crowning and drainage touch-ups</item>\n      <item>Before/after documentation for stakeholders</item>\n    </list>\n    <p>Starting from $2,000 / visit</p>\n    <p>Seasonal maintenance for rural driveways, cabins, Airbnbs, small HOAs, and private roads.</p>\n    <list rend=\"ul\">\n      <item>Scheduled grading every 3–6 months</item>\n      <item>Priority response after storms or freeze–thaw damage</item>\n      <item>Predictable access for guests and deliveries</item>\n    </list>\n    <p>Custom contracts</p>\n    <p>For land agencies, counties, timber companies, and outdoor brands sponsoring recreation access.</p>\n    <list rend=\"ul\">\n      <item>Micro-contracts for short segments</item>\n      <item>Sponsor-a-Road and co-branded signage</item>\n      <item>Emergency response after major events</item>\n    </list>\n    <p>Need help estimating your road length or condition? We can walk through it over a quick call.</p>\n    <p>If you don’t see your question here, include it in your message and we’ll respond directly.</p>\n    <p> We focus on gravel and unpaved access roads that serve trailheads, campgrounds, rural homes, cabins, small HOAs, and recreation areas. We’re best suited for short segments that are too small or low-priority for large contractors. </p>\n    <p> Most jobs are assessed within 24 hours on business days, and field work is typically scheduled within 24–72 hours after approval, depending on weather, crew availability, and material needs. </p>\n    <p> Yes. We regularly partner with forest agencies, BLM and DNR districts, counties, and timber companies to handle small segments, emergency washouts, and recreation-focused roads that don’t fit traditional contracts. </p>\n    <p> Absolutely. Our Sponsor-a-Road model lets outdoor brands, breweries, clubs, and donors fund improvements on specific access roads with clear recognition and impact reporting. </p>\n    <p> Pricing depends on road length, existing condition, slope and drainage issues, required aggregate, and travel time. Once we review your map location and photos, we provide a clear, no-obligation estimate and scope of work. </p>\n    <p> Still unsure if your road is a fit? Send us the location and we’ll let you know. </p>\n  </main>\n  <comments/>\n</doc>\n\"#\n    \n  }\n}",
+    "clients.baml": "// Learn more about clients at https://docs.boundaryml.com/docs/snippets/clients/overview\n\nclient<llm> Gpt51CodexLow {\n  provider openai-responses\n  options {\n    model \"gpt-5.1-codex\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n  }\n}\n\nclient<llm> GptOss {\n  provider openai-responses\n  options {\n    model \"gpt-oss-120b\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n  }\n}\n\nclient<llm> Gpt5Medium {\n  provider openai-responses\n  options {\n    model \"gpt-5.1\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"medium\"\n    }\n  }\n}\n\nclient<llm> Gpt5Low {\n  provider openai-responses\n  options {\n    model \"gpt-5.1\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"low\"\n    }\n    text {\n      verbosity: \"low\"\n    }\n  }\n}\n\n// Using the new OpenAI Responses API for enhanced formatting\nclient<llm> CustomGPT5 {\n  provider openai-responses\n  options {\n    model \"gpt-5\"\n    api_key env.OPENAI_API_KEY\n    reasoning {\n      effort \"minimal\"\n    }\n  }\n}\n\n// No retry_policy: DetermineFilesToEdit and PlanFileEdits are retried by llm_executor (honoring retry-after within\n// the call's deadline), retrying here as well would multiply the attempts\nclient<llm> CustomGPT5Mini {\n  provider openai-responses\n  options {\n    model \"gpt-5-mini\"\n    api_key env.OPENAI_API_KEY\n    text {\n      verbosity: \"low\"\n    }\n    reasoning {\n      effort \"minimal\"\n    }\n  }\n}\n\n// Openai with chat completion\nclient<llm> CustomGPT5Chat {\n  provider openai\n  options {\n    model \"gpt-5\"\n    api_key env.OPENAI_API_KEY\n  }\n}\n\n// Latest Anthropic Claude 4 models\nclient<llm> CustomOpus4 {\n  provider anthropic\n  options {\n    model \"claude-opus-4-1-20250805\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\nclient<llm> CustomSonnet4 {\n  provider anthropic\n  options {\n    model \"claude-sonnet-4-20250514\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\nclient<llm> CustomHaiku {\n  provider anthropic\n  retry_policy Constant\n  options {\n    model \"claude-3-5-haiku-20241022\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\n// Example Google AI client (uncomment to use)\n// client<llm> CustomGemini {\n//   provider google-ai\n//   options {\n//     model \"gemini-2.5-pro\"\n//     api_key env.GOOGLE_API_KEY\n//   }\n// }\n\n// Example AWS Bedrock client (uncomment to use)\n// client<llm> CustomBedrock {\n//   provider aws-bedrock\n//   options {\n//     model \"anthropic.claude-sonnet-4-20250514-v1:0\"\n//     region \"us-east-1\"\n//     // AWS credentials are auto-detected from env vars\n//   }\n// }\n\n// Example Azure OpenAI client (uncomment to use)\n// client<llm> CustomAzure {\n//   provider azure-openai\n//   options {\n//     model \"gpt-5\"\n//     api_key env.AZURE_OPENAI_API_KEY\n//     base_url \"https://MY_RESOURCE_NAME.openai.azure.com/openai/deployments/MY_DEPLOYMENT_ID\"\n//     api_version \"2024-10-01-preview\"\n//   }\n// }\n\n// Example Vertex AI client (uncomment to use)\n// client<llm> CustomVertex {\n//   provider vertex-ai\n//   options {\n//     model \"gemini-2.5-pro\"\n//     location \"us-central1\"\n//     // Uses Google Cloud Application Default Credentials\n//   }\n// }\n\n// Example Ollama client for local models (uncomment to use)\n// client<llm> CustomOllama {\n//   provider openai-generic\n//   options {\n//     base_url \"http://localhost:11434/v1\"\n//     model \"llama4\"\n//     default_role \"user\" // Most local models prefer the user role\n//     // No API key needed for local Ollama\n//   }\n// }\n\n// https://docs.boundaryml.com/docs/snippets/clients/round-robin\nclient<llm> CustomFast {\n  provider round-robin\n  options {\n    // This will alternate between the two clients\n    strategy [CustomGPT5Mini, CustomHaiku]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/fallback\nclient<llm> OpenaiFallback {\n  provider fallback\n  options {\n    // This will try the clients in order until one succeeds\n    strategy [CustomGPT5Mini, CustomGPT5]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/retry\nretry_policy Constant {\n  max_retries 3\n  strategy {\n    type constant_delay\n    delay_ms 200\n  }\n}\n\nretry_policy Exponential {\n  max_retries 2\n  strategy {\n    type exponential_backoff\n    delay_ms 300\n    multiplier 1.5\n    max_delay_ms 10000\n  }\n}",
+    "coder.baml": "\nclass LLMMessage {\n  role \"user\" | \"assistant\"\n  content string\n}\n\nclass FileList {\n  reasoning string  @description(\"Explanation of why these files need to be edited or not in one short sentence.\")\n  files string[]  @description(\"List of file paths to edit.\")\n}\n\nclass FileEditTask {\n  path string @description(\"Path of the one file this task edits or creates.\")\n  instructions string @description(\"Self-contained instructions for the changes to this file, including any names (classes, ids, links, text) shared with other files.\")\n}\n\nclass FileEditPlan {\n  tasks FileEditTask[] @description(\"One task per file that needs to change.\")\n}\n\ntemplate_string SystemReminder() #\"<system_reminder>\n  # *SEARCH/REPLACE block* Rules:\n\nEvery *SEARCH/REPLACE block* must use this format:\n1. The *FULL* file path alone on a line, verbatim. No bold asterisks, no quotes around it, no escaping of characters, etc.\n2. The opening fence and code language, eg: ```python\n3. The start of search block: <<<<<<< SEARCH\n4. A contiguous chunk of lines to search for in the existing source code\n5. The dividing line: =======\n6. The lines to replace into the source code\n7. The end of the replace block: >>>>>>> REPLACE\n8. The closing fence: ```\n\nUse the *FULL* file path, as shown to you by the user.\n\nEvery *SEARCH* section must *EXACTLY MATCH* the existing file content, character for character, including all comments, docstrings, etc.\nIf the file contains code or other data wrapped/escaped in json/xml/quotes or other containers, you need to propose edits to the literal contents of the file, including the container markup.\n\n*SEARCH/REPLACE* blocks will *only* replace the first match occurrence.\nIncluding multiple unique *SEARCH/REPLACE* blocks if needed.\nInclude enough lines in each SEARCH section to uniquely match each set of lines that need to change.\n\nKeep *SEARCH/REPLACE* blocks concise.\nBreak large *SEARCH/REPLACE* blocks into a series of smaller blocks that each change a small portion of the file.\nInclude just the changing lines, and a few surrounding lines if needed for uniqueness.\nDo not include long runs of unchanging lines in *SEARCH/REPLACE* blocks.\n\n<moving_code_instructions>\nTo move code within a file, use 2 *SEARCH/REPLACE* blocks: 1 to delete it from its current location, 1 to insert it in the new location.\nMake sure that the *SEARCH/REPLACE* block that deletes the code goes first. \nWhen applying edits, we want to avoid situations where the first inserts the code in the new location, and then remove the code we just added instead of removing the original code. \n</moving_code_instructions>\n\n\nPay attention to which filenames the user wants you to edit.\n\nIf you want to put code in a new file or an empty file, use a *SEARCH/REPLACE block* with:\n- A new file path, including dir name if needed\n- An empty `SEARCH` section\n- The new file's contents in the `REPLACE` section\n\nReply only in English. ONLY EVER RETURN CODE IN A *SEARCH/REPLACE BLOCK*!\nIMPORTANT: We will use a search and replace algorithm, therefore the search and replace blocks need to have exact text, NOT udiff format!\n</system_reminder>\n\"#\n// index.html is the main file, but you can create other files to keep with the best practices.\ntemplate_string  SystemInfo() #\"<system_info>\n    Keep in mind, this project is a website that follows best practices.\n    This project has all css, html and javascript in a single index.html file (unless user specifies otherwise).\n    We are producing a production ready website that geared towards search engine discoverabilty and core web vitals.\n    You must make sure that all changes are clean and complete.\n</system_info>\n\"#\n\ntemplate_string StaticSiteBestPractices() #\"\n<static_website_best_practices>\nAlways make changes with the best practices in mind\n<website_structure>\n1. Keep HTML, CSS, and JavaScript in separate files.\n2. Use a logical and consistent file and folder structure.\n</website_structure>\n<html_best_practices>\n1. Use semantic HTML tags\n2. IMPORTANT: You must avoid using inline style attribute. Always try to use CSS classes.\n3. Never generate inline SVG. Instead use google icons or other publicly available icons.\n4. Use utility classes for layout and spacing, and component classes for reusable UI elements.\n5. Try to keep the code clean, dry, and concise\n6. Make sure your changes are taking into account existing code and make good holistic changes.\n7. When using styles, prefer \"rem\" units. Avoid \"em\" units, if possible.\n8. Use the html lang attribute. Default to english.\n9. Keep styles clean. Make sure we don't have style bloat and unnecessary duplication of properties.\n10. Make sure images and fonts are loaded in a way that is optimal for performance.\n11. Avoid styles that could cause horizontal scrolling.\n12. Make sure to optimize for SEO and core web vitals.\n13. Make sure to update sitemap.xml for any visible content changes.\n14. A production ready website must have robots.txt file.\n</html_best_practices>\n<third_party_libraries>\nWhen using third party libraries, do not make up integrity hashes. Only use integrity checks if provided by the user.\n</third_party_libraries>\n</static_website_best_practices>\n\"#\n\nfunction DetermineFilesToEdit(messages: LLMMessage[], files: string[]) -> FileList {\n  client CustomGPT5Mini\n  prompt #\"\nYou need to determine files to edit from the list of available files in the project and the file contents.\nRemember that if the project contains separate style files, style changes need to go into the appropriate style file. We will not be making inline style changes. All style changes need to go into appropriate css classes.\nWhen making changes to website content (not style only), we need to always update sitemap.xml.\n\nYour output will be a list of filepaths.\n\n {{ SystemInfo() }}\n\n  <available_files_list>\n  {% for file in files %}\n    {{ file }}\n  {% endfor %}\n  </available_files_list>\n\n  {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n  {% endfor %}\n\n  {{ ctx.output_format }}\n  \"#\n\n}\n\nfunction PlanFileEdits(messages: LLMMessage[], files: string[]) -> FileEditPlan {\n  client CustomGPT5Mini\n  prompt #\"\nYou are planning changes to a website so that each file can be edited independently and in parallel by a coder\nwho only sees that one file.\nSplit the user request into one task per file that needs to change. Only use files from the list of available files,\nunless a new file needs to be created.\nEach task's instructions must be self-contained: spell out every name shared between files (css classes, ids, links,\npage titles, text) exactly, so the edits made in different files fit together.\nRemember that style changes go into the appropriate style file, and visible content changes need sitemap.xml updates.\n\n {{ SystemInfo() }}\n\n  <available_files_list>\n  {% for file in files %}\n    {{ file }}\n  {% endfor %}\n  </available_files_list>\n\n  {% for message in messages %}\n      {{ _.role(message.role) }}\n      {{ message.content }}\n  {% endfor %}\n\n  {{ ctx.output_format }}\n  \"#\n}\n\nfunction GenerateSearchReplaceBlocks(messages: LLMMessage[]) -> string {\n  client Gpt5Low\n  prompt #\"\nYou are an agent working within Breba App. You are helping the user build and maintain their website.\nYou will be interacting with a user who is looking at the web page and not the code.\nThat means when the user is referencing something on the page, they are referencing contents of the rendered web page.\n\nAlways use best practices when coding.\nRespect and use existing conventions, libraries, etc that are already present in the code base.\nReply in English.\n\nTake requests for changes to the supplied code.\nDo not ask questions.\n\nWhen responding to the request you MUST:\n\n1. Think step-by-step and explain the needed changes in a few short sentences.\n\n2. Describe each change with a *SEARCH/REPLACE block* per the examples below.\n\nAll changes to files must use this *SEARCH/REPLACE block* format.\nONLY EVER RETURN CODE IN A *SEARCH/REPLACE BLOCK*!\n\n{{ SystemInfo() }}\n\n{{ StaticSiteBestPractices() }}\n    \n{{ SystemReminder() }}\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n    {{ _.role(\"system\") }}\n    {{ ctx.output_format }}\n\n  \"#\n}\n\ntest BuildHelloWorldSite {\n  functions [GenerateSearchReplaceBlocks]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"Files available for editing:\"#\n      }\n      {\n        role \"user\"\n        content #\"Create a simple hello world site\"#\n      }\n    ]\n  }\n}\n\ntest ProduceFileList {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest TestFileListIncludesStyles {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest DoubleCheckFileList {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"reasoning\": \"The visible text change from “Hello World” to “Hello Universe” involves editing the HTML page (index.html). Because this is a visible change to end users, the sitemap must also be updated to reflect the new content.\",\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ],\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <link rel=\"stylesheet\" href=\"styles.css\">\n</head>\n<body>\n    <main>\n        <h1>Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\n\ntest DoubleCheckFileListWithFollowupStyles {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"index.html, styles.css, script.js, sitemap.xml\"#\n      }\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ]\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"\n        index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <link rel=\"stylesheet\" href=\"styles.css\">\n</head>\n<body>\n    <main>\n        <h1 class=\"text-green\">Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional css or javascript files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"styles.css\", \"script.js\", \"sitemap.xml\"]\n  }\n}\n\ntest DoubleCheckSinglularHTMLFile {\n  functions [DetermineFilesToEdit]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"List files available in my project.\"#\n      }\n      {\n        role \"assistant\"\n        content #\"index.html, script.js, sitemap.xml\"#\n      }\n      {\n        role \"user\"\n        content #\"Change text from Hello World to Hello Universe. And make the text red\"#\n      }\n      {\n        role \"assistant\"\n        content #\"\n          {\n  \"files\": [\n    \"index.html\",\n    \"sitemap.xml\"\n  ]\n}\n        \"#\n      }\n      {\n        role \"user\"\n        content #\"\n        index.html\n          ```<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>Hello World</title>\n    <style>\n      .text-green {\n        color: green;\n      }\n</head>\n<body>\n    <main>\n        <h1 class=\"text-green\">Hello World</h1>\n        <p>Welcome to this minimalist site.</p>\n        <button id=\"cta-button\">Get Started</button>\n    </main>\n    <script src=\"script.js\" defer></script>\n</body>\n</html>\n```\n\nsitemap.xml\n```\n<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n    <url>\n        <loc>https://yourdomain.com/</loc>\n        <lastmod>2026-01-06</lastmod>\n        <changefreq>monthly</changefreq>\n        <priority>1.0</priority>\n    </url>\n</urlset>\n```\n\nAre additional css or javascript files needed to make this change?\n\"#\n      }\n    ],\n    files [\"index.html\", \"sitemap.xml\"]\n  }\n}",
     "generators.baml": "// This helps use auto generate libraries you can use in the language of\n// your choice. You can have multiple generators if you use multiple languages.\n// Just ensure that the output_dir is different for each generator.\ngenerator target {\n    // Valid values: \"python/pydantic\", \"typescript\", \"ruby/sorbet\", \"rest/openapi\"\n    output_type \"python/pydantic\"\n\n    // Where the generated code will be saved (relative to baml_src/)\n    output_dir \"../\"\n\n    // The version of the BAML package you have installed (e.g. same version as your baml-py or @boundaryml/baml).\n    // The BAML VSCode extension version should also match this version.\n    version \"0.217.0\"\n\n    // Valid values: \"sync\", \"async\"\n    // This controls what `b.FunctionName()` will be (sync or async).\n    default_client_mode sync\n}\n",
     "notes.baml": "template_string RulesForExecutiveSummary() #\"\nRules:\n1. Be extremely concise.\n2. Do not repeat information.\n3. Do not include explanations, reasoning, or filler.\n4. Prefer concrete facts over narrative wording.\n5. Do not invent missing details.\n6. Keep the output compact.\n7. The information you exttract should be fewer words than the original user input. You are trying to extract meaning.\n8. IMPORTANT: DO NOT EXTRACT IMPLEMENTATION DETAILS. THOSE WILL GO INTO HTML. YOUR JOB IS TO EXCTRACT: intents, invariants, decisions, preferences, and constraints. DO NOT EXTRACT IMPLEMENTATION DETAILS. DO NOT EXTRACT THINGS LIKE \"Use a dark theme\". INSTEAD, EXTRACT THE PREFERENCE \"Dark theme\" WITHOUT SAYING ANYTHING ABOUT IMPLEMENTATION.\n9. DO NOT EXTRACT CONTENT OR STRUCTURE DETAILS.\n10. DO NOT EXTRACT USER SENTIMENTS OR EMOTIONS. ONLY EXTRACT FACTS AND PREFERENCES.\n11. IMPORTANT: Do not extract content requirements. Those will go into the HTML. You are writing notes to supplement the HTML.\n12. Do not use imperative language. The notes capture the final state of the user's preferences, decisions, and requirements. They do not include instructions or suggestions.\n\n\"#\n\n\ntemplate_string NewProjectExecutiveSummary() #\"\nYour job is to read the user's website request and produce a VERY concise summary.\nYou will capture information about things the user wants, likes, or prefers facts the user or the website, and any constraints or requirements.\n\n{{RulesForExecutiveSummary()}}\n\n  <example_executive_summary>\n  Background\n  James Callfield started his plubmbing business 20 years ago. The business name is \"Callfield Plumbing\". The business is based in Austin, Texas. James has 10 employees.\n\n  Website Description\n  The website is intended to capture leads for the plumbing business.\n  It will have two calls to action: 1) Schedule a service appointment and 2) Learn more about our services.\n\n  Visual Preferences\n  Dark theme. Simple and clean design. Blue and Grey colors preferred.\n\n  Technical Requirements\n  Single HTML file that contains all styles, scripts and html.\n  </example_executive_summary>\n\n    \"#\n\ntemplate_string ExistingProjectExecutiveSummary() #\"\n    Update the existing project summary based on the conversation. If there is nothing to update, just say \"noop\".\n    If there are updates, produce the full updated notes, not just the changes.\n\n    {{RulesForExecutiveSummary()}}\n\n    You must ignore content updates.\n    If existing executive summary contains details about content, remove them. This is an executive architecture summary.\n    \"#\n\n\nfunction CoderNotes(messages: LLMMessage[], coder_notes: string) -> string {\n  client Gpt5Low\n    prompt #\"You are an AI agent that helps maintain an executive summary of a user project. Analyze user conversation and extract high level information.\n    {% if coder_notes %}\n        {{ _.role(\"system\") }}\n        {{ ExistingProjectExecutiveSummary() }}\n    {% else %}\n        {{ _.role(\"system\") }}\n        {{ NewProjectExecutiveSummary() }}\n    {% endif %}\n\n\n    {% for message in messages %}\n      {{ _.role(message.role) }} \n      {{ message.content }}\n    {% endfor %}\n\n    {% if coder_notes %}\n      {{ _.role(\"user\") }}\n      Here is my current website description and preferences. If necessary, update it based on this conversation:\n      {{ coder_notes }}\n    {% else %}\n      {{ _.role(\"system\") }}\n      This is a brand new project, so there are no coder notes yet. Based on our conversation, create the initial coder notes for this project.\n    {% endif %}\n\n  \"#\n}\n\ntest DemoWebsiteNotes {\n  functions [CoderNotes]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"Build a hello world website for me. This is a demo. So make it very simple\"#\n      },\n      {\n        role \"assistant\"\n        content #\"What color scheme do you prefer?\"#\n      },\n      {\n        role \"user\"\n        content #\"Let's make dark, but it doesn't really matter.\"#\n      }\n    ],\n    coder_notes \"\"\n  }\n}\n\ntest ConsultingWebsiteNotes {\n  functions [CoderNotes]\n  args {\n    messages [\n      {\n        role \"user\"\n        content #\"I run a business called Breba Consulting and I need a landing page for it.\n            Hero section shoule include a headline: Like this? I can make one for you.\n            The subheading should be: Creating a landing page for your business should not be a chore. I will create a custom landing page for your business in minutes, not days.\n            The primary CTA should be \"Boook a free consultation\" and the secondary CTA should be \"See samples of work\".\n            We will have a section with portfolio. I will fill that in later, but it should have space for 5 projects.\n\n        \"#\n      },\n      {\n        role \"assistant\"\n        content #\"What color scheme do you prefer?\"#\n      },\n      {\n        role \"user\"\n        content #\"Let's make dark.\"#\n      }\n    ],\n    coder_notes \"\"\n  }\n}\n\n\ntest DemoWebsiteNotesFollowUp {\n  functions [CoderNotes]\n  args {\n    messages [\n        {\n            role \"user\"\n            content #\"Actually, I want the website to have a dark theme.\"#\n        },\n        {\n            role \"assistant\"\n            content #\"Okay, should that button gradients, or leave them as is?\"#\n        },\n        {\n            role \"user\"\n            content #\"Yes, change button gradients to fight dark theme\"#\n        }\n\n    ],\n    coder_notes #\"Background  \n- Business name: Breba Consulting  \n\nWebsite Description  \n- Single landing page promoting consulting services  \n- Focus on offering custom landing pages for clients  \n\nPrimary Goals  \n- Capture leads via consultation bookings  \n- Showcase work samples/portfolio  \n\nCalls to Action  \n- Primary CTA: \"Boook a free consultation\"\n- Secondary CTA: \"See samples of work\"\n\nContent Requirements (High-Level)  \n- Hero section with headline and subheading provided by user  \n- Portfolio area with capacity for 5 projects (user will add content later)  \n\nVisual Preferences  \n- Light theme\"#\n  }\n}\n\n\ntest DemoWebsiteNotesFollowUpDuplicateRequest {\n  functions [CoderNotes]\n  args {\n    messages [\n        {\n            role \"user\"\n            content #\"Actually, get rid of secondary CTA.\"#\n        },\n        {\n            role \"assistant\"\n            content #\"Something went wrong?\"#\n        },\n        {\n            role \"user\"\n            content #\"I said remove secondary CTA button\"#\n        }\n\n    ],\n    coder_notes #\"Background  \n- Business name: Breba Consulting  \n\nWebsite Description  \n- Single landing page promoting consulting services  \n- Focus on offering custom landing pages for clients  \n\nPrimary Goals  \n- Capture leads via consultation bookings  \n- Showcase work samples/portfolio  \n\nCalls to Action  \n- Primary CTA: \"Boook a free consultation\"\n- Secondary CTA: \"See samples of work\"\n\nContent Requirements (High-Level)  \n- Hero section with headline and subheading provided by user  \n- Portfolio area with capacity for 5 projects (user will add content later)  \n\nVisual Preferences  \n- Light theme\"#\n  }\n}\n\n\ntest WebsiteNotesFollowUpNoop {\n  functions [CoderNotes]\n  args {\n    messages [\n        {\n            role \"user\"\n            content #\"Change \\\"You like this landing page?\\\" to \\\"Landinge Pages for Everyone\\\"\"#\n        }\n    ],\n    coder_notes #\"Background  \n- Business name: Breba Consulting  \n\nWebsite Description  \n- Single landing page promoting consulting services  \n- Focus on offering custom landing pages for clients  \n\nPrimary Goals  \n- Capture leads via consultation bookings  \n- Showcase work samples/portfolio  \n\nCalls to Action  \n- Primary CTA: \"Boook a free consultation\"\n- Secondary CTA: \"See samples of work\"\n\nVisual Preferences  \n- Light theme\"#\n  }\n}",
+    "scaffold.baml": "class SiteSection {\n  id string @description(\"Unique kebab-case id of the section, used as the html id, e.g. hero, features, pricing, footer\")\n  tag \"header\" | \"section\" | \"footer\" @description(\"Html element that wraps the section\")\n  instructions string @description(\"Everything the section needs from the specification: content, assets, links, layout.\")\n}\n\nclass SitePlan {\n  title string @description(\"Page title for the <title> tag\")\n  description string @description(\"Meta description for search engines, under 160 characters\")\n  design_tokens string @description(\"CSS :root block with custom properties (--color-*, --font-*, --space-*, --radius-*) shared by all sections\")\n  base_css string @description(\"Shared CSS: reset, body and typography, layout utility and component classes used across sections. Must use the design tokens.\")\n  sections SiteSection[] @description(\"Sections of the page in order of appearance\")\n}\n\nclass SectionCode {\n  html string @description(\"Html of the section only, wrapped in its tag with the section id. No <html>, <head> or <body>.\")\n  css string @description(\"CSS for this section only, every selector scoped under #<section id>. Must use the design tokens.\")\n}\n\nfunction PlanSiteSections(spec: string, assets: string) -> SitePlan {\n  client Gpt5Low\n  prompt #\"\nYou are planning a brand-new single page website so that each of its sections can be written independently and in\nparallel by different developers who only see the plan and their own section.\nDerive the sections from the specification, define the shared design tokens and the shared base CSS all sections\nwill use, so that the sections look like one coherent site.\nIf the user uploaded files (images, logos, documents), put the urls of the ones a section should use in its instructions.\n\n{{ SystemInfo() }}\n\n{{ StaticSiteBestPractices() }}\n\n{{ _.role(\"user\") }}\n<specification>\n{{ spec }}\n</specification>\n{% if assets %}\n\n<uploaded_files>\n{{ assets }}\n</uploaded_files>\n{% endif %}\n\n{{ ctx.output_format }}\n  \"#\n}\n\nfunction GenerateSection(spec: string, plan: SitePlan, section: SiteSection, assets: string) -> SectionCode {\n  client Gpt5Low\n  prompt #\"\nYou are writing one section of a brand-new single page website. Other sections are written by other developers\nat the same time, they follow the same plan.\nOnly write the {{ section.id }} section. Use the design tokens and the shared base CSS classes from the plan,\ndo not redefine them. Scope all of your CSS under #{{ section.id }}.\n\n{{ SystemInfo() }}\n\n{{ StaticSiteBestPractices() }}\n\n{{ _.role(\"user\") }}\n<specification>\n{{ spec }}\n</specification>\n\n<design_tokens>\n{{ plan.design_tokens }}\n</design_tokens>\n\n<base_css>\n{{ plan.base_css }}\n</base_css>\n\n<sections_of_the_page>\n{% for s in plan.sections %}\n- {{ s.tag }}#{{ s.id }}\n{% endfor %}\n</sections_of_the_page>\n{% if assets %}\n\n<uploaded_files>\nUse these files by their url, do not invent other image or document urls.\n{{ assets }}\n</uploaded_files>\n{% endif %}\n\nWrite the {{ section.tag }}#{{ section.id }} section:\n{{ section.instructions }}\n\n{{ ctx.output_format }}\n  \"#\n}\n",
 }
 
 def get_baml_files():
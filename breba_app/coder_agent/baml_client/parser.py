@@ -42,6 +42,24 @@ class LlmResponseParser:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="GenerateSearchReplaceBlocks", llm_response=llm_response, mode="request")
         return typing.cast(str, __result__)
 
+    def GenerateSection(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> types.SectionCode:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="GenerateSection", llm_response=llm_response, mode="request")
+        return typing.cast(types.SectionCode, __result__)
+
+    def PlanFileEdits(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> types.FileEditPlan:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="PlanFileEdits", llm_response=llm_response, mode="request")
+        return typing.cast(types.FileEditPlan, __result__)
+
+    def PlanSiteSections(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> types.SitePlan:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="PlanSiteSections", llm_response=llm_response, mode="request")
+        return typing.cast(types.SitePlan, __result__)
+
     def UserResponseOrCoder(
         self, llm_response: str, baml_options: BamlCallOptions = {},
     ) -> typing.Union["types.ResponseToUser", "types.Coder"]:
@@ -80,6 +98,24 @@ class LlmStreamParser:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="GenerateSearchReplaceBlocks", llm_response=llm_response, mode="stream")
         return typing.cast(str, __result__)
 
+    def GenerateSection(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> stream_types.SectionCode:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="GenerateSection", llm_response=llm_response, mode="stream")
+        return typing.cast(stream_types.SectionCode, __result__)
+
+    def PlanFileEdits(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> stream_types.FileEditPlan:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="PlanFileEdits", llm_response=llm_response, mode="stream")
+        return typing.cast(stream_types.FileEditPlan, __result__)
+
+    def PlanSiteSections(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> stream_types.SitePlan:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="PlanSiteSections", llm_response=llm_response, mode="stream")
+        return typing.cast(stream_types.SitePlan, __result__)
+
     def UserResponseOrCoder(
         self, llm_response: str, baml_options: BamlCallOptions = {},
     ) -> typing.Union["stream_types.ResponseToUser", "stream_types.Coder"]:
@@ -23,12 +23,19 @@ class StreamState(BaseModel, typing.Generic[StreamStateValueT]):
     value: StreamStateValueT
     state: typing_extensions.Literal["Pending", "Incomplete", "Complete"]
 # #########################################################################
-# Generated classes (4)
+# Generated classes (9)
 # #########################################################################
 
 class Coder(BaseModel):
     invoke_coder: typing.Optional[bool] = None
 
+class FileEditPlan(BaseModel):
+    tasks: typing.List["FileEditTask"] = Field(description='One task per file that needs to change.')
+
+class FileEditTask(BaseModel):
+    path: typing.Optional[str] = Field(default=None, description='Path of the one file this task edits or creates.')
+    instructions: typing.Optional[str] = Field(default=None, description='Self-contained instructions for the changes to this file, including any names (classes, ids, links, text) shared with other files.')
+
 class FileList(BaseModel):
     reasoning: typing.Optional[str] = Field(default=None, description='Explanation of why these files need to be edited or not in one short sentence.')
     files: typing.List[str] = Field(description='List of file paths to edit.')
@@ -40,6 +47,22 @@ class LLMMessage(BaseModel):
 class ResponseToUser(BaseModel):
     response_to_user: typing.Optional[str] = None
 
+class SectionCode(BaseModel):
+    html: typing.Optional[str] = Field(default=None, description='Html of the section only, wrapped in its tag with the section id. No <html>, <head> or <body>.')
+    css: typing.Optional[str] = Field(default=None, description='CSS for this section only, every selector scoped under #<section id>. Must use the design tokens.')
+
+class SitePlan(BaseModel):
+    title: typing.Optional[str] = Field(default=None, description='Page title for the <title> tag')
+    description: typing.Optional[str] = Field(default=None, description='Meta description for search engines, under 160 characters')
+    design_tokens: typing.Optional[str] = Field(default=None, description='CSS :root block with custom properties (--color-*, --font-*, --space-*, --radius-*) shared by all sections')
+    base_css: typing.Optional[str] = Field(default=None, description='Shared CSS: reset, body and typography, layout utility and component classes used across sections. Must use the design tokens.')
+    sections: typing.List["SiteSection"] = Field(description='Sections of the page in order of appearance')
+
+class SiteSection(BaseModel):
+    id: typing.Optional[str] = Field(default=None, description='Unique kebab-case id of the section, used as the html id, e.g. hero, features, pricing, footer')
+    tag: typing.Optional[typing.Union[typing_extensions.Literal['header'], typing_extensions.Literal['section'], typing_extensions.Literal['footer']]] = Field(default=None, description='Html element that wraps the section')
+    instructions: typing.Optional[str] = Field(default=None, description='Everything the section needs from the specification: content, assets, links, layout.')
+
 # #########################################################################
 # Generated type aliases (0)
 # #########################################################################
@@ -19,6 +19,12 @@ type_map = {
     "types.Coder": types.Coder,
     "stream_types.Coder": stream_types.Coder,
 
+    "types.FileEditPlan": types.FileEditPlan,
+    "stream_types.FileEditPlan": stream_types.FileEditPlan,
+
+    "types.FileEditTask": types.FileEditTask,
+    "stream_types.FileEditTask": stream_types.FileEditTask,
+
     "types.FileList": types.FileList,
     "stream_types.FileList": stream_types.FileList,
 
@@ -28,5 +34,14 @@ type_map = {
     "types.ResponseToUser": types.ResponseToUser,
     "stream_types.ResponseToUser": stream_types.ResponseToUser,
 
+    "types.SectionCode": types.SectionCode,
+    "stream_types.SectionCode": stream_types.SectionCode,
+
+    "types.SitePlan": types.SitePlan,
+    "stream_types.SitePlan": stream_types.SitePlan,
+
+    "types.SiteSection": types.SiteSection,
+    "stream_types.SiteSection": stream_types.SiteSection,
+
 
 }
\ No newline at end of file
@@ -41,12 +41,19 @@ def all_succeeded(checks: typing.Dict[CheckName, Check]) -> bool:
 # #########################################################################
 
 # #########################################################################
-# Generated classes (4)
+# Generated classes (9)
 # #########################################################################
 
 class Coder(BaseModel):
     invoke_coder: bool
 
+class FileEditPlan(BaseModel):
+    tasks: typing.List["FileEditTask"] = Field(description='One task per file that needs to change.')
+
+class FileEditTask(BaseModel):
+    path: str = Field(description='Path of the one file this task edits or creates.')
+    instructions: str = Field(description='Self-contained instructions for the changes to this file, including any names (classes, ids, links, text) shared with other files.')
+
 class FileList(BaseModel):
     reasoning: str = Field(description='Explanation of why these files need to be edited or not in one short sentence.')
     files: typing.List[str] = Field(description='List of file paths to edit.')
@@ -58,6 +65,22 @@ class LLMMessage(BaseModel):
 class ResponseToUser(BaseModel):
     response_to_user: str
 
+class SectionCode(BaseModel):
+    html: str = Field(description='Html of the section only, wrapped in its tag with the section id. No <html>, <head> or <body>.')
+    css: str = Field(description='CSS for this section only, every selector scoped under #<section id>. Must use the design tokens.')
+
+class SitePlan(BaseModel):
+    title: str = Field(description='Page title for the <title> tag')
+    description: str = Field(description='Meta description for search engines, under 160 characters')
+    design_tokens: str = Field(description='CSS :root block with custom properties (--color-*, --font-*, --space-*, --radius-*) shared by all sections')
+    base_css: str = Field(description='Shared CSS: reset, body and typography, layout utility and component classes used across sections. Must use the design tokens.')
+    sections: typing.List["SiteSection"] = Field(description='Sections of the page in order of appearance')
+
+class SiteSection(BaseModel):
+    id: str = Field(description='Unique kebab-case id of the section, used as the html id, e.g. hero, features, pricing, footer')
+    tag: typing.Union[typing_extensions.Literal['header'], typing_extensions.Literal['section'], typing_extensions.Literal['footer']] = Field(description='Html element that wraps the section')
+    instructions: str = Field(description='Everything the section needs from the specification: content, assets, links, layout.')
+
 # #########################################################################
 # Generated type aliases (0)
 # #########################################################################
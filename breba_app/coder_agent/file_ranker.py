@@ -0,0 +1,176 @@
+"""
+Local retrieval stage for picking the coder's working set without an LLM round trip.
+
+Pages (html/md files) are scored against the latest user request with BM25 over their path and content tokens,
+plus a trigram bonus on the file name so that "pricing" still finds prices.html. When one page is the clear winner
+(or there is only one page) the working set is that page, the local assets it links to and sitemap.xml.
+Anything ambiguous returns None and the caller falls back to DetermineFilesToEdit.
+
+Tokenized documents are cached by (path, sha256), so after an edit only the changed files are re-tokenized.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.filesystem import FileStore
+
+PAGE_EXTENSIONS = (".html", ".htm", ".md")
+# Linked assets that are text and can be sent to the coder (images, fonts, pdfs are not)
+TEXT_ASSET_EXTENSIONS = (".css", ".js", ".html", ".htm")
+SITEMAP_FILE_NAME = "sitemap.xml"
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Path tokens count as this many occurrences, a page named after the request is a strong signal
+PATH_WEIGHT = 5
+PATH_TRIGRAM_WEIGHT = 2.0
+# The best page must score at least MIN_SCORE and MIN_MARGIN times the runner-up to be picked without the LLM
+MIN_SCORE = 1.0
+MIN_MARGIN = 2.0
+
+# Requests that are about more than one page are left to the LLM
+MULTI_PAGE_WORDS = frozenset({"all", "every", "each", "pages", "sitewide", "everywhere"})
+# Words of a request that say nothing about where the edit goes. "about" is not one of them, it is a page name.
+STOP_WORDS = frozenset({
+    "a", "add", "an", "and", "are", "as", "at", "be", "by", "can", "change", "could", "do", "for", "from", "have",
+    "i", "in", "into", "is", "it", "like", "make", "me", "my", "of", "on", "or", "page", "please", "should", "site",
+    "so", "that", "the", "this", "to", "want", "we", "website", "with", "would", "you",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_LINK_RE = re.compile(r"""(?:href|src)\s*=\s*["']([^"'#?]+)""", re.IGNORECASE)
+
+DOC_CACHE_MAX_ENTRIES = 512
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class _Doc:
+    term_freqs: Counter
+    length: int
+    name_trigrams: frozenset[str]
+    links: frozenset[str]
+
+
+_doc_cache: OrderedDict[tuple[str, str], _Doc] = OrderedDict()
+
+
+def _build_doc(path: str, content: str) -> _Doc:
+    path_tokens = _tokens(path.rsplit(".", 1)[0])
+    term_freqs = Counter(_tokens(content))
+    for token in path_tokens:
+        term_freqs[token] += PATH_WEIGHT
+    name_trigrams = set()
+    for token in path_tokens:
+        name_trigrams |= _trigrams(token)
+    links = frozenset(link.lstrip("./") for link in _LINK_RE.findall(content))
+    return _Doc(term_freqs, sum(term_freqs.values()), frozenset(name_trigrams), links)
+
+
+def _get_doc(path: str, content: str) -> _Doc:
+    key = (path, hashlib.sha256(content.encode("utf-8")).hexdigest())
+    doc = _doc_cache.get(key)
+    if doc is None:
+        doc = _build_doc(path, content)
+        _doc_cache[key] = doc
+        if len(_doc_cache) > DOC_CACHE_MAX_ENTRIES:
+            _doc_cache.popitem(last=False)
+    else:
+        _doc_cache.move_to_end(key)
+    return doc
+
+
+class FileIndex:
+    """BM25 index over the pages of a filestore"""
+
+    def __init__(self, docs: dict[str, _Doc]):
+        self._docs = docs
+        self._doc_freqs: Counter = Counter()
+        for doc in docs.values():
+            self._doc_freqs.update(doc.term_freqs.keys())
+        self._avg_length = sum(doc.length for doc in docs.values()) / len(docs) if docs else 0.0
+
+    @classmethod
+    def from_filestore(cls, filestore: FileStore, paths: list[str]) -> FileIndex:
+        return cls({path: _get_doc(path, filestore.read_text(path)) for path in paths})
+
+    def links(self, path: str) -> frozenset[str]:
+        return self._docs[path].links
+
+    def rank(self, query: str) -> list[tuple[str, float]]:
+        """Pages with their scores, best first"""
+        terms = [t for t in _tokens(query) if t not in STOP_WORDS]
+        query_trigrams = set()
+        for term in terms:
+            query_trigrams |= _trigrams(term)
+
+        n = len(self._docs)
+        scores = []
+        for path, doc in self._docs.items():
+            score = 0.0
+            for term in terms:
+                tf = doc.term_freqs.get(term, 0)
+                if not tf:
+                    continue
+                df = self._doc_freqs[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc.length / self._avg_length))
+            if doc.name_trigrams:
+                overlap = len(doc.name_trigrams & query_trigrams) / len(doc.name_trigrams)
+                score += PATH_TRIGRAM_WEIGHT * overlap
+            scores.append((path, score))
+        return sorted(scores, key=lambda item: (-item[1], item[0]))
+
+
+def latest_user_request(messages: list[LLMMessage]) -> str:
+    for message in reversed(messages):
+        if message.role == "user" and message.content.strip():
+            return message.content
+    return ""
+
+
+def _working_set(page: str, index: FileIndex, files: list[str]) -> set[str]:
+    available = set(files)
+    assets = {path for path in index.links(page) & available if path.lower().endswith(TEXT_ASSET_EXTENSIONS)}
+    working_set = {page} | assets
+    if page.endswith((".html", ".htm")) and SITEMAP_FILE_NAME in available:
+        working_set.add(SITEMAP_FILE_NAME)
+    return working_set
+
+
+def select_files_to_edit(*, messages: list[LLMMessage], filestore: FileStore) -> set[str] | None:
+    """
+    Pick the working set for the latest user request locally.
+    Returns None when the request is ambiguous and should go to DetermineFilesToEdit.
+    """
+    files = filestore.list_files()
+    pages = [path for path in files if path.lower().endswith(PAGE_EXTENSIONS)]
+    if not pages:
+        return None
+
+    query = latest_user_request(messages)
+    if MULTI_PAGE_WORDS.intersection(_tokens(query)):
+        return None
+
+    index = FileIndex.from_filestore(filestore, pages)
+    if len(pages) == 1:
+        return _working_set(pages[0], index, files)
+
+    (best, best_score), (_, runner_up_score) = index.rank(query)[:2]
+    if best_score >= MIN_SCORE and best_score >= MIN_MARGIN * runner_up_score:
+        return _working_set(best, index, files)
+    return None
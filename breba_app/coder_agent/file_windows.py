@@ -0,0 +1,129 @@
+"""
+Windowed file context for the coder.
+
+Small files are sent in full. For large files only the regions relevant to the request are sent, each with
+a "lines a-b of n" anchor that stays the same across retries, plus the page outline for html files.
+Regions are grown to the enclosing html section when it is small enough, and widen on every failed attempt
+until the whole file is sent.
+"""
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_right
+from collections import Counter
+
+from breba_app.coder_agent.file_ranker import STOP_WORDS
+from breba_app.coder_agent.site_outline import build_outline, render_outline
+
+# Files up to this many lines are always sent in full
+WINDOW_MIN_LINES = 400
+CONTEXT_LINES = 15
+MAX_ANCHORS = 6
+# An html section up to this many lines is sent whole when one of its lines is relevant
+SECTION_MAX_LINES = 80
+# After this many widenings the whole file is sent
+MAX_WIDEN = 2
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def _query_terms(query: str) -> set[str]:
+    return {word for word in _WORD_RE.findall(query.lower()) if word not in STOP_WORDS}
+
+
+def _anchor_lines(lines: list[str], terms: set[str]) -> list[int]:
+    """Indexes of the lines that best match the query, rare words count more"""
+    line_words = [terms & set(_WORD_RE.findall(line.lower())) for line in lines]
+    doc_freqs = Counter(word for words in line_words for word in words)
+    scored = []
+    for i, words in enumerate(line_words):
+        if words:
+            score = sum(math.log(1 + len(lines) / doc_freqs[word]) for word in words)
+            scored.append((score, i))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return sorted(i for _, i in scored[:MAX_ANCHORS])
+
+
+def _section_spans(content: str, lines: list[str]) -> list[tuple[int, int]]:
+    """(first line, last line) of the small html sections, innermost first"""
+    line_offsets = [0]
+    for line in lines:
+        line_offsets.append(line_offsets[-1] + len(line.encode("utf-8")) + 1)
+    spans = []
+    for node in build_outline(content).nodes:
+        first = bisect_right(line_offsets, node.start) - 1
+        last = bisect_right(line_offsets, max(node.start, node.end - 1)) - 1
+        if last - first < SECTION_MAX_LINES:
+            spans.append((first, last))
+    return sorted(spans, key=lambda span: span[1] - span[0])
+
+
+def select_regions(path: str, content: str, query: str, *, widen: int = 0) -> list[tuple[int, int]] | None:
+    """
+    Inclusive, zero based (first, last) line ranges to send for a file.
+    None means the whole file should be sent.
+    """
+    lines = content.split("\n")
+    if len(lines) <= WINDOW_MIN_LINES or widen >= MAX_WIDEN:
+        return None
+    anchors = _anchor_lines(lines, _query_terms(query))
+    if not anchors:
+        return None
+
+    context = CONTEXT_LINES * (2 ** widen)
+    spans = _section_spans(content, lines) if path.endswith((".html", ".htm")) else []
+    regions = []
+    for anchor in anchors:
+        first, last = anchor, anchor
+        for span_first, span_last in spans:
+            if span_first <= anchor <= span_last:
+                first, last = span_first, span_last
+                break
+        regions.append((max(0, first - context), min(len(lines) - 1, last + context)))
+
+    return _merge(regions)
+
+
+def _merge(regions: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    regions = sorted(regions)
+    merged = [regions[0]]
+    for first, last in regions[1:]:
+        if first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def _render_regions(path: str, content: str, regions: list[tuple[int, int]]) -> str:
+    lines = content.split("\n")
+    response = (f"{path} ({len(lines)} lines, only the regions relevant to the request are shown. "
+                f"SEARCH blocks must match lines from these regions exactly)\n")
+    if path.endswith((".html", ".htm")):
+        response += f"<outline>\n{render_outline(path, build_outline(content))}\n</outline>\n"
+    for first, last in regions:
+        region = "\n".join(lines[first:last + 1])
+        response += f"{path} lines {first + 1}-{last + 1} of {len(lines)}\n```\n{region}\n```\n"
+    return response
+
+
+def render_file_window(path: str, content: str, query: str, *, widen: int = 0) -> str | None:
+    """The relevant regions of a large file, None when the whole file should be sent instead"""
+    regions = select_regions(path, content, query, widen=widen)
+    if regions is None:
+        return None
+    return _render_regions(path, content, regions)
+
+
+def render_file_regions(path: str, content: str, regions: list[tuple[int, int]], *, widen: int = 0) -> str | None:
+    """
+    Given [start, end) line ranges (e.g. the closest matches of failed SEARCH blocks), render them with context.
+    None when the whole file should be sent instead.
+    """
+    lines = content.split("\n")
+    if len(lines) <= WINDOW_MIN_LINES or widen >= MAX_WIDEN or not regions:
+        return None
+    context = CONTEXT_LINES * (2 ** widen)
+    regions = [(max(0, start - context), min(len(lines) - 1, end - 1 + context)) for start, end in regions]
+    return _render_regions(path, content, _merge(regions))
@@ -0,0 +1,157 @@
+"""
+Progressive preview of the coder's work.
+
+While GenerateSearchReplaceBlocks streams, every SEARCH/REPLACE block that is complete is applied to a scratch
+overlay of the files, and the pages and stylesheets it changed are pushed to the preview (ui_bus ->
+generator.html -> preview_bridge.js), so the user watches the site change instead of a frozen page.
+Each block is applied once, when it completes, and without the fuzzy matching of the edit engine: a block that
+does not match exactly is left to the real edit and the coder's retry.
+Pushes are debounced and only the latest state of a file is sent. close() sends the final state of every pushed
+file (the committed edits, or the original files when the coder failed) before the real preview is rebuilt.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Hashable
+
+from breba_app.filesystem import FileStore, OverlayFileStore
+from breba_app.search_replace_editing import update_blocks_gen, do_replace, EditRequest, UPDATED_ERR
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_DEBOUNCE_SECONDS = 0.5
+PREVIEW_EXTENSIONS = (".html", ".htm", ".css")
+
+
+def completed_edits(partial_text: str) -> list[EditRequest]:
+    """The SEARCH/REPLACE blocks of a partial coder response that are complete"""
+    # The last line may still be streaming
+    complete_lines = partial_text[:partial_text.rfind("\n") + 1]
+    edits = []
+    try:
+        for edit in update_blocks_gen(complete_lines):
+            edits.append(edit)
+    except ValueError:
+        # The block that is still being written
+        pass
+    return edits
+
+
+def _apply_exact(files: FileStore, edit: EditRequest) -> bool:
+    """Applies the edit when it matches exactly (up to indentation), True when the file changed"""
+    if not edit.search.strip():
+        if not edit.replace:
+            return False
+        content = files.read_text(edit.path) if files.file_exists(edit.path) else ""
+        files.write_text(edit.path, content + edit.replace)
+        return True
+    if not files.file_exists(edit.path):
+        return False
+    try:
+        new_content = do_replace(files.read_text(edit.path), edit.search, edit.replace)
+    except ValueError:
+        return False
+    if not new_content:
+        return False
+    files.write_text(edit.path, new_content)
+    return True
+
+
+class LivePreview:
+    def __init__(self, publish: Callable[[str, str], Awaitable[None]],
+                 done: Callable[[], Awaitable[None]] | None = None, *,
+                 debounce: float = PREVIEW_DEBOUNCE_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self._publish = publish
+        self._done = done
+        self._debounce = debounce
+        self._clock = clock
+        # Scratch copy of the files of the current attempt with the completed blocks applied
+        self._files: OverlayFileStore | None = None
+        # Completed and applied blocks of the streams of the current attempt, keyed by stream
+        self._completed_blocks: dict[Hashable, int] = {}
+        self._applied_edits: dict[Hashable, int] = {}
+        self._pending: dict[str, str] = {}
+        self._published: dict[str, str] = {}
+        self._last_publish = float("-inf")
+        self._flush_task: asyncio.Task | None = None
+        self._enabled = True
+
+    def start(self, files: FileStore) -> None:
+        """A new generation on top of files (e.g. a retry on top of the edits that already applied)"""
+        self._files = OverlayFileStore(files)
+        self._completed_blocks.clear()
+        self._applied_edits.clear()
+
+    def feeder(self, stream: Hashable = None) -> Callable[[str], None]:
+        """Callback for the partial responses of one stream"""
+        return lambda partial_text: self.feed(partial_text, stream)
+
+    def feed(self, partial_text: str, stream: Hashable = None) -> None:
+        if not self._enabled or self._files is None:
+            return
+        # Cheap check before parsing, nothing changes until another block is complete
+        completed_blocks = partial_text.count(UPDATED_ERR)
+        if completed_blocks == self._completed_blocks.get(stream, 0):
+            return
+        self._completed_blocks[stream] = completed_blocks
+
+        edits = completed_edits(partial_text)
+        changed = {edit.path for edit in edits[self._applied_edits.get(stream, 0):]
+                   if _apply_exact(self._files, edit)}
+        self._applied_edits[stream] = len(edits)
+        for path in changed:
+            if path.lower().endswith(PREVIEW_EXTENSIONS):
+                content = self._files.read_text(path)
+                if self._published.get(path) != content:
+                    self._pending[path] = content
+                else:
+                    self._pending.pop(path, None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._pending and self._flush_task is None:
+            delay = max(0.0, self._last_publish + self._debounce - self._clock())
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._last_publish = self._clock()
+        for path, content in pending.items():
+            await self._send(path, content)
+
+    async def _send(self, path: str, content: str) -> None:
+        if not self._enabled:
+            return
+        try:
+            await self._publish(path, content)
+            self._published[path] = content
+        except Exception as e:
+            # No UI to push to (e.g. evals and benchmarks), stop trying
+            logger.info(f"Live preview disabled: {e}")
+            self._enabled = False
+
+    async def close(self, files: FileStore) -> None:
+        """Send the authoritative state of every pushed file, later partial results are dropped"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._pending.clear()
+        self._files = None
+        if not self._published:
+            return
+        for path in list(self._published):
+            content = files.read_text(path) if files.file_exists(path) else ""
+            if self._published[path] != content:
+                await self._send(path, content)
+        if self._done is not None and self._enabled:
+            try:
+                await self._done()
+            except Exception as e:
+                logger.info(f"Live preview end not sent: {e}")
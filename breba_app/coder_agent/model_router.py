@@ -0,0 +1,181 @@
+"""
+Per-call model routing for the coder.
+
+Every BAML function is pinned to one client in baml_src, but the coder's calls vary a lot: a color change on a
+small page and a restructuring of several files do not need the same model. The router scores each call from
+the request text, the number and size of the files and the retry number, picks a tier (fast, standard, strong)
+and passes the tier's client through baml_options. Time to first token and error rates are tracked per client as
+moving averages; clients that keep failing or are slow to answer are skipped for a while, and a call that stalls or
+fails at the provider falls back to the next client. A streamed call is only timed out while it waits for its first
+token or between tokens, so a long generation that keeps producing output is never cut off.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from baml_py.errors import BamlClientHttpError, BamlTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Client names from clients.baml, fastest first. FAST_CLIENT is the client coder.baml pins the coder to.
+FAST_CLIENT = "Gpt5Low"
+STANDARD_CLIENT = "Gpt51CodexLow"
+STRONG_CLIENT = "Gpt5Medium"
+TIERS = (FAST_CLIENT, STANDARD_CLIENT, STRONG_CLIENT)
+
+# Seconds to wait for the first token before a call is abandoned for the next client, per tier.
+# Reasoning happens before the first token, so stronger tiers get longer.
+FIRST_TOKEN_TIMEOUTS = {FAST_CLIENT: 45.0, STANDARD_CLIENT: 60.0, STRONG_CLIENT: 120.0}
+# Seconds without a new token after which a streaming call counts as stalled
+STALL_TIMEOUT_SECONDS = 30.0
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.3
+# A client whose error rate goes above this is skipped until the cooldown is over
+MAX_ERROR_RATE = 0.5
+COOLDOWN_SECONDS = 60.0
+# A client whose recent time to first token reaches this fraction of its timeout is treated as degraded and skipped
+SLOW_FRACTION = 0.6
+# A degraded client still gets one call this often, so that its latency can recover
+PROBE_INTERVAL_SECONDS = 120.0
+
+# Characters of file content above which an edit counts as large
+LARGE_CONTEXT_CHARS = 60_000
+
+COMPLEX_WORDS = frozenset({
+    "restructure", "redesign", "rebuild", "refactor", "reorganize", "reorganise", "layout", "responsive",
+    "navigation", "pages", "migrate", "rewrite", "animation", "animations", "interactive", "form", "javascript",
+})
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+T = TypeVar("T")
+
+FALLBACK_ERRORS = (asyncio.TimeoutError, BamlTimeoutError, BamlClientHttpError)
+
+
+@dataclass(frozen=True)
+class RoutingFeatures:
+    request: str = ""
+    file_count: int = 0
+    context_chars: int = 0
+    retry: int = 0
+
+    def complexity(self) -> int:
+        """
+        0 for copy, style and other regular edits, which stay on the fastest client (the one the coder always used),
+        2 for restructuring, plus one per retry
+        """
+        words = set(_WORD_RE.findall(self.request.lower()))
+        score = 0
+        if words & COMPLEX_WORDS or self.file_count > 3 or self.context_chars > LARGE_CONTEXT_CHARS:
+            score = 2
+        # Every failed attempt moves the call to a stronger model
+        return score + self.retry
+
+
+@dataclass
+class ClientStats:
+    latency: float | None = None
+    error_rate: float = 0.0
+    calls: int = 0
+    cooldown_until: float = 0.0
+    last_used: float = 0.0
+
+    def record(self, *, latency: float | None, failed: bool, now: float) -> None:
+        """latency: time to first token of a successful streamed call"""
+        self.calls += 1
+        self.last_used = now
+        self.error_rate = EWMA_ALPHA * failed + (1 - EWMA_ALPHA) * self.error_rate
+        if latency is not None and not failed:
+            self.latency = latency if self.latency is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+        if self.error_rate > MAX_ERROR_RATE:
+            self.cooldown_until = now + COOLDOWN_SECONDS
+
+
+class ModelRouter:
+    """Chooses the client for each coder call and falls back on timeouts and provider errors"""
+
+    def __init__(self, tiers: tuple[str, ...] = TIERS, clock: Callable[[], float] = time.monotonic):
+        self.tiers = tiers
+        self._clock = clock
+        self.stats: dict[str, ClientStats] = {client: ClientStats() for client in tiers}
+
+    def _available(self, client: str) -> bool:
+        return self.stats[client].cooldown_until <= self._clock()
+
+    def _degraded(self, client: str) -> bool:
+        stats, timeout = self.stats[client], FIRST_TOKEN_TIMEOUTS.get(client)
+        if stats.latency is None or timeout is None or stats.latency < timeout * SLOW_FRACTION:
+            return False
+        # Otherwise a slow client would only be measured again when every other client fails
+        return self._clock() - stats.last_used < PROBE_INTERVAL_SECONDS
+
+    def candidates(self, features: RoutingFeatures) -> list[str]:
+        """Clients in the order they should be tried: the chosen tier, then stronger ones, then weaker ones"""
+        tier = min(features.complexity(), len(self.tiers) - 1)
+        ordered = list(self.tiers[tier:]) + list(reversed(self.tiers[:tier]))
+        healthy = [client for client in ordered if self._available(client) and not self._degraded(client)]
+        # Clients in cooldown are still tried last rather than failing the call outright
+        return healthy + [client for client in ordered if client not in healthy]
+
+    def route(self, function: str, features: RoutingFeatures) -> list[str]:
+        """Candidates for the call, the routing decision is logged"""
+        candidates = self.candidates(features)
+        logger.info(f"Routing {function} to {candidates[0]} (complexity {features.complexity()}, "
+                    f"{features.file_count} files, {features.context_chars} chars, retry {features.retry}, "
+                    f"fallbacks {candidates[1:]})")
+        return candidates
+
+    async def call(self, function: str, features: RoutingFeatures,
+                   call: Callable[[str, Callable[[], None]], Awaitable[T]], *, streamed: bool = True) -> T:
+        """
+        Run call(client, progress) on the routed client, falling back to the next candidate on stalls and provider
+        errors. A streamed call reports every token with progress(): it fails over when the first token takes
+        longer than the client's FIRST_TOKEN_TIMEOUTS or the stream stalls for STALL_TIMEOUT_SECONDS.
+        A call that is not streamed has no progress to watch and is only bounded by the client's own http timeouts.
+        The last error is raised when every client failed.
+        """
+        error: BaseException | None = None
+        for client in self.route(function, features):
+            # Marks the client as used right away, so that concurrent calls do not all probe a degraded client
+            self.stats[client].last_used = self._clock()
+            try:
+                result, latency = await self._watched(client, call, streamed)
+            except FALLBACK_ERRORS as e:
+                self.stats[client].record(latency=None, failed=True, now=self._clock())
+                logger.warning(f"{function} failed on {client} ({type(e).__name__}), falling back")
+                error = e
+                continue
+            self.stats[client].record(latency=latency, failed=False, now=self._clock())
+            return result
+        raise error
+
+    async def _watched(self, client: str, call: Callable[[str, Callable[[], None]], Awaitable[T]],
+                       streamed: bool) -> tuple[T, float | None]:
+        """Result of the call and its time to first token (None when nothing was streamed)"""
+        started = self._clock()
+        first_token: float | None = None
+        loop = asyncio.get_running_loop()
+        timeout = FIRST_TOKEN_TIMEOUTS.get(client) if streamed else None
+        async with asyncio.timeout(timeout) as deadline:
+            def progress() -> None:
+                nonlocal first_token
+                if first_token is None:
+                    first_token = self._clock() - started
+                if timeout is not None:
+                    deadline.reschedule(loop.time() + STALL_TIMEOUT_SECONDS)
+
+            result = await call(client, progress)
+        return result, first_token
+
+    def reset(self) -> None:
+        self.stats = {client: ClientStats() for client in self.tiers}
+
+
+model_router = ModelRouter()
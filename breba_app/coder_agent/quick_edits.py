@@ -0,0 +1,429 @@
+"""
+Deterministic fast path for trivial edit requests.
+
+Requests like "change the title to X", "make the button blue" or "replace the phone number with X" are recognized
+with a small catalog of patterns and resolved against the pages and stylesheets of the site. Each match gets a
+confidence: the confidence of the pattern divided by the number of places it could apply to. Only matches at or
+above MIN_CONFIDENCE are applied (through the regular edit engine, see search_replace_editing), everything else
+goes to the chat router and the coder as before.
+"""
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from datetime import date
+from html.parser import HTMLParser
+from typing import Callable
+
+from breba_app.config import INDEX_FILE_NAME
+from breba_app.filesystem import FileStore
+from breba_app.search_replace_editing import EditRequest
+
+MIN_CONFIDENCE = 0.8
+# Requests longer than this are never trivial
+MAX_REQUEST_CHARS = 200
+# Quoted text shorter than this is too likely to match in unintended places
+MIN_QUOTED_TEXT_CHARS = 3
+
+SITEMAP_FILE_NAME = "sitemap.xml"
+PAGE_EXTENSIONS = (".html", ".htm")
+STYLE_EXTENSIONS = (".css",)
+
+CSS_COLOR_NAMES = frozenset({
+    "black", "white", "red", "green", "blue", "yellow", "orange", "purple", "pink", "brown", "gray", "grey",
+    "navy", "teal", "maroon", "olive", "lime", "aqua", "cyan", "magenta", "fuchsia", "silver", "gold", "indigo",
+    "violet", "coral", "salmon", "crimson", "turquoise", "beige", "ivory", "khaki", "lavender", "tan",
+    "lightblue", "darkblue", "skyblue", "royalblue", "lightgreen", "darkgreen", "forestgreen", "lightgray",
+    "lightgrey", "darkgray", "darkgrey", "darkred", "orangered", "hotpink", "tomato", "chocolate", "plum",
+})
+
+_QUOTES = "\"'“”‘’"
+_COMPOUND_RE = re.compile(r"\b(?:and|then|also)\s+(?:make|change|add|remove|delete|replace|set|update|move|put)\b",
+                          re.IGNORECASE)
+_HEX_COLOR_RE = re.compile(r"#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+_COLOR_VALUE_RE = re.compile(r"\s*(?:#[0-9a-fA-F]{3,8}|(?:rgb|rgba|hsl|hsla)\([^)]*\)|[a-zA-Z]+)\s*")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+# The address or number of mailto: and tel: links, without the query of the link
+_MAILTO_HREF_RE = re.compile(r"""\bhref\s*=\s*["']mailto:(?P<value>[^"'?]+)""", re.IGNORECASE)
+_TEL_HREF_RE = re.compile(r"""\bhref\s*=\s*["']tel:(?P<value>[^"'?]+)""", re.IGNORECASE)
+_NEW_PHONE_RE = re.compile(r"\+?[\d\s().-]{6,}\d")
+_CSS_RULE_RE = re.compile(r"(?P<selectors>[^{}]+)\{(?P<body>[^{}]*)\}")
+
+_TITLE_REQUEST_RE = re.compile(
+    r"(?:change|set|update|rename|make)\s+(?:the\s+|my\s+|our\s+)?(?:page\s+|site\s+|website\s+|tab\s+)?"
+    r"title\s+(?:to|as|into)\s+(?P<value>.+)", re.IGNORECASE)
+_HEADING_REQUEST_RE = re.compile(
+    r"(?:change|set|update|make)\s+(?:the\s+|my\s+|our\s+)?(?:main\s+|page\s+|hero\s+|top\s+)?"
+    r"(?:heading|headline)\s+(?:to|as|into)\s+(?P<value>.+)", re.IGNORECASE)
+_PHONE_REQUEST_RE = re.compile(
+    r"(?:change|update|replace|set|swap)\s+(?:the\s+|my\s+|our\s+)?(?:contact\s+)?(?:phone|telephone)"
+    r"(?:\s+number)?\s+(?:to|with|for)\s+(?P<value>.+)", re.IGNORECASE)
+_EMAIL_REQUEST_RE = re.compile(
+    r"(?:change|update|replace|set|swap)\s+(?:the\s+|my\s+|our\s+)?(?:contact\s+)?e-?mail"
+    r"(?:\s+address)?\s+(?:to|with|for)\s+(?P<value>.+)", re.IGNORECASE)
+_TEXT_REQUEST_RE = re.compile(
+    rf"(?:change|replace|update|rename)\s+(?:the\s+)?(?:text\s+|word\s+|words\s+)?(?:from\s+)?"
+    rf"[{_QUOTES}](?P<old>[^{_QUOTES}]+)[{_QUOTES}]\s+(?:to|with|into|by)\s+"
+    rf"[{_QUOTES}](?P<new>[^{_QUOTES}]+)[{_QUOTES}]", re.IGNORECASE)
+_COLOR_REQUEST_RES = (
+    re.compile(r"(?:make|turn|paint)\s+(?:the\s+|all\s+(?:the\s+)?|our\s+|my\s+)?(?P<target>[a-z]+)\s+"
+               r"(?P<color>#?[a-z0-9]+(?:\s[a-z]+)?)", re.IGNORECASE),
+    re.compile(r"(?:change|set|update)\s+(?:the\s+|all\s+(?:the\s+)?|our\s+|my\s+)?(?P<target>[a-z]+)\s+"
+               r"colou?r\s+(?:to|as)\s+(?P<color>#?[a-z0-9]+(?:\s[a-z]+)?)", re.IGNORECASE),
+)
+
+
+@dataclass(frozen=True)
+class ColorTarget:
+    # Matched against the last part of every selector of a rule, pseudo-class rules (:hover, ...) are skipped
+    selector: re.Pattern
+    properties: tuple[str, ...]
+    label: str
+
+
+_COLOR_TARGETS = {
+    "button": ColorTarget(re.compile(r"(?:^|[\s>+~])(?:button|\.btn[\w-]*|\.button[\w-]*|\.cta[\w-]*)$"),
+                          ("background-color", "background"), "button"),
+    "link": ColorTarget(re.compile(r"(?:^|[\s>+~])a$"), ("color",), "link"),
+    "heading": ColorTarget(re.compile(r"(?:^|[\s>+~])h[1-6]$"), ("color",), "heading"),
+    "background": ColorTarget(re.compile(r"^(?:body|html)$"), ("background-color", "background"), "background"),
+    "text": ColorTarget(re.compile(r"^(?:body|html)$"), ("color",), "text"),
+}
+_COLOR_TARGET_WORDS = {
+    "button": "button", "buttons": "button", "link": "link", "links": "link", "heading": "heading",
+    "headings": "heading", "background": "background", "text": "text", "font": "text",
+}
+
+
+@dataclass
+class QuickEdit:
+    intent: str
+    edits: list[EditRequest]
+    confidence: float
+    # Plain language description of the change for the user
+    summary: str
+
+
+def _unquote(value: str) -> str:
+    return value.strip().rstrip(".!").strip().strip(_QUOTES).strip()
+
+
+def _pages(filestore: FileStore) -> list[str]:
+    return [path for path in filestore.list_files() if path.lower().endswith(PAGE_EXTENSIONS)]
+
+
+def _styles(filestore: FileStore) -> list[str]:
+    return [path for path in filestore.list_files() if path.lower().endswith(STYLE_EXTENSIONS)]
+
+
+class _TextCollector(HTMLParser):
+    """Raw text nodes of a page outside script and style, with their offsets in the page"""
+
+    def __init__(self, content: str):
+        super().__init__(convert_charrefs=False)
+        self.texts: list[str] = []
+        self.offsets: list[int] = []
+        self._line_starts = [0] + [match.end() for match in re.finditer("\n", content)]
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            line, column = self.getpos()
+            self.texts.append(data)
+            self.offsets.append(self._line_starts[line - 1] + column)
+
+
+def _collect_text(content: str) -> _TextCollector:
+    parser = _TextCollector(content)
+    parser.feed(content)
+    parser.close()
+    return parser
+
+
+def _text_nodes(content: str) -> list[str]:
+    return _collect_text(content).texts
+
+
+def _contact_spans(content: str, href_re: re.Pattern, text_re: re.Pattern) -> list[tuple[int, int, bool]]:
+    """
+    (start, end, is link) of the contact details in the links matched by href_re and in visible text. Other
+    places (asset names, attributes, scripts, JSON-LD) are left out.
+    """
+    spans = [(match.start("value"), match.end("value"), True) for match in href_re.finditer(content)]
+    text = _collect_text(content)
+    for data, offset in zip(text.texts, text.offsets):
+        spans += [(offset + match.start(), offset + match.end(), False) for match in text_re.finditer(data)]
+    return sorted(spans)
+
+
+def _replace_contact(href_re: re.Pattern, text_re: re.Pattern, filestore: FileStore, value: str,
+                     link_value: str, key: Callable[[str], str]) -> dict[str, str] | None:
+    """
+    Page contents with the contact detail replaced in its links and visible text. None when there is nothing to
+    replace, or when it is ambiguous: different details (compared by key) are shown, or the shown one also appears
+    outside links and visible text.
+    """
+    found, changes = set(), {}
+    for path in _pages(filestore):
+        content = filestore.read_text(path)
+        spans = _contact_spans(content, href_re, text_re)
+        if not spans:
+            continue
+        olds = [content[start:end] for start, end, _ in spans]
+        found |= {key(old) for old in olds}
+        if any(content.count(old) != olds.count(old) for old in set(olds)):
+            return None
+        new = content
+        for start, end, is_link in reversed(spans):
+            new = new[:start] + (link_value if is_link else html.escape(value, quote=False)) + new[end:]
+        changes[path] = new
+    if len(found) != 1:
+        return None
+    return changes
+
+
+def _changed_blocks(old_lines: list[str], new_lines: list[str]) -> list[tuple[int, int, int, int]]:
+    """
+    (old start, old end, new start, new end) of the changed line blocks. The substitutions here never add or
+    remove lines, so lines are compared pairwise; otherwise everything between the common prefix and suffix is
+    one block.
+    """
+    if len(old_lines) != len(new_lines):
+        prefix = 0
+        while prefix < min(len(old_lines), len(new_lines)) and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < min(len(old_lines), len(new_lines)) - prefix
+               and old_lines[-1 - suffix] == new_lines[-1 - suffix]):
+            suffix += 1
+        return [(prefix, len(old_lines) - suffix, prefix, len(new_lines) - suffix)]
+
+    blocks, start = [], None
+    for i, (old_line, new_line) in enumerate(zip(old_lines, new_lines)):
+        if old_line != new_line and start is None:
+            start = i
+        elif old_line == new_line and start is not None:
+            blocks.append((start, i, start, i))
+            start = None
+    if start is not None:
+        blocks.append((start, len(old_lines), start, len(old_lines)))
+    return blocks
+
+
+def _line_edits(path: str, old: str, new: str) -> list[EditRequest]:
+    """
+    SEARCH/REPLACE edits turning old into new. The edit engine matches whole lines, so every changed block is
+    grown by context lines until it is unique in the file.
+    """
+    old_lines, new_lines = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    edits = []
+    for i1, i2, j1, j2 in _changed_blocks(old_lines, new_lines):
+        lo, hi = i1, max(i2, i1 + 1) if i1 < len(old_lines) else i2
+        while (lo > 0 or hi < len(old_lines)) and old.count("".join(old_lines[lo:hi])) != 1:
+            lo, hi = max(0, lo - 1), min(len(old_lines), hi + 1)
+        search = "".join(old_lines[lo:hi])
+        if not search.strip():
+            # A pure insertion at the end of the file, appended by the engine
+            edits.append(EditRequest(path, "", "".join(new_lines[j1:j2])))
+            continue
+        replace = "".join(old_lines[lo:i1] + new_lines[j1:j2] + old_lines[i2:hi])
+        edits.append(EditRequest(path, search, replace))
+    return edits
+
+
+def _sitemap_lastmod(filestore: FileStore, pages: set[str]) -> str | None:
+    """sitemap.xml with today's lastmod on the entries of the changed pages, None when nothing changes"""
+    if not filestore.file_exists(SITEMAP_FILE_NAME):
+        return None
+    sitemap = filestore.read_text(SITEMAP_FILE_NAME)
+    today = date.today().isoformat()
+
+    def touch(match: re.Match) -> str:
+        loc = match.group("loc").strip()
+        if any(loc.endswith("/" + page) or (page == INDEX_FILE_NAME and loc.endswith("/")) for page in pages):
+            return f"{match.group('head')}{today}{match.group('tail')}"
+        return match.group(0)
+
+    updated = re.sub(r"(?P<head><loc>(?P<loc>[^<]*)</loc>\s*<lastmod>)[^<]*(?P<tail></lastmod>)", touch, sitemap)
+    return updated if updated != sitemap else None
+
+
+def _content_edit(intent: str, filestore: FileStore, changes: dict[str, str], confidence: float,
+                  summary: str) -> QuickEdit:
+    """Edits for changed page contents, plus the sitemap lastmod of those pages"""
+    edits = []
+    for path, new in sorted(changes.items()):
+        edits += _line_edits(path, filestore.read_text(path), new)
+    sitemap = _sitemap_lastmod(filestore, set(changes))
+    if sitemap is not None:
+        edits += _line_edits(SITEMAP_FILE_NAME, filestore.read_text(SITEMAP_FILE_NAME), sitemap)
+    return QuickEdit(intent, edits, confidence, summary)
+
+
+def _replace_element_text(tag: str, request_re: re.Pattern, intent: str, label: str,
+                          confidence: float) -> Callable[[str, FileStore], QuickEdit | None]:
+    element_re = re.compile(rf"(<{tag}\b[^>]*>)([^<]*)(</{tag}>)", re.IGNORECASE)
+
+    def match(request: str, filestore: FileStore) -> QuickEdit | None:
+        request_match = request_re.fullmatch(request)
+        if not request_match:
+            return None
+        value = _unquote(request_match.group("value"))
+        if not value:
+            return None
+        candidates = []
+        for path in _pages(filestore):
+            content = filestore.read_text(path)
+            candidates += [(path, content, element) for element in element_re.finditer(content)]
+        if not candidates:
+            return None
+        path, content, element = candidates[0]
+        new = content[:element.start(2)] + html.escape(value, quote=False) + content[element.end(2):]
+        return _content_edit(intent, filestore, {path: new}, confidence / len(candidates),
+                             f'Changed the {label} to "{value}".')
+
+    return match
+
+
+_match_title = _replace_element_text("title", _TITLE_REQUEST_RE, "title", "page title", 0.95)
+_match_heading = _replace_element_text("h1", _HEADING_REQUEST_RE, "heading", "main heading", 0.9)
+
+
+def _match_phone(request: str, filestore: FileStore) -> QuickEdit | None:
+    request_match = _PHONE_REQUEST_RE.fullmatch(request)
+    if not request_match:
+        return None
+    value = _unquote(request_match.group("value"))
+    if not _NEW_PHONE_RE.fullmatch(value):
+        return None
+
+    # Only the last 7 digits, so "+1 (555) 123-4567" and "tel:5551234567" are the same number
+    changes = _replace_contact(_TEL_HREF_RE, _PHONE_RE, filestore, value, re.sub(r"[^\d+]", "", value),
+                               lambda number: re.sub(r"\D", "", number)[-7:])
+    if changes is None:
+        return None
+    return _content_edit("phone", filestore, changes, 0.95, f"Changed the phone number to {value}.")
+
+
+def _match_email(request: str, filestore: FileStore) -> QuickEdit | None:
+    request_match = _EMAIL_REQUEST_RE.fullmatch(request)
+    if not request_match:
+        return None
+    value = _unquote(request_match.group("value"))
+    if not _EMAIL_RE.fullmatch(value):
+        return None
+
+    changes = _replace_contact(_MAILTO_HREF_RE, _EMAIL_RE, filestore, value, value, str.lower)
+    if changes is None:
+        return None
+    return _content_edit("email", filestore, changes, 0.95, f"Changed the email address to {value}.")
+
+
+def _match_text(request: str, filestore: FileStore) -> QuickEdit | None:
+    request_match = _TEXT_REQUEST_RE.fullmatch(request)
+    if not request_match:
+        return None
+    old, new_text = request_match.group("old"), request_match.group("new")
+    if len(old.strip()) < MIN_QUOTED_TEXT_CHARS:
+        return None
+
+    changes = {}
+    for path in _pages(filestore):
+        content = filestore.read_text(path)
+        count = content.count(old)
+        if not count:
+            continue
+        # Every occurrence must be visible text, never markup, attributes or scripts
+        if count != sum(text.count(old) for text in _text_nodes(content)):
+            return None
+        changes[path] = content.replace(old, html.escape(new_text, quote=False))
+    if not changes:
+        return None
+    return _content_edit("text", filestore, changes, 1.0, f'Changed "{old}" to "{new_text}".')
+
+
+def _color(value: str) -> str | None:
+    value = value.strip().lower()
+    if _HEX_COLOR_RE.fullmatch(value):
+        return value
+    value = value.replace(" ", "")
+    return value if value in CSS_COLOR_NAMES else None
+
+
+def _color_declarations(content: str, target: ColorTarget) -> list[tuple[int, int]]:
+    """[start, end) of the color values the target's rules declare"""
+    spans = []
+    for rule in _CSS_RULE_RE.finditer(content):
+        selectors = [selector.strip() for selector in rule.group("selectors").split(",")]
+        if any(":" in selector for selector in selectors):
+            continue
+        if not any(target.selector.search(selector) for selector in selectors):
+            continue
+        for prop in target.properties:
+            declaration = re.search(rf"(?:^|[;{{\s]){prop}\s*:(?P<value>[^;}}]+)", rule.group("body"))
+            if declaration and _COLOR_VALUE_RE.fullmatch(declaration.group("value")):
+                start = rule.start("body") + declaration.start("value")
+                spans.append((start, start + len(declaration.group("value"))))
+                break
+    return spans
+
+
+def _match_color(request: str, filestore: FileStore) -> QuickEdit | None:
+    for request_re in _COLOR_REQUEST_RES:
+        request_match = request_re.fullmatch(request)
+        if request_match:
+            break
+    else:
+        return None
+    target_name = _COLOR_TARGET_WORDS.get(request_match.group("target").lower())
+    color = _color(request_match.group("color"))
+    if target_name is None or color is None:
+        return None
+    target = _COLOR_TARGETS[target_name]
+
+    candidates = []
+    for path in _styles(filestore):
+        content = filestore.read_text(path)
+        candidates += [(path, content, span) for span in _color_declarations(content, target)]
+    if not candidates:
+        return None
+    path, content, (start, end) = candidates[0]
+    # Keep the whitespace around the old value
+    old = content[start:end]
+    new = content[:start] + old[:len(old) - len(old.lstrip())] + color + old[len(old.rstrip()):] + content[end:]
+    return QuickEdit("color", _line_edits(path, content, new), 0.9 / len(candidates),
+                     f"Changed the {target.label} color to {color}.")
+
+
+MATCHERS: list[Callable[[str, FileStore], QuickEdit | None]] = [
+    _match_text, _match_title, _match_heading, _match_phone, _match_email, _match_color,
+]
+
+
+def match_quick_edit(request: str, filestore: FileStore) -> QuickEdit | None:
+    """
+    The edits for a trivial request, or None when the request is not trivial or its target is ambiguous
+    and the LLM should handle it.
+    """
+    request = " ".join(request.split())
+    if not request or len(request) > MAX_REQUEST_CHARS or _COMPOUND_RE.search(request):
+        return None
+    request = request.rstrip(".!")
+    request = re.sub(r"^(?:please|can you|could you)\s+", "", request, flags=re.IGNORECASE).rstrip("?")
+
+    matches = [quick_edit for matcher in MATCHERS
+               if (quick_edit := matcher(request, filestore)) is not None and quick_edit.edits]
+    if not matches:
+        return None
+    best = max(matches, key=lambda quick_edit: quick_edit.confidence)
+    return best if best.confidence >= MIN_CONFIDENCE else None
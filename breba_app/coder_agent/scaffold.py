@@ -0,0 +1,112 @@
+"""
+Sectioned first build of a brand-new site.
+
+Instead of writing the whole site in one long generation, the specification is turned into a SitePlan
+(sections, shared design tokens and base CSS), every section is generated concurrently, and the results are
+stitched into index.html and styles.css. The design tokens live in tokens.css so that later edits can restyle
+the whole site in one place.
+"""
+import asyncio
+import html
+import logging
+from datetime import date
+
+from breba_app.coder_agent.baml_client.async_client import b as baml_client
+from breba_app.coder_agent.baml_client.types import SitePlan, SiteSection, SectionCode
+from breba_app.filesystem import FileStore, OverlayFileStore
+from breba_app.llm_executor import llm_executor
+from breba_app.llm_metrics import instrument
+
+logger = logging.getLogger(__name__)
+
+b = instrument(baml_client)
+
+MAX_PARALLEL_SECTIONS = 4
+TOKENS_FILE_NAME = "tokens.css"
+STYLES_FILE_NAME = "styles.css"
+SITE_URL_PLACEHOLDER = "https://yourdomain.com"
+
+
+def render_index_html(plan: SitePlan, sections: list[SectionCode]) -> str:
+    body = "\n\n".join(section.html.strip() for section in sections)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(plan.title)}</title>
+    <meta name="description" content="{html.escape(plan.description)}">
+    <link rel="stylesheet" href="{TOKENS_FILE_NAME}">
+    <link rel="stylesheet" href="{STYLES_FILE_NAME}">
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def render_styles(plan: SitePlan, sections: list[tuple[SiteSection, SectionCode]]) -> str:
+    styles = f"/* Base styles, colors, fonts and spacing come from {TOKENS_FILE_NAME} */\n{plan.base_css.strip()}\n"
+    for section, code in sections:
+        if code.css.strip():
+            styles += f"\n/* {section.id} */\n{code.css.strip()}\n"
+    return styles
+
+
+def render_sitemap() -> str:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url>
+        <loc>{SITE_URL_PLACEHOLDER}/</loc>
+        <lastmod>{date.today().isoformat()}</lastmod>
+        <changefreq>monthly</changefreq>
+        <priority>1.0</priority>
+    </url>
+</urlset>
+"""
+
+
+def render_robots() -> str:
+    return f"""User-agent: *
+Allow: /
+
+Sitemap: {SITE_URL_PLACEHOLDER}/sitemap.xml
+"""
+
+
+async def scaffold_site(*, spec: str, filestore: FileStore, assets: str = "") -> list[str] | None:
+    """
+    Build a new site from the specification, section by section. assets lists the files the user uploaded
+    (images, logos, documents) so the sections can use them.
+    Returns the written files, or None when the plan has no sections and the regular coder should build the site.
+    Nothing is written unless every section was generated.
+    """
+    # The plan carries the design tokens and base css, it is not a short call: same deadline as the sections
+    plan = await llm_executor.run("PlanSiteSections", lambda: b.PlanSiteSections(spec, assets))
+    if not plan.sections:
+        return None
+
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_SECTIONS)
+
+    async def generate(section: SiteSection) -> SectionCode:
+        async with semaphore:
+            return await llm_executor.run("GenerateSection", lambda: b.GenerateSection(spec, plan, section, assets))
+
+    logger.info(f"Generating {len(plan.sections)} sections in parallel")
+    tasks = [asyncio.ensure_future(generate(section)) for section in plan.sections]
+    try:
+        codes = await asyncio.gather(*tasks)
+    finally:
+        # One failed section fails the build, the other sections must not keep running (and billing)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    files = OverlayFileStore(filestore)
+    files.write_text(TOKENS_FILE_NAME, plan.design_tokens.strip() + "\n")
+    files.write_text(STYLES_FILE_NAME, render_styles(plan, list(zip(plan.sections, codes))))
+    files.write_text("index.html", render_index_html(plan, codes))
+    files.write_text("sitemap.xml", render_sitemap())
+    files.write_text("robots.txt", render_robots())
+    return files.commit()
@@ -0,0 +1,256 @@
+"""
+Compact structural outline of an html page for the chat router.
+
+UserResponseOrCoder only needs to know what is on the page (sections, headings, ids, linked assets, sizes)
+to answer questions or decide to invoke the coder, so it gets the outline instead of the raw page.
+Small pages are still sent in full. The full text of the sections that the latest user request talks about is
+sent separately, after the conversation, so the outline ahead of the messages stays the same from turn to turn
+and the prompt prefix can be cached. Outlines are cached by sha256 of the page.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.coder_agent.file_ranker import latest_user_request, TEXT_ASSET_EXTENSIONS
+from breba_app.filesystem import FileStore
+
+# Pages up to this size are sent as they are, the outline would not save much
+FULL_PAGE_MAX_BYTES = 6_000
+EXCERPT_CHARS = 80
+# Sections sharing distinctive words with the latest request are sent in full, at most MAX_EXPANDED of them.
+# Each shared word scores 1 / number of sections containing it
+EXPAND_MIN_SCORE = 0.5
+MAX_EXPANDED = 2
+
+SECTION_TAGS = frozenset({"header", "nav", "main", "section", "article", "aside", "footer", "form"})
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source",
+                       "track", "wbr"})
+SKIP_TEXT_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+OUTLINE_CACHE_MAX_ENTRIES = 128
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+@dataclass
+class OutlineNode:
+    tag: str
+    id: str | None
+    depth: int
+    start: int
+    end: int = 0
+    headings: list[str] = field(default_factory=list)
+    text: list[str] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return f"{self.tag}#{self.id}" if self.id else self.tag
+
+    @property
+    def full_text(self) -> str:
+        return " ".join(self.text)
+
+
+@dataclass
+class SiteOutline:
+    size: int
+    title: str = ""
+    description: str = ""
+    assets: list[str] = field(default_factory=list)
+    links: list[str] = field(default_factory=list)
+    nodes: list[OutlineNode] = field(default_factory=list)
+
+
+class _OutlineParser(HTMLParser):
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.outline = SiteOutline(size=len(html.encode("utf-8")))
+        self._line_offsets = [0]
+        for line in html.splitlines(keepends=True):
+            self._line_offsets.append(self._line_offsets[-1] + len(line.encode("utf-8")))
+        # Open elements as (tag, node or None)
+        self._stack: list[tuple[str, OutlineNode | None]] = []
+        self._heading: list[str] | None = None
+        self._in_title = False
+        self._skip_depth = 0
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_offsets[line - 1] + column
+
+    def _innermost_node(self) -> OutlineNode | None:
+        for _, node in reversed(self._stack):
+            if node is not None:
+                return node
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and attrs.get("href") and "stylesheet" in (attrs.get("rel") or ""):
+            self.outline.assets.append(attrs["href"])
+        elif tag in ("script", "img", "source") and attrs.get("src"):
+            self.outline.assets.append(attrs["src"])
+        elif tag == "a" and attrs.get("href"):
+            self.outline.links.append(attrs["href"])
+        elif tag == "meta" and attrs.get("name") == "description":
+            self.outline.description = attrs.get("content") or ""
+
+        if tag in VOID_TAGS:
+            return
+        node = None
+        if tag in SECTION_TAGS or (attrs.get("id") and tag not in HEADING_TAGS):
+            depth = sum(1 for _, open_node in self._stack if open_node is not None)
+            node = OutlineNode(tag=tag, id=attrs.get("id"), depth=depth, start=self._offset())
+            self.outline.nodes.append(node)
+        self._stack.append((tag, node))
+
+        if tag in HEADING_TAGS:
+            self._heading = []
+        elif tag == "title":
+            self._in_title = True
+        elif tag in SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in HEADING_TAGS and self._heading is not None:
+            heading = " ".join("".join(self._heading).split())
+            node = self._innermost_node()
+            if heading and node is not None:
+                node.headings.append(f"{tag} {heading}")
+            self._heading = None
+        elif tag == "title":
+            self._in_title = False
+        elif tag in SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+        # Close everything up to the matching tag, browsers are forgiving about unclosed elements
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        end = self._offset() + len(tag) + 3
+        while self._stack:
+            open_tag, node = self._stack.pop()
+            if node is not None:
+                node.end = end
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.outline.title += data.strip()
+        if self._heading is not None:
+            self._heading.append(data)
+        text = " ".join(data.split())
+        node = self._innermost_node()
+        if text and node is not None:
+            node.text.append(text)
+
+    def close(self):
+        super().close()
+        for _, node in self._stack:
+            if node is not None and not node.end:
+                node.end = self.outline.size
+
+
+_outline_cache: OrderedDict[str, SiteOutline] = OrderedDict()
+
+
+def build_outline(html: str) -> SiteOutline:
+    key = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    outline = _outline_cache.get(key)
+    if outline is not None:
+        _outline_cache.move_to_end(key)
+        return outline
+
+    parser = _OutlineParser(html)
+    parser.feed(html)
+    parser.close()
+    outline = parser.outline
+    _outline_cache[key] = outline
+    if len(_outline_cache) > OUTLINE_CACHE_MAX_ENTRIES:
+        _outline_cache.popitem(last=False)
+    return outline
+
+
+def _format_size(size: int) -> str:
+    return f"{size} B" if size < 1024 else f"{size / 1024:.1f} KB"
+
+
+def _excerpt(text: str) -> str:
+    return text if len(text) <= EXCERPT_CHARS else text[:EXCERPT_CHARS].rsplit(" ", 1)[0] + "..."
+
+
+def _sections_to_expand(outline: SiteOutline, query: str) -> set[int]:
+    words = set(_WORD_RE.findall(query.lower()))
+    if not words:
+        return set()
+    node_words = [words & set(_WORD_RE.findall(node.full_text.lower())) for node in outline.nodes]
+    doc_freqs = Counter(word for shared in node_words for word in shared)
+    scores = []
+    for i, shared in enumerate(node_words):
+        score = sum(1 / doc_freqs[word] for word in shared)
+        if score >= EXPAND_MIN_SCORE:
+            scores.append((score, -i))
+    return {-i for _, i in sorted(scores, reverse=True)[:MAX_EXPANDED]}
+
+
+def render_outline(path: str, outline: SiteOutline, *, sizes: dict[str, int] | None = None) -> str:
+    sizes = sizes or {}
+    lines = [f"{path} ({_format_size(outline.size)}, outline of the page, not the full html)"]
+    if outline.title:
+        lines.append(f"title: {outline.title}")
+    if outline.description:
+        lines.append(f"description: {outline.description}")
+    if outline.assets:
+        assets = [f"{asset} ({_format_size(sizes[asset])})" if asset in sizes else asset
+                  for asset in dict.fromkeys(outline.assets)]
+        lines.append(f"assets: {', '.join(assets)}")
+    if outline.links:
+        lines.append(f"links: {', '.join(dict.fromkeys(outline.links))}")
+    lines.append("sections:")
+    for node in outline.nodes:
+        line = f"{'  ' * node.depth}- {node.label} ({_format_size(node.end - node.start)})"
+        if node.headings:
+            line += ": " + "; ".join(node.headings)
+        if node.text:
+            line += f' "{_excerpt(node.text[0])}"'
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def page_spec(filestore: FileStore, path: str) -> str:
+    """What the router sees of a page: the page itself when it is small, otherwise its outline"""
+    if not filestore.file_exists(path):
+        return ""
+    html = filestore.read_text(path)
+    if len(html.encode("utf-8")) <= FULL_PAGE_MAX_BYTES:
+        return html
+
+    outline = build_outline(html)
+    sizes = {}
+    for asset in dict.fromkeys(outline.assets):
+        local = asset.lstrip("./")
+        # Images, fonts and pdfs are listed without a size, they are never sent to the coder
+        if local.lower().endswith(TEXT_ASSET_EXTENSIONS) and filestore.file_exists(local):
+            sizes[asset] = filestore.size(local)
+    return render_outline(path, outline, sizes=sizes)
+
+
+def relevant_sections(filestore: FileStore, path: str, messages: list[LLMMessage]) -> str:
+    """Full text of the outlined sections the latest request talks about, empty when the page is sent in full"""
+    if not filestore.file_exists(path):
+        return ""
+    html = filestore.read_text(path)
+    if len(html.encode("utf-8")) <= FULL_PAGE_MAX_BYTES:
+        return ""
+    outline = build_outline(html)
+    expand = _sections_to_expand(outline, latest_user_request(messages))
+    return "\n".join(f"- {node.label}\n  text: {node.full_text}"
+                     for i, node in enumerate(outline.nodes) if i in expand)
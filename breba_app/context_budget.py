@@ -0,0 +1,137 @@
+"""
+Token-budgeted views over an agent's message history.
+
+ContextWindow keeps running token counts (prefix sums) for a message list that only grows by appending,
+so each call counts just the new messages. fit() returns the longest recent suffix that fits the budget of the
+LLM function being called; evicted turns are replaced by the executive summary when one is available.
+File payloads sent to the coder are stripped before they are counted or sent again.
+"""
+import logging
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Same approximation as langchain's count_tokens_approximately
+CHARS_PER_TOKEN = 4.0
+EXTRA_TOKENS_PER_MESSAGE = 3
+
+# History budgets per LLM function, file contents given to the coder are not part of the history budget
+DEFAULT_BUDGET = 60_000
+FUNCTION_BUDGETS = {
+    "UserResponseOrCoder": 60_000,
+    "CoderAgent": 40_000,
+}
+
+# Appended to a message that was cut down to fit on its own
+TRUNCATED_NOTE = "\n(message truncated, it is too long)"
+
+_FILES_PAYLOAD_RE = re.compile(r"<files_available_for_editing>.*?</files_available_for_editing>", re.DOTALL)
+FILES_PAYLOAD_PLACEHOLDER = "<files_available_for_editing>(file contents omitted)</files_available_for_editing>"
+
+
+class Message(Protocol):
+    role: str
+    content: str
+
+
+@dataclass(frozen=True)
+class BudgetUsage:
+    function: str
+    budget: int
+    used: int
+    kept: int
+    evicted: int
+    summarized: bool
+
+
+def strip_file_payloads(content: str) -> str:
+    if "<files_available_for_editing>" not in content:
+        return content
+    return _FILES_PAYLOAD_RE.sub(FILES_PAYLOAD_PLACEHOLDER, content)
+
+
+def count_tokens(message: Message) -> int:
+    """Approximate tokens of the message as it is sent, i.e. without file payloads"""
+    content = strip_file_payloads(message.content)
+    return math.ceil((len(message.role) + len(content)) / CHARS_PER_TOKEN) + EXTRA_TOKENS_PER_MESSAGE
+
+
+def budget_for(function: str) -> int:
+    return FUNCTION_BUDGETS.get(function, DEFAULT_BUDGET)
+
+
+def truncate_message(message: Message, budget: int) -> Message:
+    """The message cut down to fit the budget on its own (unchanged when it already fits)"""
+    if count_tokens(message) <= budget:
+        return message
+    chars = int((budget - EXTRA_TOKENS_PER_MESSAGE) * CHARS_PER_TOKEN) - len(message.role) - len(TRUNCATED_NOTE)
+    content = strip_file_payloads(message.content)[:max(0, chars)] + TRUNCATED_NOTE
+    return type(message)(role=message.role, content=content)
+
+
+def summary_message(summary: str, message_type: type) -> Message:
+    return message_type(role="user", content=f"Summary of the earlier conversation:\n{summary}")
+
+
+class ContextWindow:
+    """Incremental token accounting for one agent's message history"""
+
+    def __init__(self):
+        self._tracked: list[Message] = []
+        # _prefix[i] is the token count of the first i messages
+        self._prefix: list[int] = [0]
+        self.usage: dict[str, BudgetUsage] = {}
+
+    def _sync(self, messages: Sequence[Message]) -> None:
+        # Appends are counted incrementally, any other change to the history means a recount
+        known = len(self._tracked)
+        if len(messages) < known or (known and (messages[0] is not self._tracked[0]
+                                                or messages[known - 1] is not self._tracked[-1])):
+            self._tracked, self._prefix = [], [0]
+            known = 0
+        for message in messages[known:]:
+            self._tracked.append(message)
+            self._prefix.append(self._prefix[-1] + count_tokens(message))
+
+    def total_tokens(self, messages: Sequence[Message]) -> int:
+        self._sync(messages)
+        return self._prefix[-1]
+
+    def fit(self, messages: Sequence[Message], function: str, *, summary: str | None = None,
+            budget: int | None = None) -> list[Message]:
+        """
+        Most recent messages that fit the function's budget, starting on a user message.
+        Returns an empty list when even the latest message does not fit.
+        """
+        budget = budget or budget_for(function)
+        self._sync(messages)
+        total = self._prefix[-1]
+
+        # First index whose suffix fits: total - prefix[start] <= budget
+        start = bisect_left(self._prefix, total - budget)
+        summary_msg = None
+        if start > 0 and summary and messages:
+            summary_msg = summary_message(summary, type(messages[-1]))
+            start = bisect_left(self._prefix, total - budget + count_tokens(summary_msg))
+        while start < len(messages) and messages[start].role != "user":
+            start += 1
+
+        kept = []
+        for message in messages[start:]:
+            content = strip_file_payloads(message.content)
+            kept.append(message if content is message.content else type(message)(role=message.role, content=content))
+        used = total - self._prefix[start]
+        if summary_msg is not None and kept:
+            kept.insert(0, summary_msg)
+            used += count_tokens(summary_msg)
+
+        usage = BudgetUsage(function=function, budget=budget, used=used if kept else 0, kept=len(kept),
+                            evicted=start, summarized=summary_msg is not None and bool(kept))
+        self.usage[function] = usage
+        if start:
+            logger.info(f"{function} context: {usage}")
+        return kept
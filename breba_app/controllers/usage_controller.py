@@ -1,28 +1,146 @@
+import asyncio
 import logging
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable
 
 from langchain_core.messages import UsageMetadata
-from langchain_core.messages.ai import add_usage
+from pymongo import UpdateOne
 
 from breba_app.models.product import Product
+from breba_app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 INPUT_TOKEN_COEFFICIENT = 2 / 1_000_000  # $2 per 1M tokens
 OUTPUT_TOKEN_COEFFICIENT = 8 / 1_000_000  # $8 per 1M tokens
+# Cached input tokens are billed at a tenth of the input price
+CACHED_INPUT_DISCOUNT = 0.1
 
+# (input, output) $ per token for the BAML clients, others use the coefficients above
+CLIENT_PRICES = {
+    "Gpt5Low": (1.25 / 1_000_000, 10 / 1_000_000),
+    "Gpt5Medium": (1.25 / 1_000_000, 10 / 1_000_000),
+    "Gpt51CodexLow": (1.25 / 1_000_000, 10 / 1_000_000),
+    "CustomGPT5": (1.25 / 1_000_000, 10 / 1_000_000),
+    "CustomGPT5Mini": (0.25 / 1_000_000, 2 / 1_000_000),
+}
 
-async def report_usage(username: str, product_id: str, usage_metadata: dict[str, UsageMetadata]) -> None:
-    try:
-        product = await Product.find_one(Product.product_id == product_id)
-        aggregate_metadata = None
-        for model, metadata in usage_metadata.items():
-            aggregate_metadata = add_usage(aggregate_metadata, metadata)
-        amount = (
-                aggregate_metadata.get("input_tokens", 0) * INPUT_TOKEN_COEFFICIENT +
-                usage_metadata.get("output_tokens", 0) * OUTPUT_TOKEN_COEFFICIENT
+# Pending usage is written at least this often, or as soon as this many products have pending usage
+FLUSH_INTERVAL_SECONDS = 30.0
+FLUSH_MAX_PRODUCTS = 200
+
+USAGE_FIELDS = ("cost", "input_tokens", "output_tokens")
+
+
+def usage_cost(usage_metadata: dict[str, UsageMetadata]) -> float:
+    """$ cost of the token usage, keyed by client or model name"""
+    amount = 0.0
+    for client, metadata in usage_metadata.items():
+        input_price, output_price = CLIENT_PRICES.get(client, (INPUT_TOKEN_COEFFICIENT, OUTPUT_TOKEN_COEFFICIENT))
+        cached = (metadata.get("input_token_details") or {}).get("cache_read", 0)
+        amount += (
+                (metadata.get("input_tokens", 0) - cached) * input_price +
+                cached * input_price * CACHED_INPUT_DISCOUNT +
+                metadata.get("output_tokens", 0) * output_price
         )
-        await product.increment_cost(amount)
+    return amount
+
+
+async def _bulk_inc(pending: dict[str, Counter]) -> None:
+    operations = [UpdateOne({"product_id": product_id}, {"$inc": dict(counters)})
+                  for product_id, counters in pending.items()]
+    await Product.get_motor_collection().bulk_write(operations, ordered=False)
+
+
+class UsageAccumulator:
+    """
+    In-memory cost and token counters per product, written to Mongo with one bulk_write of $inc updates
+    on an interval, when many products are pending, and on shutdown.
+    Adding usage never touches the database.
+    """
+
+    def __init__(self, write: Callable[[dict[str, Counter]], Awaitable[None]] = _bulk_inc):
+        self._write = write
+        self._pending: dict[str, Counter] = defaultdict(Counter)
+        # Running totals per user since the process started, flushed or not
+        self._user_totals: dict[str, Counter] = defaultdict(Counter)
+        self._pending_by_user: dict[str, Counter] = defaultdict(Counter)
+        self._flush_task: asyncio.Task | None = None
+        self._interval_task: asyncio.Task | None = None
+
+    def add(self, user_name: str, product_id: str, *, cost: float, input_tokens: int = 0,
+            output_tokens: int = 0) -> None:
+        usage = Counter(cost=cost, input_tokens=input_tokens, output_tokens=output_tokens)
+        self._pending[product_id].update(usage)
+        self._pending_by_user[user_name].update(usage)
+        self._user_totals[user_name].update(usage)
+        if len(self._pending) >= FLUSH_MAX_PRODUCTS and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    def pending(self, product_id: str) -> dict[str, float]:
+        return {name: self._pending[product_id][name] for name in USAGE_FIELDS} if product_id in self._pending else {}
+
+    def session_totals(self, user_name: str) -> dict[str, float]:
+        """Usage of the user recorded by this process"""
+        return {name: self._user_totals[user_name][name] for name in USAGE_FIELDS}
+
+    async def user_totals(self, user_name: str) -> dict[str, float]:
+        """Usage of the user across all products, including what has not been flushed yet (for quotas)"""
+        totals = Counter({name: 0 for name in USAGE_FIELDS})
+        user = await User.find_one(User.username == user_name)
+        if user is not None:
+            pipeline = [{"$group": {"_id": None, **{name: {"$sum": f"${name}"} for name in USAGE_FIELDS}}}]
+            async for row in Product.find(Product.user.id == user.id).aggregate(pipeline):
+                totals.update({name: row.get(name) or 0 for name in USAGE_FIELDS})
+        totals.update(self._pending_by_user.get(user_name, {}))
+        return {name: totals[name] for name in USAGE_FIELDS}
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(Counter)
+        pending_by_user, self._pending_by_user = self._pending_by_user, defaultdict(Counter)
+        try:
+            await self._write(pending)
+        except Exception:
+            # Keep the counters for the next flush, usage must not be lost because Mongo was briefly unavailable
+            logger.exception(f"Failed to write usage for {len(pending)} products")
+            for product_id, counters in pending.items():
+                self._pending[product_id].update(counters)
+            for user_name, counters in pending_by_user.items():
+                self._pending_by_user[user_name].update(counters)
+
+    async def _flush_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    def start(self, interval: float = FLUSH_INTERVAL_SECONDS) -> None:
+        if self._interval_task is None:
+            self._interval_task = asyncio.create_task(self._flush_periodically(interval))
+
+    async def stop(self) -> None:
+        """Stop the interval flushes and write whatever is pending"""
+        if self._interval_task is not None:
+            self._interval_task.cancel()
+            self._interval_task = None
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.flush()
+
+
+usage_accumulator = UsageAccumulator()
+
+
+def report_usage(username: str, product_id: str, usage_metadata: dict[str, UsageMetadata]) -> None:
+    try:
+        amount = usage_cost(usage_metadata)
+        if not amount:
+            return
+        usage_accumulator.add(username, product_id, cost=amount,
+                              input_tokens=sum(m.get("input_tokens", 0) for m in usage_metadata.values()),
+                              output_tokens=sum(m.get("output_tokens", 0) for m in usage_metadata.values()))
     except Exception as e:
         # We will swallow errors because they should not impact client, this is just for analytics
-        logger.error(f"Failed to update product usage for {username}, product_id: {product_id}, amount: {amount}")
+        logger.error(f"Failed to record product usage for {username}, product_id: {product_id}")
         logger.error(e)
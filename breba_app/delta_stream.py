@@ -0,0 +1,112 @@
+"""
+Delta encoding of streamed text.
+
+BAML streams give the whole text generated so far with every partial result. Sending that to the browser on every
+partial is quadratic in the length of the text, so only (offset, text) deltas are sent: the receiver keeps
+received[:offset] and appends text. offset is the length of the common prefix, so a partial that rewrote earlier
+text (rare, e.g. a trailing token that got re-tokenized) is still encoded correctly.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import AsyncIterable, Awaitable, Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Streamed text reaches the browser at most once per frame
+FRAME_INTERVAL_SECONDS = 0.05
+
+
+def text_delta(previous: str, current: str) -> tuple[int, str]:
+    """(offset, text) such that current == previous[:offset] + text"""
+    if current.startswith(previous):
+        return len(previous), current[len(previous):]
+    offset = len(os.path.commonprefix([previous, current]))
+    return offset, current[offset:]
+
+
+class ThrottledDeltaSender:
+    """
+    Sends the latest state of a growing text as deltas, at most once per interval (latest wins).
+    close() sends whatever is left, so the receiver always ends up with the final text.
+    """
+
+    def __init__(self, send: Callable[[int, str], Awaitable[None]], *, interval: float, sent: str = "",
+                 clock: Callable[[], float] = time.monotonic):
+        """sent: the text the receiver already has"""
+        self._send = send
+        self._interval = interval
+        self._clock = clock
+        self._sent = sent
+        self._latest = sent
+        self._last_send = float("-inf")
+        self._flush_task: asyncio.Task | None = None
+        self._enabled = True
+
+    @property
+    def sent(self) -> str:
+        return self._sent
+
+    def update(self, text: str) -> None:
+        if not self._enabled:
+            return
+        self._latest = text
+        if self._flush_task is None and self._latest != self._sent:
+            delay = max(0.0, self._last_send + self._interval - self._clock())
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._enabled or self._latest == self._sent:
+            return
+        latest = self._latest
+        offset, text = text_delta(self._sent, latest)
+        self._last_send = self._clock()
+        try:
+            await self._send(offset, text)
+            self._sent = latest
+        except Exception as e:
+            # No UI to send to (e.g. evals and benchmarks), stop trying
+            logger.info(f"Delta stream disabled: {e}")
+            self._enabled = False
+
+    async def close(self, final: str | None = None) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if final is not None:
+            self._latest = final
+        await self._flush()
+
+
+class StreamingMessage(Protocol):
+    content: str
+
+    async def stream_token(self, token: str, is_sequence: bool = False) -> None: ...
+
+
+async def stream_to_message(message: StreamingMessage, partials: AsyncIterable[str], *,
+                            interval: float = FRAME_INTERVAL_SECONDS) -> None:
+    """
+    Stream cumulative partial texts (e.g. BAML partials) into a chainlit message.
+    Only the new text of each frame is sent as an appended token, the whole text is resent only when a partial
+    rewrote text that was already sent.
+    """
+    async def send(offset: int, text: str) -> None:
+        if offset == len(message.content):
+            await message.stream_token(text)
+        else:
+            await message.stream_token(message.content[:offset] + text, is_sequence=True)
+
+    sender = ThrottledDeltaSender(send, interval=interval, sent=message.content)
+    async for partial in partials:
+        if partial:
+            sender.update(partial)
+    await sender.close()
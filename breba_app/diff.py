@@ -1,21 +1,53 @@
-import difflib
+import bisect
+from collections import defaultdict
+from typing import Iterator, Sequence
+
+# Beyond this many edits within a single region, Myers stops searching for the shortest script
+# and reports the rest of the region as replaced. The diff stays correct, just less minimal.
+MAX_MYERS_COST = 2000
 
 
 class PatchApplyError(Exception):
     pass
 
 
-def get_diff(old_text: str, new_text: str):
-    diff = difflib.unified_diff(
+def get_diff(old_text: str, new_text: str, fromfile: str = "before", tofile: str = "after") -> str:
+    diff = unified_diff(
         old_text.splitlines(),
         new_text.splitlines(),
-        fromfile='before',
-        tofile='after',
-        lineterm=''
+        fromfile=fromfile,
+        tofile=tofile,
     )
     return "\n".join(diff) + "\n"
 
 
+def unified_diff(a: Sequence[str], b: Sequence[str], fromfile: str = "", tofile: str = "",
+                 n: int = 3) -> Iterator[str]:
+    """
+    Same output as difflib.unified_diff(..., lineterm=''), but computed with a patience/Myers diff over
+    interned lines, which stays fast on large HTML pages where difflib degrades badly.
+    """
+    started = False
+    for group in _grouped_opcodes(_opcodes(a, b), n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
 def validate_diff(diff_text: str):
     """Validate that the diff has proper format"""
     lines = diff_text.splitlines()
@@ -76,13 +108,7 @@ def apply_diff_no_line_numbers(original_text: str, diff_text: str) -> str:
     # Parse hunks
     hunks = parse_hunks(diff_text)
 
-    # Apply hunks in reverse order to avoid index shifting
-    result_lines = list(original_lines)
-
-    for hunk in reversed(hunks):
-        result_lines = apply_hunk(result_lines, hunk)
-
-    return ''.join(result_lines)
+    return "".join(apply_hunks(original_lines, hunks))
 
 
 def parse_hunks(diff_text: str):
@@ -118,54 +144,279 @@ def parse_hunks(diff_text: str):
     return hunks
 
 
-def find_hunk_start(original_lines, hunk_lines):
-    """Find the starting line index for a hunk by matching all removed lines"""
-    # Extract all removed lines (and context lines) to match against
-    lines_to_match = []
-    for line in hunk_lines:
-        if line.startswith(" ") or line.startswith("-"):
-            lines_to_match.append(line[1:])  # remove the prefix
-
+def _lines_to_match(hunk_lines) -> list[str]:
+    """Context and removed lines of a hunk, which is the text that must exist in the original"""
+    lines_to_match = [line[1:] for line in hunk_lines if line.startswith((" ", "-"))]
     if not lines_to_match:
         raise PatchApplyError(f"Hunk has no context or removed lines to match against: {hunk_lines}")
+    return lines_to_match
+
+
+class _LineIndex:
+    """Positions of every distinct line, so hunks are located by hash lookup instead of scanning every offset"""
+
+    def __init__(self, lines: Sequence[str]):
+        self._lines = lines
+        self._positions: dict[str, list[int]] = defaultdict(list)
+        for i, line in enumerate(lines):
+            self._positions[line].append(i)
+
+    def find(self, lines_to_match: list[str], start: int = 0) -> Iterator[int]:
+        """Yield every index >= start where lines_to_match occurs, in order"""
+        candidates = self._positions.get(lines_to_match[0], [])
+        size = len(lines_to_match)
+        for i in candidates[bisect.bisect_left(candidates, start):]:
+            if self._lines[i:i + size] == lines_to_match:
+                yield i
 
-    # Find where this sequence appears in the original
-    for i in range(len(original_lines) - len(lines_to_match) + 1):
-        if original_lines[i:i + len(lines_to_match)] == lines_to_match:
-            return i
+
+def find_hunk_start(original_lines, hunk_lines, start: int = 0):
+    """Find the starting line index for a hunk by matching all removed lines"""
+    lines_to_match = _lines_to_match(hunk_lines)
+    for i in _LineIndex(original_lines).find(lines_to_match, start):
+        return i
 
     raise PatchApplyError(f"Could not find context lines. The following text was not found in the original text\n"
                           f"{"\n".join(lines_to_match)}")
 
 
-def apply_hunk(original_lines, hunk_lines):
-    """Apply a single hunk to the original lines"""
-    start_idx = find_hunk_start(original_lines, hunk_lines)
+def apply_hunks(original_lines: list[str], hunks: list[list[str]]) -> list[str]:
+    """
+    Locate every hunk in the original up front, then splice all of them in a single pass over the original.
+    Hunks are searched after the end of the previous hunk first. Out of order hunks fall back to the first
+    location that does not overlap a hunk that was already placed.
+    """
+    index = _LineIndex(original_lines)
+    placed: list[tuple[int, int, list[str]]] = []
+    cursor = 0
+
+    for hunk in hunks:
+        lines_to_match = _lines_to_match(hunk)
+        size = len(lines_to_match)
+        start = next(index.find(lines_to_match, cursor), None)
+        if start is None:
+            start = next((i for i in index.find(lines_to_match)
+                          if not any(i < end and begin < i + size for begin, end, _ in placed)), None)
+        if start is None:
+            raise PatchApplyError(f"Could not find context lines. The following text was not found in the original "
+                                  f"text\n{"\n".join(lines_to_match)}")
+
+        new_content = []
+        for line in hunk:
+            if line.startswith(" "):  # context
+                new_content.append(line[1:])
+            elif line.startswith("+"):  # addition
+                new_content.append(line[1:])
+            elif not line.startswith("-"):  # removals are simply skipped
+                raise PatchApplyError(f"Unexpected line in diff: {line!r}")
+
+        placed.append((start, start + size, new_content))
+        cursor = start + size
+
+    result_lines: list[str] = []
+    position = 0
+    for begin, end, new_content in sorted(placed, key=lambda hunk_span: hunk_span[0]):
+        result_lines.extend(original_lines[position:begin])
+        result_lines.extend(new_content)
+        position = end
+    result_lines.extend(original_lines[position:])
 
-    # Build the replacement content
-    new_content = []
-    original_idx = start_idx
+    return result_lines
 
-    for line in hunk_lines:
-        if line.startswith(" "):  # context
-            new_content.append(line[1:])
-            original_idx += 1
-        elif line.startswith("-"):  # removal
-            # Skip this line (don't add to new_content)
-            original_idx += 1
-        elif line.startswith("+"):  # addition
-            new_content.append(line[1:])
-        else:
-            raise PatchApplyError(f"Unexpected line in diff: {line!r}")
 
-    # Calculate how many lines we're replacing
-    lines_consumed = original_idx - start_idx
+# ------------------------------ Diff engine ------------------------------- #
+
+def _format_range(start: int, stop: int) -> str:
+    """Convert a range to the unified diff format (same as difflib)"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _intern(a: Sequence[str], b: Sequence[str]) -> tuple[list[int], list[int]]:
+    """Replace every distinct line with a small int so comparisons never touch the strings again"""
+    ids: dict[str, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b]
+    return a_ids, b_ids
+
+
+def _unique_anchors(a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Patience diff: lines that occur exactly once on both sides, reduced to their longest increasing subsequence"""
+    a_count: dict[int, int] = defaultdict(int)
+    a_index: dict[int, int] = {}
+    for i in range(alo, ahi):
+        a_count[a[i]] += 1
+        a_index[a[i]] = i
+    b_count: dict[int, int] = defaultdict(int)
+    b_index: dict[int, int] = {}
+    for j in range(blo, bhi):
+        b_count[b[j]] += 1
+        b_index[b[j]] = j
+
+    pairs = sorted((a_index[line], b_index[line]) for line, count in a_count.items()
+                   if count == 1 and b_count.get(line) == 1)
+    if not pairs:
+        return []
+
+    # Longest increasing subsequence of b positions (patience sorting)
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous: list[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect.bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tail_indexes.append(index)
+        else:
+            tails[pile] = j
+            tail_indexes[pile] = index
+        previous[index] = tail_indexes[pile - 1] if pile else -1
+
+    anchors = []
+    index = tail_indexes[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Matching (i, j) line pairs of a shortest edit script, Myers O(ND) greedy algorithm"""
+    n = ahi - alo
+    m = bhi - blo
+    max_cost = min(n + m, MAX_MYERS_COST)
+    offset = max_cost + 1
+    v = [0] * (2 * max_cost + 3)
+    # trace[d] holds diagonals -d-1..d+1 of v as they were before step d, which is all backtracking needs
+    trace: list[list[int]] = []
+
+    for d in range(max_cost + 1):
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, alo, blo, n, m)
+    # Too expensive to find the shortest script, treat the whole region as replaced
+    return []
+
+
+def _myers_backtrack(trace: list[list[int]], alo: int, blo: int, n: int, m: int) -> list[tuple[int, int]]:
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        # v[k + d + 1] is diagonal k in the saved slice
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = prev_x, prev_y
+    return matches
+
+
+def _matching_pairs(a: list[int], b: list[int]) -> list[tuple[int, int]]:
+    """Patience diff to split the problem on unique lines, Myers for whatever is left between the anchors"""
+    matches: list[tuple[int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
 
-    # Replace the section
-    result_lines = (
-            original_lines[:start_idx] +
-            new_content +
-            original_lines[start_idx + lines_consumed:]
-    )
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if not anchors:
+            matches.extend(_myers(a, b, alo, ahi, blo, bhi))
+            continue
 
-    return result_lines
+        prev_i, prev_j = alo, blo
+        for i, j in anchors:
+            regions.append((prev_i, i, prev_j, j))
+            matches.append((i, j))
+            prev_i, prev_j = i + 1, j + 1
+        regions.append((prev_i, ahi, prev_j, bhi))
+
+    matches.sort()
+    return matches
+
+
+def _matching_blocks(a: Sequence[str], b: Sequence[str]) -> list[tuple[int, int, int]]:
+    """Same (i, j, size) blocks as difflib.SequenceMatcher.get_matching_blocks(), including the final sentinel"""
+    a_ids, b_ids = _intern(a, b)
+    blocks: list[tuple[int, int, int]] = []
+    for i, j in _matching_pairs(a_ids, b_ids):
+        if blocks:
+            block_i, block_j, size = blocks[-1]
+            if block_i + size == i and block_j + size == j:
+                blocks[-1] = (block_i, block_j, size + 1)
+                continue
+        blocks.append((i, j, 1))
+    blocks.append((len(a), len(b), 0))
+    return blocks
+
+
+def _opcodes(a: Sequence[str], b: Sequence[str]) -> list[tuple[str, int, int, int, int]]:
+    """Same opcodes as difflib.SequenceMatcher.get_opcodes()"""
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in _matching_blocks(a, b):
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def _grouped_opcodes(opcodes: list[tuple[str, int, int, int, int]], n: int = 3):
+    """Same hunk grouping as difflib.SequenceMatcher.get_grouped_opcodes()"""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
@@ -1,2 +1,3 @@
 from .in_memory_store import InMemoryFileStore, FileStore
 from .models import FileWrite
+from .overlay_store import OverlayFileStore
@@ -13,6 +13,8 @@ class FileStore(Protocol):
 
     def file_exists(self, path: str) -> bool: ...
 
+    def size(self, path: str) -> int: ...
+
 
 class InMemoryFileStore(FileStore):
     """
@@ -39,6 +41,12 @@ class InMemoryFileStore(FileStore):
     def file_exists(self, path: str) -> bool:
         return path in self._files
 
+    def size(self, path: str) -> int:
+        """Size in bytes, without decoding the content"""
+        if path not in self._files:
+            raise FileNotFoundError(path)
+        return len(self._files[path].content)
+
     def snapshot(self) -> dict[str, FileWrite]:
         return dict(self._files)
 
@@ -0,0 +1,145 @@
+import hashlib
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from breba_app.filesystem.in_memory_store import FileStore
+
+
+@dataclass
+class _Entry:
+    """Decoded text of a file together with its lazily computed sha256."""
+    text: str
+    _sha256: str | None = field(default=None, repr=False)
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+        return self._sha256
+
+
+class OverlayFileStore(FileStore, MutableMapping):
+    """
+    Copy-on-write FileStore layered over another FileStore:
+    - reads fall through to the base store and are cached (decoded text + sha256)
+    - writes only land in the overlay and mark the path dirty
+    - modified_files(), commit() and rollback() only look at dirty paths,
+      so their cost is proportional to what changed, not to the site size
+
+    It is also a MutableMapping of path -> text, so it can be handed directly to apply_edits_many.
+    The base store must not be written to behind the overlay's back while it is in use.
+    """
+
+    def __init__(self, base: FileStore):
+        self._base = base
+        self._base_entries: dict[str, _Entry | None] = {}
+        self._overlay: dict[str, _Entry] = {}
+
+    @property
+    def base(self) -> FileStore:
+        return self._base
+
+    @property
+    def dirty(self) -> set[str]:
+        """Paths written since the last commit/rollback, whether or not the content actually changed."""
+        return set(self._overlay)
+
+    # ----------------------------- FileStore ----------------------------- #
+
+    def read_text(self, path: str) -> str:
+        entry = self._entry(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry.text
+
+    def write_text(self, path: str, content: str) -> None:
+        self._overlay[path] = _Entry(content)
+
+    def list_files(self) -> list[str]:
+        files = set(self._base.list_files())
+        files.update(self._overlay)
+        return sorted(files)
+
+    def file_exists(self, path: str) -> bool:
+        return path in self._overlay or self._base.file_exists(path)
+
+    def size(self, path: str) -> int:
+        entry = self._overlay.get(path)
+        if entry is not None:
+            return len(entry.text.encode("utf-8"))
+        # Asks the base store, so binary files are never decoded
+        return self._base.size(path)
+
+    # ------------------------- Change tracking --------------------------- #
+
+    def sha256(self, path: str) -> str:
+        entry = self._entry(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry.sha256
+
+    def modified_files(self) -> list[str]:
+        """New files and files whose content differs from the base store."""
+        modified = []
+        for path, entry in self._overlay.items():
+            base_entry = self._base_entry(path)
+            if base_entry is None or base_entry.sha256 != entry.sha256:
+                modified.append(path)
+        return sorted(modified)
+
+    def changes(self) -> dict[str, str]:
+        """Text of every modified file, keyed by path."""
+        return {path: self._overlay[path].text for path in self.modified_files()}
+
+    def commit(self) -> list[str]:
+        """Write modified files through to the base store and return their paths."""
+        changes = self.changes()
+        for path, content in changes.items():
+            self._base.write_text(path, content)
+            self._base_entries[path] = self._overlay[path]
+        self._overlay.clear()
+        return sorted(changes)
+
+    def rollback(self) -> None:
+        """Discard every write made since the last commit/rollback."""
+        self._overlay.clear()
+
+    # --------------------------- MutableMapping -------------------------- #
+
+    def __getitem__(self, path: str) -> str:
+        entry = self._entry(path)
+        if entry is None:
+            raise KeyError(path)
+        return entry.text
+
+    def __setitem__(self, path: str, content: str) -> None:
+        self.write_text(path, content)
+
+    def __delitem__(self, path: str) -> None:
+        raise TypeError("OverlayFileStore does not support deleting files")
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self.file_exists(path)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.list_files())
+
+    def __len__(self) -> int:
+        return len(self.list_files())
+
+    # ------------------------- Private helpers --------------------------- #
+
+    def _entry(self, path: str) -> _Entry | None:
+        entry = self._overlay.get(path)
+        if entry is not None:
+            return entry
+        return self._base_entry(path)
+
+    def _base_entry(self, path: str) -> _Entry | None:
+        if path not in self._base_entries:
+            if self._base.file_exists(path):
+                self._base_entries[path] = _Entry(self._base.read_text(path))
+            else:
+                self._base_entries[path] = None
+        return self._base_entries[path]
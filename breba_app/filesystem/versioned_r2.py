@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import itertools
 import json
 import logging
 import mimetypes
 import posixpath
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable, Any
@@ -14,10 +17,14 @@ from typing import Iterable, Any
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
 
+from breba_app.diff import unified_diff
 from breba_app.filesystem.models import FileWrite
 
 logger = logging.getLogger(__name__)
 
+READ_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DIFF_CACHE_MAX_ENTRIES = 1024
+
 
 @dataclass
 class FileMetadata:
@@ -30,6 +37,14 @@ class FileMetadata:
     version: int
 
 
+@dataclass
+class FileDiff:
+    """Difference of a single file between two versions."""
+    path: str
+    status: str  # "added", "removed" or "modified"
+    diff: str
+
+
 class VersionedFileSystemError(Exception):
     pass
 
@@ -129,7 +144,7 @@ class VersionedR2FileSystem:
                 meta = manifest["files"].get(sanitized_path)
                 if not meta:
                     raise NotFound(f"{sanitized_path} not found in version {resolved_version}")
-                key = meta["key"]
+                return FileWrite(sanitized_path, self._read_object(meta), meta.get("content_type"))
             else:
                 # If version is 0 or None, we are reading the unversioned copy
                 key = self._prefix + "/" + sanitized_path
@@ -149,6 +164,39 @@ class VersionedR2FileSystem:
         """Write a single file and create a new version."""
         return self.batch_write([FileWrite(path=path, content=content, content_type=content_type)])
 
+    def diff_versions(self, a: int, b: int) -> list[FileDiff]:
+        """
+        Unified diffs of every file that differs between versions a and b.
+        Files with matching sha256 in both manifests are skipped without being read,
+        changed objects are fetched through the read cache and diffs are memoized by (sha_a, sha_b).
+        """
+        files_a = self._get_manifest(a)["files"]
+        files_b = self._get_manifest(b)["files"]
+
+        diffs = []
+        for path in sorted(files_a.keys() | files_b.keys()):
+            meta_a = files_a.get(path)
+            meta_b = files_b.get(path)
+            if meta_a and meta_b and meta_a["key"] == meta_b["key"]:
+                continue
+            if meta_a and meta_b and _is_sha(meta_a["sha256"]) and meta_a["sha256"] == meta_b["sha256"]:
+                continue
+
+            status = "added" if meta_a is None else "removed" if meta_b is None else "modified"
+            cache_key = (_cache_sha(meta_a), _cache_sha(meta_b))
+            hunks = _diff_cache.get(cache_key) if None not in cache_key else None
+            if hunks is None:
+                hunks = self._diff_hunks(meta_a, meta_b)
+                if None not in cache_key:
+                    _diff_cache.put(cache_key, hunks)
+
+            if hunks == _BINARY:
+                diff = f"Binary files v{a}/{path} and v{b}/{path} differ\n"
+            else:
+                diff = f"--- v{a}/{path}\n+++ v{b}/{path}\n{hunks}"
+            diffs.append(FileDiff(path=path, status=status, diff=diff))
+        return diffs
+
     def batch_copy_dir(self, source_bucket_name: str, source_prefix):
         try:
             source_objects = self._s3.list_objects_v2(Bucket=source_bucket_name, Prefix=source_prefix)["Contents"]
@@ -219,6 +267,35 @@ class VersionedR2FileSystem:
 
     # ------------------------- Private helpers ---------------------------- #
 
+    def _read_object(self, meta: dict[str, Any]) -> bytes:
+        """Read object bytes for a manifest entry, going through the read cache when the entry has a real sha256"""
+        sha = meta["sha256"]
+        if _is_sha(sha):
+            data = _read_cache.get(sha)
+            if data is not None:
+                return data
+        try:
+            obj = self._s3.get_object(Bucket=self._bucket, Key=meta["key"])
+            data = obj["Body"].read()
+        except (ClientError, self._s3.exceptions.NoSuchKey):
+            raise NotFound(f"Object not found (key={meta['key']})")
+        if _is_sha(sha):
+            _read_cache.put(sha, data)
+        return data
+
+    def _diff_hunks(self, meta_a: dict | None, meta_b: dict | None) -> str:
+        """Hunks of the unified diff between two manifest entries, without the file headers"""
+        data_a = self._read_object(meta_a) if meta_a else b""
+        data_b = self._read_object(meta_b) if meta_b else b""
+        try:
+            text_a = data_a.decode("utf-8")
+            text_b = data_b.decode("utf-8")
+        except UnicodeDecodeError:
+            return _BINARY
+        # Skip the ---/+++ header lines, they depend on the versions being compared and are added by the caller
+        lines = itertools.islice(unified_diff(text_a.splitlines(), text_b.splitlines()), 2, None)
+        return "".join(line + "\n" for line in lines)
+
     def _init_version_zero(self) -> None:
         """Initialize version 0 manifest if missing."""
         key = self._manifest_key(0)
@@ -300,6 +377,61 @@ class VersionedR2FileSystem:
 
 # --------------------------- Helper functions ----------------------------- #
 
+class _LRUCache:
+    """Thread-safe LRU cache bounded by the total size of its values (len() of each value by default)."""
+
+    def __init__(self, max_size: int, sizeof=len):
+        self._max_size = max_size
+        self._sizeof = sizeof
+        self._size = 0
+        self._items: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value) -> None:
+        size = self._sizeof(value)
+        if size > self._max_size:
+            return
+        with self._lock:
+            if key in self._items:
+                self._size -= self._sizeof(self._items.pop(key))
+            self._items[key] = value
+            self._size += size
+            while self._size > self._max_size:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= self._sizeof(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+# Shared across instances, storage.py creates a new VersionedR2FileSystem per call.
+# Keys are content hashes, so sharing them between products is safe.
+_read_cache = _LRUCache(READ_CACHE_MAX_BYTES)
+_diff_cache = _LRUCache(DIFF_CACHE_MAX_ENTRIES, sizeof=lambda _: 1)
+_BINARY = "\0binary"
+
+
+def _is_sha(sha: Any) -> bool:
+    """Version 0 manifests of legacy products use 0 as a placeholder sha256"""
+    return isinstance(sha, str) and len(sha) == 64
+
+
+def _cache_sha(meta: dict | None) -> str | None:
+    """Diff cache key part: "" for a missing file, None when the entry has no usable sha256"""
+    if meta is None:
+        return ""
+    return meta["sha256"] if _is_sha(meta["sha256"]) else None
+
+
 def _guess_content_type(path: str) -> str:
     ctype, _ = mimetypes.guess_type(path)
     return ctype or "application/octet-stream"
@@ -0,0 +1,155 @@
+"""
+Content-addressed cache for deterministic LLM calls.
+
+Calls are keyed by function name, client and a sha256 of the canonicalized arguments, so byte-identical
+requests (retries, re-opened sessions, constant template instructions) are answered without another round trip.
+Caching is opt-in: only functions wrapped with @cached_llm_call are cached. Exceptions are never cached.
+"""
+import copy
+import functools
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter, OrderedDict
+from dataclasses import is_dataclass, asdict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_ENTRIES = 512
+
+T = TypeVar("T")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return _canonical(value.model_dump(mode="json"))
+    if is_dataclass(value) and not isinstance(value, type):
+        return _canonical(asdict(value))
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(v) for v in value)
+    return value
+
+
+def _braced_block(text: str, start: int) -> str:
+    """text from start up to the brace that closes the first { after start"""
+    depth = 0
+    for i in range(text.index("{", start), len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def baml_client_of(baml_files: dict[str, str], function_name: str) -> str:
+    """
+    Cache key part for the client of a BAML function, as defined in the BAML sources (see get_baml_files() of a
+    generated baml_client): the client name and a digest of its definition, so that moving the function to
+    another client or changing the client's model or options changes the key.
+    """
+    source = "\n".join(baml_files.values())
+    function = re.search(rf"\bfunction\s+{re.escape(function_name)}\s*\(", source)
+    if function is None:
+        raise ValueError(f"BAML function {function_name} not found")
+    client = re.search(r'^\s*client\s+"?([\w./-]+)"?', _braced_block(source, function.start()), re.MULTILINE)
+    if client is None:
+        raise ValueError(f"BAML function {function_name} has no client")
+    name = client.group(1)
+    definition = re.search(rf"\bclient<llm>\s+{re.escape(name)}\s*{{", source)
+    # A shorthand client ("openai/gpt-4o") is its own definition
+    body = _braced_block(source, definition.start()) if definition else name
+    return f"{name}@{hashlib.sha256(body.encode('utf-8')).hexdigest()[:12]}"
+
+
+def cache_key(function_name: str, client: str, args: tuple, kwargs: dict) -> str:
+    payload = json.dumps(_canonical({"args": list(args), "kwargs": kwargs}), sort_keys=True, ensure_ascii=False,
+                         separators=(",", ":"), default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{function_name}:{client}:{digest}"
+
+
+class ResponseCache:
+    """In-process LRU cache with a per-entry TTL and hit/miss counters per function"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+
+    def get(self, function_name: str, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._hits[function_name] += 1
+                return True, copy.deepcopy(value)
+            del self._entries[key]
+        self._misses[function_name] += 1
+        return False, None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits.clear()
+        self._misses.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """hits, misses and hit_rate per function name"""
+        stats = {}
+        for function_name in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits[function_name], self._misses[function_name]
+            stats[function_name] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def cached_llm_call(function_name: str, *, client: str, ttl: float = DEFAULT_TTL_SECONDS,
+                    cache: ResponseCache | None = None) \
+        -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache the result of an async LLM call.
+    client is part of the key. For BAML functions use baml_client_of, then changing the model behind a function
+    does not serve stale answers.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            target = cache if cache is not None else response_cache
+            key = cache_key(function_name, client, args, kwargs)
+            hit, value = target.get(function_name, key)
+            if hit:
+                logger.debug(f"LLM cache hit for {function_name}")
+                return value
+            value = await func(*args, **kwargs)
+            target.set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
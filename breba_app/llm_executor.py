@@ -0,0 +1,191 @@
+"""
+Deadlines, hedging, rate limiting and retries for LLM calls.
+
+Every LLM call in the process goes through one token bucket, so a burst of sessions is smoothed out on our side
+instead of turning into provider 429s. Calls get a deadline; rate limited and overloaded responses are retried
+after the delay the provider asks for, within that deadline. Short, idempotent calls can be hedged: when the
+first request is still running after the function's p95 latency, a second one is sent and the first answer wins.
+"""
+import asyncio
+import logging
+import math
+import os
+import re
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Requests per second shared by all sessions in the process, and the burst allowed on top of it
+LLM_RATE_PER_SECOND = float(os.getenv("LLM_RATE_PER_SECOND", "8"))
+LLM_BURST = int(os.getenv("LLM_BURST", "16"))
+
+DEFAULT_DEADLINE_SECONDS = 180.0
+# For short structured calls such as file selection and planning
+SHORT_DEADLINE_SECONDS = 60.0
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+# Latency samples kept per function for the p95
+LATENCY_WINDOW = 50
+# Until enough samples are in, hedging waits this long
+MIN_HEDGE_SAMPLES = 10
+DEFAULT_HEDGE_DELAY = 10.0
+
+_RETRY_AFTER_RE = re.compile(r"(?:try again in|retry[- ]after)\D{0,3}(\d+(?:\.\d+)?)\s*(ms|s)?", re.IGNORECASE)
+
+T = TypeVar("T")
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+class TokenBucket:
+    """Async token bucket, tokens refill continuously at rate per second up to capacity"""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _waiters_lock(self) -> asyncio.Lock:
+        # Locks belong to one event loop, the bucket outlives loops in tests and reloads
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in arrival order
+        async with self._waiters_lock():
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def retry_after(e: Exception) -> float | None:
+    """
+    Seconds the provider asked us to wait, None when the error is not worth retrying.
+    Works for BamlClientHttpError and openai's APIStatusError, both carry status_code.
+    """
+    status_code = getattr(e, "status_code", None)
+    if status_code not in RETRYABLE_STATUS_CODES:
+        return None
+    response = getattr(e, "response", None)
+    header = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    match = _RETRY_AFTER_RE.search(str(e))
+    if match:
+        value = float(match.group(1))
+        return value / 1000 if match.group(2) == "ms" else value
+    return 0.0
+
+
+class LLMExecutor:
+    def __init__(self, bucket: TokenBucket | None = None, clock: Callable[[], float] = time.monotonic):
+        self.bucket = bucket or TokenBucket(LLM_RATE_PER_SECOND, LLM_BURST, clock)
+        self._clock = clock
+        self._latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+    async def acquire(self) -> None:
+        """Rate limit a call that is not run by the executor, e.g. a stream"""
+        await self.bucket.acquire()
+
+    def record_latency(self, function: str, seconds: float) -> None:
+        self._latencies[function].append(seconds)
+
+    def p95(self, function: str) -> float | None:
+        samples = sorted(self._latencies[function])
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return samples[math.ceil(0.95 * len(samples)) - 1]
+
+    def hedge_delay(self, function: str) -> float:
+        return self.p95(function) or DEFAULT_HEDGE_DELAY
+
+    async def _timed(self, function: str, call: Callable[[], Awaitable[T]], *, limited: bool = True) -> T:
+        if limited:
+            await self.bucket.acquire()
+        started = self._clock()
+        result = await call()
+        self.record_latency(function, self._clock() - started)
+        return result
+
+    async def _hedged(self, function: str, call: Callable[[], Awaitable[T]]) -> T:
+        primary = asyncio.ensure_future(self._timed(function, call))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay(function))
+            # The hedge is only sent when the bucket has room for it, hedging must not add to a backlog
+            if not done and self.bucket.try_acquire():
+                logger.info(f"Hedging {function} after {self.hedge_delay(function):.1f}s")
+                pending.add(asyncio.ensure_future(self._timed(function, call, limited=False)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run(self, function: str, call: Callable[[], Awaitable[T]], *,
+                  deadline: float | None = DEFAULT_DEADLINE_SECONDS, hedge: bool = False) -> T:
+        """
+        Run call() under the shared rate limit within deadline seconds (None for no deadline).
+        Retryable provider errors are retried after their retry-after delay while the deadline allows it.
+        hedge: send a second request after the p95 latency, only for idempotent calls.
+        """
+        expires_at = None if deadline is None else self._clock() + deadline
+        attempt = 0
+        while True:
+            remaining = None if expires_at is None else expires_at - self._clock()
+            timeout = asyncio.timeout(remaining)
+            try:
+                async with timeout:
+                    if hedge:
+                        return await self._hedged(function, call)
+                    return await self._timed(function, call)
+            except TimeoutError as e:
+                if timeout.expired():
+                    raise LLMDeadlineExceeded(f"{function} did not finish within {deadline}s") from e
+                raise
+            except Exception as e:
+                delay = retry_after(e)
+                if delay is None or attempt == MAX_RETRIES:
+                    raise
+                delay = min(MAX_RETRY_DELAY, max(delay, RETRY_BASE_DELAY * 2 ** attempt))
+                if expires_at is not None and self._clock() + delay >= expires_at:
+                    raise
+                logger.warning(f"{function} failed with {e.status_code}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+llm_executor = LLMExecutor()
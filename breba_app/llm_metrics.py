@@ -0,0 +1,267 @@
+"""
+Latency, token and retry metrics for BAML function calls.
+
+instrument(b) wraps a generated BAML async client: every function call (and every stream) gets its own
+baml Collector, and when it finishes the time to first token, total duration, input/output tokens, the client
+that answered and the number of retries are recorded per function and per client. Token usage is also
+accumulated per product for cost accounting; usage_scope() tells the metrics which product the calls belong to.
+"""
+import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+from baml_py import Collector
+from langchain_core.messages import UsageMetadata
+from langchain_core.messages.ai import add_usage
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (250, 500, 1_000, 2_000, 5_000, 10_000, 20_000, 40_000, 60_000, 120_000)
+
+# (user_name, product_id) of the calls made in the current context
+_usage_owner: ContextVar[tuple[str, str] | None] = ContextVar("llm_usage_owner", default=None)
+
+
+@dataclass(frozen=True)
+class CallRecord:
+    function: str
+    client: str
+    duration_ms: float
+    ttft_ms: float | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    retries: int = 0
+    failed: bool = False
+
+
+@dataclass
+class LatencyHistogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th quantile, inf when it falls in the last bucket"""
+        if not self.total:
+            return None
+        rank, seen = q * self.total, 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float("inf")
+        return float("inf")
+
+
+@dataclass
+class FunctionStats:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    ttft: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def cached_ratio(self) -> float | None:
+        """Share of the input tokens the provider served from its prompt cache"""
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else None
+
+
+class LLMMetrics:
+    def __init__(self):
+        # Keyed by (function, client)
+        self.stats: dict[tuple[str, str], FunctionStats] = defaultdict(FunctionStats)
+        # Keyed by (user_name, product_id), then by client
+        self._usage: dict[tuple[str, str], dict[str, UsageMetadata]] = defaultdict(dict)
+        self.listeners: list[Callable[[CallRecord, tuple[str, str] | None], None]] = []
+
+    def record(self, record: CallRecord) -> None:
+        stats = self.stats[(record.function, record.client)]
+        stats.calls += 1
+        stats.failures += record.failed
+        stats.retries += record.retries
+        stats.input_tokens += record.input_tokens
+        stats.output_tokens += record.output_tokens
+        stats.cached_input_tokens += record.cached_input_tokens
+        stats.duration.observe(record.duration_ms)
+        if record.ttft_ms is not None:
+            stats.ttft.observe(record.ttft_ms)
+
+        owner = _usage_owner.get()
+        if owner is not None and (record.input_tokens or record.output_tokens):
+            usage = UsageMetadata(input_tokens=record.input_tokens, output_tokens=record.output_tokens,
+                                  total_tokens=record.input_tokens + record.output_tokens,
+                                  input_token_details={"cache_read": record.cached_input_tokens})
+            self._usage[owner][record.client] = add_usage(self._usage[owner].get(record.client), usage)
+        for listener in self.listeners:
+            listener(record, owner)
+
+        logger.info(f"{record.function} on {record.client}: {record.duration_ms:.0f} ms"
+                    + (f", first token {record.ttft_ms:.0f} ms" if record.ttft_ms is not None else "")
+                    + f", {record.input_tokens} in ({record.cached_input_tokens} cached) / {record.output_tokens} out tokens"
+                    + f", {record.retries} retries"
+                    + (" (failed)" if record.failed else ""))
+
+    def take_usage(self, user_name: str, product_id: str) -> dict[str, UsageMetadata]:
+        """Token usage per client accumulated for the product since the last call"""
+        return self._usage.pop((user_name, product_id), {})
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """p50/p95 duration and ttft, token totals, cached input ratio and retries per "function/client" """
+        summary = {}
+        for (function, client), stats in sorted(self.stats.items()):
+            summary[f"{function}/{client}"] = {
+                "calls": stats.calls, "failures": stats.failures, "retries": stats.retries,
+                "input_tokens": stats.input_tokens, "output_tokens": stats.output_tokens,
+                "cached_input_tokens": stats.cached_input_tokens, "cached_ratio": stats.cached_ratio,
+                "p50_ms": stats.duration.quantile(0.5), "p95_ms": stats.duration.quantile(0.95),
+                "ttft_p50_ms": stats.ttft.quantile(0.5), "ttft_p95_ms": stats.ttft.quantile(0.95),
+            }
+        return summary
+
+    def clear(self) -> None:
+        self.stats.clear()
+        self._usage.clear()
+
+
+llm_metrics = LLMMetrics()
+
+
+@contextmanager
+def usage_scope(user_name: str, product_id: str):
+    """Attribute the LLM calls made inside (including tasks started inside) to a product"""
+    token = _usage_owner.set((user_name, product_id))
+    try:
+        yield
+    finally:
+        _usage_owner.reset(token)
+
+
+def _call_record(function: str, collector: Collector, duration_ms: float, ttft_ms: float | None,
+                 failed: bool) -> CallRecord:
+    log = collector.last
+    if log is None:
+        return CallRecord(function=function, client="unknown", duration_ms=duration_ms, ttft_ms=ttft_ms, failed=failed)
+    call = log.selected_call or (log.calls[-1] if log.calls else None)
+    usage = log.usage
+    return CallRecord(function=function, client=call.client_name if call else "unknown",
+                      duration_ms=duration_ms, ttft_ms=ttft_ms,
+                      input_tokens=(usage.input_tokens or 0) if usage else 0,
+                      output_tokens=(usage.output_tokens or 0) if usage else 0,
+                      cached_input_tokens=(usage.cached_input_tokens or 0) if usage else 0,
+                      retries=max(0, len(log.calls) - 1), failed=failed)
+
+
+def _with_collector(baml_options: dict | None, collector: Collector) -> dict:
+    options = dict(baml_options or {})
+    existing = options.get("collector")
+    if existing is None:
+        options["collector"] = collector
+    else:
+        options["collector"] = (existing if isinstance(existing, list) else [existing]) + [collector]
+    return options
+
+
+class _InstrumentedStream:
+    """BamlStream proxy that records the first partial result and the final response"""
+
+    def __init__(self, function: str, stream, collector: Collector, metrics: LLMMetrics):
+        self._function = function
+        self._stream = stream
+        self._collector = collector
+        self._metrics = metrics
+        self._started = time.perf_counter()
+        self._ttft_ms: float | None = None
+        self._recorded = False
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def _record(self, failed: bool) -> None:
+        if not self._recorded:
+            self._recorded = True
+            self._metrics.record(_call_record(self._function, self._collector, self._elapsed_ms(), self._ttft_ms,
+                                              failed))
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for partial in self._stream:
+            if self._ttft_ms is None:
+                self._ttft_ms = self._elapsed_ms()
+            yield partial
+
+    async def get_final_response(self):
+        try:
+            response = await self._stream.get_final_response()
+        except Exception:
+            self._record(failed=True)
+            raise
+        self._record(failed=False)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _InstrumentedStreamClient:
+    def __init__(self, stream_client, metrics: LLMMetrics):
+        self._stream_client = stream_client
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        function = getattr(self._stream_client, name)
+        # Generated BAML functions are PascalCase, everything else is passed through
+        if not name[:1].isupper():
+            return function
+
+        def stream(*args, baml_options: dict | None = None, **kwargs):
+            collector = Collector(name=name)
+            return _InstrumentedStream(name, function(*args, baml_options=_with_collector(baml_options, collector),
+                                                      **kwargs), collector, self._metrics)
+
+        return stream
+
+
+class InstrumentedBamlClient:
+    """Drop-in wrapper of a generated BamlAsyncClient that records metrics for every function call"""
+
+    def __init__(self, client, metrics: LLMMetrics | None = None):
+        self._client = client
+        self._metrics = metrics if metrics is not None else llm_metrics
+        self.stream = _InstrumentedStreamClient(client.stream, self._metrics)
+
+    def __getattr__(self, name):
+        function = getattr(self._client, name)
+        if not name[:1].isupper():
+            return function
+
+        async def call(*args, baml_options: dict | None = None, **kwargs):
+            collector = Collector(name=name)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await function(*args, baml_options=_with_collector(baml_options, collector), **kwargs)
+                failed = False
+                return result
+            finally:
+                self._metrics.record(_call_record(name, collector, (time.perf_counter() - started) * 1000, None,
+                                                  failed))
+
+        return call
+
+
+def instrument(client, metrics: LLMMetrics | None = None) -> InstrumentedBamlClient:
+    return InstrumentedBamlClient(client, metrics)
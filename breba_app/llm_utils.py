@@ -4,10 +4,27 @@ from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 from openai import AsyncOpenAI
 
-client = AsyncOpenAI()
+from breba_app.llm_cache import cached_llm_call
+from breba_app.llm_executor import llm_executor
+
+# Retries are left to llm_executor, the SDK's own retries would multiply its attempts
+client = AsyncOpenAI(max_retries=0)
 
 logger = logging.getLogger(__name__)
 
+PRODUCT_NAME_MODEL = "gpt-5-nano"
+PRODUCT_NAME_DEADLINE_SECONDS = 20.0
+
+
+@cached_llm_call("get_product_name", client=PRODUCT_NAME_MODEL)
+async def _generate_product_name(prompt: str) -> str:
+    response = await llm_executor.run(
+        "get_product_name",
+        lambda: client.responses.create(model=PRODUCT_NAME_MODEL, input=prompt, reasoning={"effort": "minimal"},
+                                        text={"verbosity": "low"}),
+        deadline=PRODUCT_NAME_DEADLINE_SECONDS, hedge=True)
+    return response.output_text
+
 
 async def get_product_name(description: str) -> str:
     if not description:
@@ -19,10 +36,7 @@ async def get_product_name(description: str) -> str:
         f"**Your response must be a one to three words long description of the product above.**")
 
     try:
-        response = await client.responses.create(model="gpt-5-nano", input=prompt,
-                                                 reasoning={"effort": "minimal"},
-                                                 text={"verbosity": "low"})
-        return response.output_text
+        return await _generate_product_name(prompt)
     except Exception as e:
         logger.error(f"Product name generation failed: {e}")
         # This is not a critical function. Just return the first word of the description
@@ -17,6 +17,7 @@ from starlette.staticfiles import StaticFiles
 
 from breba_app.auth import change_password
 from breba_app.config import init_db
+from breba_app.controllers.usage_controller import usage_accumulator
 from breba_app.paths import app_path, templates
 
 logging.basicConfig(level=logging.INFO, )
@@ -29,7 +30,9 @@ PORT = int(os.environ.get("PORT", "8080"))
 @asynccontextmanager
 async def lifespan(app):
     await init_db()
+    usage_accumulator.start()
     yield
+    await usage_accumulator.stop()
 
 
 app = FastAPI(lifespan=lifespan)
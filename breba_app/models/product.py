@@ -16,6 +16,8 @@ class Product(Document):
     user: Link[User]
     active: bool = False
     cost: float = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
     created_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.now(datetime.UTC))
 
     # Back-reference to deployments
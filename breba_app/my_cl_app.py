@@ -12,17 +12,19 @@ from chainlit import Message
 import breba_app.ui_bus as ui_bus
 from auth import verify_password
 from breba_app.controllers.product_controller import delete_product, rename_product
+from breba_app.delta_stream import stream_to_message
 from breba_app.config import SPEC_FILE_NAME, INDEX_FILE_NAME
 from breba_app.events.bus import HandleContext, Consumer, event_bus
 from breba_app.events.coder_completed import CoderCompleted
 from breba_app.filesystem import InMemoryFileStore, FileWrite
+from breba_app.filesystem.versioned_r2 import VersionedFileSystemError
 from breba_app.models.deployment import Deployment
 from breba_app.models.product import Product, create_or_update_product_for, create_blank_product_for, set_product_active
 from breba_app.models.user import User
 from breba_app.orchestrator import handle_user_message, save_state, OrchestratorState, start_product, \
     handle_file_upload, init_orchestrator
 from breba_app.storage import has_cloud_storage, list_versions, get_active_version, set_version_active, \
-    read_all_files_in_memory, save_files, get_index_html_path
+    read_all_files_in_memory, save_files, get_index_html_path, diff_versions
 from breba_app.template_agent.product_types.landing_page import landing_page_instructions, \
     landing_page_follow_up_questions
 from breba_app.ui_bus import update_products_list, update_versions_list, update_follow_up_questions_list
@@ -49,17 +51,25 @@ class ProductNameAssignmentConsumer(Consumer):
         await ctx.unsubscribe_self()
 
 
+def parse_version(value) -> int | None:
+    """Version number sent by the UI, None when it is missing or not a non-negative integer"""
+    if isinstance(value, bool):
+        return None
+    try:
+        version = int(value)
+    except (TypeError, ValueError):
+        return None
+    return version if version >= 0 else None
+
+
 async def ask_user_streaming(token_stream: AsyncIterator[str] | str):
     if isinstance(token_stream, str):
         msg = cl.Message(content=token_stream)
     else:
         msg = cl.Message(content="")
 
-        # Stream each token into it as they arrive
-        async for chunk in token_stream:
-            if not chunk:
-                continue
-            await msg.stream_token(chunk, is_sequence=True)
+        # The chunks are the whole response so far, only the new text is sent
+        await stream_to_message(msg, token_stream)
 
     # Send the fully streamed message once complete
     if msg.content:
@@ -249,6 +259,24 @@ async def window_message(message: str | dict):
         await build_preview(product_id, filestore)
         # To avoid race condition, we want to wait for the preview to build, before reloading product
         await cl.send_window_message({"method": "reload_product"})
+    elif method == "diff_versions":
+        body = message.get("body")
+        body = body if isinstance(body, dict) else {}
+        from_version = parse_version(body.get("from"))
+        # Compare against the active version unless the UI asks for a specific one
+        if body.get("to") is None:
+            to_version = await get_active_version(user_name, product_id)
+        else:
+            to_version = parse_version(body.get("to"))
+        if from_version is None or to_version is None:
+            await ui_bus.send_version_diff_error(
+                f"Cannot compare versions {body.get('from')!r} and {body.get('to')!r}, expected version numbers")
+        else:
+            try:
+                diffs = await diff_versions(user_name, product_id, from_version, to_version)
+                await ui_bus.send_version_diff(from_version, to_version, diffs)
+            except VersionedFileSystemError as e:
+                await ui_bus.send_version_diff_error(str(e))
     else:
         # TODO: remove this, it is replaced by the "ask_user" function callback
         await cl.Message(content=message).send()
@@ -1,36 +1,75 @@
 import asyncio
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import AsyncIterator
+from typing import AsyncIterator, Callable
 
 from baml_py import BamlStream
 
-from breba_app.coder_agent.agent import stream_user_response_or_coder, run_coder_agent, generate_executive_summary
+from breba_app.coder_agent.agent import stream_user_response_or_coder, run_coder_agent, generate_executive_summary, \
+    read_files_to_edit, run_scaffold_agent, run_quick_edit
 from breba_app.coder_agent.baml_client.stream_types import Coder as CoderStream, ResponseToUser as ResponseToUserStream
 from breba_app.coder_agent.baml_client.types import LLMMessage, Coder, ResponseToUser
+from breba_app.coder_agent.live_preview import LivePreview
 from breba_app.config import INDEX_FILE_NAME
+from breba_app.context_budget import ContextWindow, budget_for, count_tokens, truncate_message
 from breba_app.controllers.product_controller import set_product_executive_summary
+from breba_app.controllers.usage_controller import report_usage
 from breba_app.events import event_bus
 from breba_app.events.before_handoff_to_coder import BeforeHandoffToCoder
 from breba_app.events.bus import Consumer, HandleContext
 from breba_app.filesystem import InMemoryFileStore
+from breba_app.llm_metrics import llm_metrics, usage_scope
 from breba_app.models.product import Product
 from breba_app.status_service import agent_task, update_status
-from breba_app.storage import read_all_files_in_memory
+from breba_app.storage import read_all_files_in_memory, list_file_assets
 from breba_app.template_agent.agent import TemplateAgent
 from breba_app.template_agent.baml_client.types import WebsiteSpecification
 from breba_app.tools.upload_files import upload_file
+from breba_app.ui_bus import send_preview_patch, end_preview_patches
 
 logger = logging.getLogger(__name__)
 
+# Functions whose history budget a new chat message has to fit into
+CHAT_FUNCTIONS = ("UserResponseOrCoder", "CoderAgent")
+MESSAGE_TOO_LARGE_MSG = ("Your message is too long for me to work with. Please shorten it, or split it into "
+                         "several messages.")
+
 
 @dataclass
 class OrchestratorState:
     messages: list[LLMMessage]
     executive_summary: str
     filestore: InMemoryFileStore
+    context: ContextWindow = field(default_factory=ContextWindow)
+
+    def fit_messages(self, function: str) -> list[LLMMessage]:
+        """
+        Recent messages within the function's token budget, older turns are replaced by the executive summary.
+        Never empty: a latest message that does not fit on its own is truncated.
+        """
+        messages = self.context.fit(self.messages, function, summary=self.executive_summary)
+        if not messages and self.messages:
+            logger.warning(f"{function} context: the latest message does not fit the budget, truncating it")
+            messages = [truncate_message(self.messages[-1], budget_for(function))]
+        return messages
+
+    def fit_spec_handoff(self, function: str) -> list[LLMMessage]:
+        """
+        fit_messages for the hand-off of a new specification (the last three messages: the request, the spec and
+        the instruction to build it). A spec over the budget would be evicted with the request, it is cut down
+        instead so the coder always gets it.
+        """
+        messages = self.fit_messages(function)
+        request, spec, handoff = self.messages[-3:]
+        if len(messages) >= 2 and messages[-2].content == spec.content:
+            return messages
+        logger.warning(f"{function} context: the specification does not fit the budget, truncating it")
+        budget = budget_for(function)
+        request = truncate_message(request, budget // 4)
+        spec = truncate_message(spec, budget - count_tokens(request) - count_tokens(handoff))
+        return [request, spec, handoff]
 
 
 # Keyed by (user_name, product_id)
@@ -78,10 +117,25 @@ def save_state(user_name: str, product_id: str, state: OrchestratorState) -> Non
     _state_store[(user_name, product_id)] = state
 
 
-async def baml_stream_and_collect_user_response(stream: BamlStream, stream_receiver) -> str:
+async def _run_coder_with_preview(messages: list[LLMMessage], file_store: InMemoryFileStore,
+                                  files_to_edit: tuple[str, set[str]] | None = None) -> LLMMessage:
+    """run_coder_agent with its edits pushed to the preview while they are generated"""
+    preview = LivePreview(send_preview_patch, end_preview_patches)
+    try:
+        return await run_coder_agent(messages=messages, filestore=file_store, files_to_edit=files_to_edit,
+                                     preview=preview)
+    finally:
+        # The final state goes out before coder_completed rebuilds and reloads the real preview
+        await preview.close(file_store)
+
+
+async def baml_stream_and_collect_user_response(stream: BamlStream, stream_receiver,
+                                                on_coder: Callable[[], None] | None = None) -> str:
     async def gen() -> AsyncIterator[str]:
         async for msg in stream:
             if type(msg) is CoderStream:
+                if on_coder and msg.invoke_coder:
+                    on_coder()
                 update_status("Coder is writing the code...")
                 # ignore coder messages because we don't want to stream them
                 continue
@@ -96,6 +150,17 @@ async def baml_stream_and_collect_user_response(stream: BamlStream, stream_recei
     return await stream.get_final_response()
 
 
+async def _discard_speculation(task: asyncio.Task) -> None:
+    """
+    Cancel the speculative file selection when it is still running (the speculation was wrong or something failed)
+    and wait for it, so that its failure is logged here instead of as a task exception that was never retrieved
+    """
+    task.cancel()
+    await asyncio.wait([task])
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Speculative file selection failed: {task.exception()}")
+
+
 @agent_task
 async def edit_product(user_name: str, product_id: str, message: str,
                        coder_completed_callback,
@@ -104,22 +169,60 @@ async def edit_product(user_name: str, product_id: str, message: str,
     orchestrator_state = load_state(user_name, product_id)
     file_store = orchestrator_state.filestore
     update_status("Thinking...")
-    orchestrator_state.messages.append(LLMMessage(role="user", content=message))
-    response = await stream_user_response_or_coder(messages=orchestrator_state.messages, filestore=file_store)
-
-    final_response = await baml_stream_and_collect_user_response(response, stream_to_user_callback)
-    if isinstance(final_response, Coder):
+    user_message = LLMMessage(role="user", content=message)
+    if any(count_tokens(user_message) > budget_for(function) for function in CHAT_FUNCTIONS):
+        # Editing the site from a truncated request would do the wrong thing, the user is asked to shorten it
+        await stream_to_user_callback(MESSAGE_TOO_LARGE_MSG)
+        update_status("Waiting for a shorter message")
+        return
+    orchestrator_state.messages.append(user_message)
+
+    # Trivial edits (change the title, make the button blue, ...) skip the chat router and the coder entirely
+    quick_edit = run_quick_edit(request=message, filestore=file_store)
+    if quick_edit is not None:
+        applied, coder_response = quick_edit
+        await stream_to_user_callback(applied.summary)
         await event_bus.emit(
             BeforeHandoffToCoder(user_name=user_name, product_id=product_id, messages=orchestrator_state.messages,
                                  executive_summary=orchestrator_state.executive_summary))
-        coder_response = await run_coder_agent(messages=orchestrator_state.messages, filestore=file_store)
         orchestrator_state.messages.append(LLMMessage(role="assistant", content=coder_response.content))
         await coder_completed_callback(user_name, product_id, file_store)
         update_status("The website is ready to be deployed. Use the 🚀 from the sidebar to deploy your website")
-    elif isinstance(final_response, ResponseToUser):
-        orchestrator_state.messages.append(LLMMessage(role="assistant", content=final_response.response_to_user))
-    else:
-        raise ValueError("Unexpected response type")
+        return
+
+    coder_messages = orchestrator_state.fit_messages("CoderAgent")
+    response = await stream_user_response_or_coder(messages=orchestrator_state.fit_messages("UserResponseOrCoder"),
+                                                   filestore=file_store)
+
+    # File selection starts speculatively as soon as the stream leans towards the coder,
+    # so it overlaps with the rest of the UserResponseOrCoder stream
+    files_to_edit_task: asyncio.Task | None = None
+
+    def start_files_to_edit():
+        nonlocal files_to_edit_task
+        if files_to_edit_task is None:
+            files_to_edit_task = asyncio.create_task(
+                read_files_to_edit(original_context=coder_messages, filestore=file_store))
+
+    try:
+        final_response = await baml_stream_and_collect_user_response(response, stream_to_user_callback,
+                                                                     on_coder=start_files_to_edit)
+        if isinstance(final_response, Coder):
+            await event_bus.emit(
+                BeforeHandoffToCoder(user_name=user_name, product_id=product_id, messages=orchestrator_state.messages,
+                                     executive_summary=orchestrator_state.executive_summary))
+            files_to_edit = await files_to_edit_task if files_to_edit_task else None
+            coder_response = await _run_coder_with_preview(coder_messages, file_store, files_to_edit)
+            orchestrator_state.messages.append(LLMMessage(role="assistant", content=coder_response.content))
+            await coder_completed_callback(user_name, product_id, file_store)
+            update_status("The website is ready to be deployed. Use the 🚀 from the sidebar to deploy your website")
+        elif isinstance(final_response, ResponseToUser):
+            orchestrator_state.messages.append(LLMMessage(role="assistant", content=final_response.response_to_user))
+        else:
+            raise ValueError("Unexpected response type")
+    finally:
+        if files_to_edit_task is not None:
+            await _discard_speculation(files_to_edit_task)
 
 
 @agent_task
@@ -144,7 +247,14 @@ async def start_product(user_name: str, product_id: str, message: str,
             BeforeHandoffToCoder(user_name=user_name, product_id=product_id, messages=orchestrator_state.messages,
                                  executive_summary=orchestrator_state.executive_summary)
         )
-        coder_response = await run_coder_agent(messages=orchestrator_state.messages, filestore=file_store)
+        coder_response = None
+        if not file_store.file_exists(INDEX_FILE_NAME):
+            # Brand-new site: build the sections in parallel, with the files the user uploaded so far
+            assets = await list_file_assets(user_name, product_id)
+            coder_response = await run_scaffold_agent(spec=new_spec, filestore=file_store, assets=assets)
+        if coder_response is None:
+            coder_response = await _run_coder_with_preview(orchestrator_state.fit_spec_handoff("CoderAgent"),
+                                                           file_store)
         orchestrator_state.messages.append(LLMMessage(role="assistant", content=coder_response.content))
         await coder_completed_callback(user_name, product_id, file_store)
 
@@ -155,10 +265,16 @@ async def handle_user_message(user_name: str, product_id: str, message: str,
                               coder_completed_callback, stream_to_user_callback):
     orchestrator_state = load_state(user_name, product_id)
     file_store = orchestrator_state.filestore
-    if file_store.file_exists(INDEX_FILE_NAME):
-        await edit_product(user_name, product_id, message, coder_completed_callback, stream_to_user_callback)
-    else:
-        await start_product(user_name, product_id, message, coder_completed_callback, stream_to_user_callback)
+    try:
+        # Token usage of every LLM call made for this message is charged to the product
+        with usage_scope(user_name, product_id):
+            if file_store.file_exists(INDEX_FILE_NAME):
+                await edit_product(user_name, product_id, message, coder_completed_callback, stream_to_user_callback)
+            else:
+                await start_product(user_name, product_id, message, coder_completed_callback,
+                                    stream_to_user_callback)
+    finally:
+        report_usage(user_name, product_id, llm_metrics.take_usage(user_name, product_id))
 
 
 @agent_task
@@ -24,3 +24,38 @@ doc.addEventListener('mouseup', () => {
 doc.addEventListener('mousedown', () => {
     window.parent.postMessage({method: "preview_mousedown"}, "*")
 });
+
+// Live preview: the builder sends the partial states of the files the coder is editing
+function sameFile(url, path) {
+    return new URL(url, doc.baseURI).pathname.endsWith('/' + path);
+}
+
+function applyStylesheetPatch(path, content) {
+    const link = Array.from(doc.querySelectorAll('link[rel="stylesheet"]')).find(l => sameFile(l.href, path));
+    if (!link) return;
+    let style = Array.from(doc.querySelectorAll('style[data-breba-live]')).find(s => s.dataset.brebaLive === path);
+    if (!style) {
+        style = doc.createElement('style');
+        style.dataset.brebaLive = path;
+        link.after(style);
+    }
+    style.textContent = content;
+    link.disabled = true;
+}
+
+function applyPagePatch(content) {
+    const next = new DOMParser().parseFromString(content, 'text/html');
+    doc.title = next.title;
+    // Scripts of the partial page are not run, the real page is reloaded once the coder is done
+    doc.body.replaceChildren(...Array.from(next.body.childNodes).map(node => doc.importNode(node, true)));
+}
+
+win.addEventListener('message', (event) => {
+    if (event.source !== win.parent || !event.data || event.data.method !== 'preview_patch') return;
+    const {path, content} = event.data;
+    if (path.toLowerCase().endsWith('.css')) {
+        applyStylesheetPatch(path, content);
+    } else {
+        applyPagePatch(content);
+    }
+});
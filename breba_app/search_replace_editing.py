@@ -1,6 +1,7 @@
 import difflib
 import logging
 import re
+from collections.abc import MutableMapping
 from dataclasses import dataclass
 from difflib import SequenceMatcher
 from pathlib import Path
@@ -32,12 +33,21 @@ class EditRequest:
     replace: str
 
 
+@dataclass
+class FailedEdit:
+    edit: EditRequest
+    message: str
+    # [start, end) lines of the closest match in the file content the edit was applied to, if any
+    region: tuple[int, int] | None = None
+
+
 class ApplyEditsError(Exception):
-    def __init__(self, message, failed, passed, updated_edits):
+    def __init__(self, message, failed, passed, updated_edits, failed_edits=None):
         super().__init__(message)
         self.failed = failed
         self.passed = passed
         self.updated_edits = updated_edits
+        self.failed_edits: list[FailedEdit] = failed_edits or []
 
 
 def strip_filename(filename, fence):
@@ -479,36 +489,57 @@ def do_replace(content, before_text, after_text):
     return new_content
 
 
-def find_similar_lines(search_lines, content_lines, threshold=0.6):
+def find_similar_region(search_lines, content_lines, threshold=0.6) -> tuple[int, int] | None:
+    """[start, end) line range of the chunk of content most similar to the search lines, None below threshold"""
     search_lines = search_lines.splitlines()
     content_lines = content_lines.splitlines()
 
     best_ratio = 0
-    best_match = None
+    best_match_i = None
 
     for i in range(len(content_lines) - len(search_lines) + 1):
         chunk = content_lines[i: i + len(search_lines)]
         ratio = SequenceMatcher(None, search_lines, chunk).ratio()
         if ratio > best_ratio:
             best_ratio = ratio
-            best_match = chunk
             best_match_i = i
 
-    if best_ratio < threshold:
-        return ""
+    if best_ratio < threshold or best_match_i is None:
+        return None
+
+    return best_match_i, best_match_i + len(search_lines)
+
+
+def _similar_lines(search_lines, content_lines, region: tuple[int, int]) -> str:
+    search_lines = search_lines.splitlines()
+    content_lines = content_lines.splitlines()
+    best_match_i, best_match_end = region
+    best_match = content_lines[best_match_i:best_match_end]
 
     if best_match[0] == search_lines[0] and best_match[-1] == search_lines[-1]:
         return "\n".join(best_match)
 
     N = 5
-    best_match_end = min(len(content_lines), best_match_i + len(search_lines) + N)
+    best_match_end = min(len(content_lines), best_match_end + N)
     best_match_i = max(0, best_match_i - N)
 
     best = content_lines[best_match_i:best_match_end]
     return "\n".join(best)
 
 
+def find_similar_lines(search_lines, content_lines, threshold=0.6):
+    region = find_similar_region(search_lines, content_lines, threshold)
+    if region is None:
+        return ""
+    return _similar_lines(search_lines, content_lines, region)
+
+
 def default_failed_match_message(edit: EditRequest, content: str, fence=DEFAULT_FENCE) -> str:
+    return _failed_match_message(edit, content, find_similar_region(edit.search, content), fence)
+
+
+def _failed_match_message(edit: EditRequest, content: str, region: tuple[int, int] | None,
+                          fence=DEFAULT_FENCE) -> str:
     error_message = f"""
 ## SearchReplaceNoExactMatch: This SEARCH block failed to exactly match lines in
 {edit.path}
@@ -516,7 +547,7 @@ def default_failed_match_message(edit: EditRequest, content: str, fence=DEFAULT_
 {edit.search}{DIVIDER_ERR}
 {edit.replace}{UPDATED_ERR}
 """
-    did_you_mean = find_similar_lines(edit.search, content)
+    did_you_mean = _similar_lines(edit.search, content, region) if region else ""
     if did_you_mean:
         error_message += f"""Did you mean to match some of these actual lines from {edit.path}?
 {fence[0]}
@@ -530,11 +561,12 @@ def default_failed_match_message(edit: EditRequest, content: str, fence=DEFAULT_
     return error_message
 
 
-def apply_edits_many(files: dict[str, str], edits: list[EditRequest], fence=DEFAULT_FENCE) -> list[EditRequest]:
+def apply_edits_many(files: MutableMapping[str, str], edits: list[EditRequest], fence=DEFAULT_FENCE) -> list[EditRequest]:
     if not edits:
         raise ValueError("No edits found")
 
     failed = []
+    failed_edits = []
     passed = []
     updated_edits = []
 
@@ -549,17 +581,21 @@ def apply_edits_many(files: dict[str, str], edits: list[EditRequest], fence=DEFA
                     passed.append(edit)
                 else:
                     logger.error(f"Failed to match {edit.search} in {content}")
-                    error_message = default_failed_match_message(edit, content)
+                    region = find_similar_region(edit.search, content)
+                    error_message = _failed_match_message(edit, content, region)
                     failed.append(error_message)
+                    failed_edits.append(FailedEdit(edit, error_message, region))
             except KeyError as e:
                 failed.append(f"File not found: {edit.path}")
+                failed_edits.append(FailedEdit(edit, failed[-1]))
             except ValueError as e:
                 failed.append(f"{e}")
+                failed_edits.append(FailedEdit(edit, failed[-1]))
 
         else:
             # For new files or when appending we simply don't have a search block
             if edit.replace:
-                if edit.path in files.keys():
+                if edit.path in files:
                     # appending to file
                     files[edit.path] = files[edit.path] + edit.replace
                 else:
@@ -595,10 +631,11 @@ Just reply with fixed versions of the {blocks} above that failed to match. You M
         failed=failed,
         passed=passed,
         updated_edits=updated_edits,
+        failed_edits=failed_edits,
     )
 
 
-def apply_search_replace_many(files: dict[str, str], search_replace_text: str) -> list[str]:
+def apply_search_replace_many(files: MutableMapping[str, str], search_replace_text: str) -> list[str]:
     """
     This method is used to apply search and replace blocks to many files
     :param files: list of files that need to change
@@ -12,6 +12,8 @@ from chainlit.message import MessageBase
 from breba_app.ui_bus import signal_task_started, signal_task_completed
 
 DONE = "Done"
+# Statuses are rendered at most once per frame
+STATUS_FRAME_SECONDS = 0.1
 
 logger = logging.getLogger(__name__)
 
@@ -37,61 +39,54 @@ class Task:
             message = NullMessage()
 
         self.msg = message
-        self.action_queue = asyncio.Queue()
-        self._drain_lock = asyncio.Lock()
+        # Latest status that is not rendered yet, older ones are dropped
+        self.pending_status: str | None = None
+        self.render_task: asyncio.Task | None = None
 
 
 _current_task: ContextVar[Task | None] = ContextVar(
     "agent_task", default=None
 )
 
+# Keeps the background status tasks referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
 
-async def _drain_queue(task: Task):
-    """
-    Ensure only ONE drain loop runs per Task at a time.
-    """
-    if task._drain_lock.locked():
-        return
 
-    async with task._drain_lock:
-        while not task.action_queue.empty():
-            action = await task.action_queue.get()
-            try:
-                await action
-            finally:
-                task.action_queue.task_done()
+def _in_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
-def _execute(coro):
-    task = _current_task.get()
-    if task is None:
-        raise Exception("Not in task context")
-
-    # do not await to avoid race condition
-    task.action_queue.put_nowait(coro)
-    asyncio.create_task(_drain_queue(task))
-
-
-async def _status_stream(message: cl.Message, status: str):
-    tokens = status.split()
-    status_chunk = ""
-    for token in tokens:
-        status_chunk += token + " "
-        await message.stream_token(status_chunk, is_sequence=True)
-        await asyncio.sleep(0.1)
+async def _render_statuses(task: Task):
+    """
+    Render the latest status at most once per frame, until no newer status arrives.
+    A status superseded within a frame is never shown.
+    """
+    while task.pending_status is not None:
+        status, task.pending_status = task.pending_status, None
+        try:
+            await task.msg.stream_token(status, is_sequence=True)
+        except Exception:
+            logger.exception("Failed to render status")
+        await asyncio.sleep(STATUS_FRAME_SECONDS)
+    task.render_task = None
 
 
 def update_status(status: str):
     """
     Update the status of the CURRENT running task.
-    Automatically creates a thinking message on first call.
+    Automatically creates a thinking message on first call. Never waits for the UI.
     """
     task = _current_task.get()
 
     if task is None:
         raise Exception("Not in task context")
 
-    _execute(_status_stream(task.msg, status))
+    task.pending_status = status
+    if task.render_task is None:
+        task.render_task = _in_background(_render_statuses(task))
 
 
 @cl.action_callback("cancel_task")  # Optional: allow user to cancel
@@ -105,17 +100,23 @@ def task_started():
     asyncio.create_task(signal_task_started())
 
 
+async def _finish_statuses(task: Task):
+    if task.render_task is not None:
+        # Renders the latest status, if it was not rendered yet
+        await task.render_task
+    # Only finalize message if status updates actually happened
+    if task.msg.content:
+        await task.msg.send()
+
+
 async def task_completed():
     task = _current_task.get()
     if task is None:
         raise Exception("Not in task context")
 
     asyncio.create_task(signal_task_completed())
-    # Only finalize message if status updates actually happened
-    if task.msg.content:
-        _execute(task.msg.send())
-    # Wait for action_queue to drain
-    await task.action_queue.join()
+    # The last status is rendered in the background, completing the task never waits for the UI
+    _in_background(_finish_statuses(task))
 
 
 @asynccontextmanager
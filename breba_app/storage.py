@@ -14,7 +14,7 @@ from dotenv import load_dotenv
 
 from breba_app.config import INDEX_FILE_NAME
 from breba_app.filesystem import InMemoryFileStore, FileWrite, FileStore
-from breba_app.filesystem.versioned_r2 import VersionedR2FileSystem
+from breba_app.filesystem.versioned_r2 import VersionedR2FileSystem, FileDiff
 
 load_dotenv()
 
@@ -75,6 +75,9 @@ class PreviewFileStore(FileStore):
     def file_exists(self, path: str) -> bool:
         raise NotImplementedError("PreviewFileStore is write-only.")
 
+    def size(self, path: str) -> int:
+        raise NotImplementedError("PreviewFileStore is write-only.")
+
     def write_text(self, path: str, content: str) -> None:
         """
         Schedule an async upload of UTF-8 text.
@@ -282,6 +285,15 @@ async def set_version_active(user_name: str, session_id: str, version: int) -> N
     await asyncio.to_thread(filesystem.set_version, version)
 
 
+async def diff_versions(user_name: str, session_id: str, a: int, b: int) -> list[FileDiff]:
+    filesystem = VersionedR2FileSystem(
+        bucket_name=USERS_BUCKET_NAME,
+        root_prefix=f"{user_name}/{session_id}",
+        s3_client=s3_client,
+    )
+    return await asyncio.to_thread(filesystem.diff_versions, a, b)
+
+
 async def save_spec(user_name: str, session_id: str, spec: str) -> None:
     data = spec.encode("utf-8")
     await save_file_versioned(user_name, session_id, "spec.txt", data, "text/plain")
@@ -449,7 +461,10 @@ def format_tree(tree: DirTree, indent=0) -> list[str]:
 
 
 async def list_file_assets(user_name: str, session_id: str) -> str:
+    """Urls and descriptions of the files the user uploaded, empty when there are none"""
     dir_tree = await asyncio.to_thread(list_s3_structured, user_name, session_id, ASSETS_PATH)
+    if not dir_tree:
+        return ""
     dir_url = public_file_url(user_name, session_id, ASSETS_PATH)
     file_list = "\n".join(format_tree(dir_tree))
     return f"{dir_url} contains the following files:\n{file_list}"
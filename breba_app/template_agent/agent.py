@@ -1,19 +1,30 @@
-from typing import AsyncIterable
-
-from langchain_core.messages import trim_messages
-from langchain_core.messages.utils import count_tokens_approximately, convert_to_openai_messages
+from typing import AsyncIterable, Callable
 
+from breba_app.delta_stream import ThrottledDeltaSender
+from breba_app.llm_executor import llm_executor
+from breba_app.llm_metrics import instrument
 from breba_app.status_service import update_status
-from breba_app.template_agent.baml_client.async_client import b
+from breba_app.template_agent.baml_client.async_client import b as baml_client
 from breba_app.template_agent.baml_client.stream_types import Question as StreamQuestion, LLMMessage, \
     WebsiteSpecification as StreamWebSpecification
 from breba_app.template_agent.baml_client.types import WebsiteSpecification, Question
 from breba_app.template_agent.memory_store import load_state, save_state
+from breba_app.ui_bus import send_specification_delta_to_ui
 
 TOKEN_LIMIT = 100_000
+# The builder panel gets the specification while it is written, at most this often
+SPEC_STREAM_INTERVAL_SECONDS = 0.25
+
+b = instrument(baml_client)
 
 
-async def to_user_stream(streamer: AsyncIterable[StreamQuestion | StreamWebSpecification]):
+async def to_user_stream(streamer: AsyncIterable[StreamQuestion | StreamWebSpecification],
+                         on_spec: Callable[[str], None] | None = None):
+    """
+    Questions are streamed to the user. The specification is not, on_spec receives it while it is written
+    (without on_spec the stream stops at the specification).
+    """
+    spec_started = False
     async for msg in streamer:
         if type(msg) is StreamQuestion:
             # For some reason when streaming WebSpecification, the first message is empty question.
@@ -21,8 +32,13 @@ async def to_user_stream(streamer: AsyncIterable[StreamQuestion | StreamWebSpeci
                 continue
             yield msg.question
         if type(msg) is StreamWebSpecification:
-            update_status("Builder is working on the specification...")
-            break
+            if not spec_started:
+                spec_started = True
+                update_status("Builder is working on the specification...")
+            if on_spec is None:
+                break
+            if msg.spec:
+                on_spec(msg.spec)
 
 
 class TemplateAgent:
@@ -35,19 +51,18 @@ class TemplateAgent:
 
     async def build_specification(self, message: str, ask_user_streaming_callback) -> WebsiteSpecification | Question:
         self.state.messages.append(LLMMessage(role="user", content=message))
-        dict_messages = [message.model_dump() for message in self.state.messages]
-        # "human" is the langchain type for "user" role messages
-        trimmed_messages_lc = trim_messages(dict_messages, strategy="last",
-                                            token_counter=count_tokens_approximately, max_tokens=TOKEN_LIMIT,
-                                            start_on=["human"], include_system=True)
-
-        trimmed_messages = convert_to_openai_messages(trimmed_messages_lc)
+        trimmed_messages = self.state.context.fit(self.state.messages, "GenerateSpecificationFromTemplate",
+                                                  budget=TOKEN_LIMIT)
 
         if trimmed_messages:
-            # We are just going to pass a dict that has proper duck type
+            await llm_executor.acquire()
             stream = b.stream.GenerateSpecificationFromTemplate(trimmed_messages)
-            await ask_user_streaming_callback(to_user_stream(stream))
+            spec_sender = ThrottledDeltaSender(send_specification_delta_to_ui, interval=SPEC_STREAM_INTERVAL_SECONDS)
+            await ask_user_streaming_callback(to_user_stream(stream, on_spec=spec_sender.update))
             agent_response = await stream.get_final_response()
+            # The complete specification, whatever the throttling held back
+            await spec_sender.close(agent_response.spec if isinstance(agent_response, WebsiteSpecification)
+                                    else None)
             if isinstance(agent_response, Question):
                 self.state.messages.append(LLMMessage(role="assistant", content=agent_response.question))
             elif isinstance(agent_response, WebsiteSpecification):
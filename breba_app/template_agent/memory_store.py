@@ -1,13 +1,15 @@
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
+from breba_app.context_budget import ContextWindow
 from breba_app.template_agent.baml_client.stream_types import LLMMessage
 
 
 @dataclass
 class TemplateAgentState:
     messages: List[LLMMessage]
+    context: ContextWindow = field(default_factory=ContextWindow)
 
 
 # Keyed by (user_name, product_id)
@@ -2,6 +2,7 @@ import asyncio
 
 import chainlit as cl
 
+from breba_app.filesystem.versioned_r2 import FileDiff
 from breba_app.models.product import Product
 
 
@@ -9,6 +10,11 @@ async def send_specification_to_ui(specification: str):
     await cl.send_window_message({"method": "to_builder", "body": specification})
 
 
+async def send_specification_delta_to_ui(offset: int, text: str):
+    """Partial specification while it is generated, the builder keeps its text up to offset and appends text"""
+    await cl.send_window_message({"method": "to_builder_delta", "body": {"offset": offset, "text": text}})
+
+
 async def send_index_html_to_ui(html: str):
     await cl.send_window_message({"method": "to_generator", "body": html})
     await cl.send_window_message({"method": "to_generator", "body": "__completed__"})
@@ -24,6 +30,14 @@ async def reload_product_preview():
         {"method": "refresh_preview"})
 
 
+async def send_preview_patch(path: str, content: str):
+    await cl.send_window_message({"method": "preview_patch", "body": {"path": path, "content": content}})
+
+
+async def end_preview_patches():
+    await cl.send_window_message({"method": "preview_patches_done"})
+
+
 async def send_index_html_chunk_to_ui(html: str):
     await cl.send_window_message({"method": "to_generator", "body": html})
 
@@ -43,6 +57,16 @@ async def update_versions_list(versions: list[int], active: int):
     await cl.send_window_message({"method": "update_versions_list", "body": {"versions": versions, "active": active}})
 
 
+async def send_version_diff(from_version: int, to_version: int, diffs: list[FileDiff]):
+    files = [{"path": diff.path, "status": diff.status, "diff": diff.diff} for diff in diffs]
+    await cl.send_window_message(
+        {"method": "version_diff", "body": {"from": from_version, "to": to_version, "files": files}})
+
+
+async def send_version_diff_error(error: str):
+    await cl.send_window_message({"method": "version_diff", "body": {"error": error}})
+
+
 async def update_follow_up_questions_list(questions: list[str]):
     await cl.send_window_message({"method": "update_follow_up_questions_list", "body": questions})
 
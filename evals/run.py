@@ -1,15 +1,55 @@
+"""
+Runs the coder eval cases concurrently and reports correctness, latency, LLM calls, tokens and cost per case.
+
+Results go to evals/runs/latest.json and are compared with evals/baseline.json: a case regresses when it used
+to pass and now fails, or when its wall time or cost grew by more than --threshold.
+
+    python -m evals.run                       # run and compare with the baseline, exit 1 on regressions
+    python -m evals.run --concurrency 8       # more cases in flight
+    python -m evals.run --update-baseline     # store this run as the new baseline
+"""
 from __future__ import annotations
 
+import argparse
 import asyncio
 import json
-from dataclasses import dataclass
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Any
 
-from breba_app.coder_agent.agent import run_coder_agent
-from breba_app.filesystem import FileWrite, in_memory_store
+from langchain_core.messages import UsageMetadata
+from langchain_core.messages.ai import add_usage
+
+import breba_app.coder_agent.agent as agent_mod
+from breba_app.controllers.usage_controller import usage_cost
+from breba_app.filesystem import OverlayFileStore, in_memory_store
+from breba_app.llm_metrics import llm_metrics, CallRecord
 from evals.loader import load_messages, load_initial_files
 
+CASES_ROOT = Path(__file__).parent / "cases" / "coder_evals"
+RUNS_DIR = Path(__file__).parent / "runs"
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+DEFAULT_CONCURRENCY = 4
+# A case regresses when its wall time or cost is THRESHOLD higher (relative) and above the noise floors
+THRESHOLD = 0.5
+WALL_NOISE_FLOOR_S = 2.0
+COST_NOISE_FLOOR = 0.001
+
+
+@dataclass
+class CaseMetrics:
+    llm_calls: int = 0
+    llm_failures: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    edit_seconds: float = 0.0
+    usage: dict[str, UsageMetadata] = field(default_factory=dict)
+
 
 @dataclass
 class CaseResult:
@@ -20,80 +60,182 @@ class CaseResult:
     initial_files: list[str]
     final_files: list[str]
     modified_files: list[str]
-
-
-def compute_modified_files(before: dict[str, FileWrite], after: dict[str, FileWrite]) -> list[str]:
-    modified: list[str] = []
-    for path, after_content in after.items():
-        before_content = before.get(path)
-        if before_content is None or before_content != after_content:
-            modified.append(path)
-    return sorted(modified)
+    wall_seconds: float = 0.0
+    edit_seconds: float = 0.0
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    cost: float = 0.0
+
+
+# Metrics of the case running in the current task
+_current_case: ContextVar[CaseMetrics | None] = ContextVar("eval_case_metrics", default=None)
+
+
+def _record_llm_call(record: CallRecord, _owner) -> None:
+    metrics = _current_case.get()
+    if metrics is None:
+        return
+    metrics.llm_calls += 1
+    metrics.llm_failures += record.failed
+    metrics.input_tokens += record.input_tokens
+    metrics.output_tokens += record.output_tokens
+    metrics.cached_input_tokens += record.cached_input_tokens
+    usage = UsageMetadata(input_tokens=record.input_tokens, output_tokens=record.output_tokens,
+                          total_tokens=record.input_tokens + record.output_tokens,
+                          input_token_details={"cache_read": record.cached_input_tokens})
+    metrics.usage[record.client] = add_usage(metrics.usage.get(record.client), usage)
+
+
+def _timed_apply(apply):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return apply(*args, **kwargs)
+        finally:
+            metrics = _current_case.get()
+            if metrics is not None:
+                metrics.edit_seconds += time.perf_counter() - started
+
+    return wrapper
 
 
 async def run_case(case_dir: Path) -> CaseResult:
-    case_name = case_dir.name
+    case_name = case_dir.relative_to(CASES_ROOT).as_posix()
+    metrics = CaseMetrics()
+    _current_case.set(metrics)
 
     messages = load_messages(case_dir)
     initial = load_initial_files(case_dir)
 
-    store = in_memory_store.from_raw_strings(initial)
-    before = store.snapshot()
+    base = in_memory_store.from_raw_strings(initial)
+    # The overlay tracks what the agent wrote, so we never need to compare full before/after snapshots
+    store = OverlayFileStore(base)
+    initial_files = base.list_files()
 
+    started = time.perf_counter()
     try:
-        agent_message = await run_coder_agent(messages=messages, filestore=store)
+        agent_message = (await agent_mod.run_coder_agent(messages=messages, filestore=store)).content
+        error = None
     except Exception as e:
-        return CaseResult(
-            case=case_name,
-            passed=False,
-            error=f"Agent crashed: {e}",
-            agent_message="",
-            initial_files=sorted(before.keys()),
-            final_files=sorted(before.keys()),
-            modified_files=[],
-        )
-
-    after = store.snapshot()
-    modified = compute_modified_files(before, after)
+        agent_message, error = "", f"Agent crashed: {e}"
+    wall_seconds = time.perf_counter() - started
 
     # For now: "passed" just means the agent did not error.
     # We will add deterministic + judge checks in the next step.
-    passed = not agent_message.startswith("ERROR:")
+    passed = error is None and not agent_message.startswith("ERROR:")
+    if error is None and not passed:
+        error = agent_message
 
     return CaseResult(
         case=case_name,
         passed=passed,
-        error=None if passed else agent_message,
+        error=error,
         agent_message=agent_message,
-        initial_files=sorted(before.keys()),
-        final_files=sorted(after.keys()),
-        modified_files=modified,
+        initial_files=initial_files,
+        final_files=store.list_files() if error is None else initial_files,
+        modified_files=store.modified_files() if error is None else [],
+        wall_seconds=round(wall_seconds, 3),
+        edit_seconds=round(metrics.edit_seconds, 4),
+        llm_calls=metrics.llm_calls,
+        input_tokens=metrics.input_tokens,
+        output_tokens=metrics.output_tokens,
+        cached_input_tokens=metrics.cached_input_tokens,
+        cost=round(usage_cost(metrics.usage), 6),
     )
 
 
-async def main() -> None:
-    cases_root = Path(__file__).parent / "cases"
-    case_dirs = sorted([p for p in cases_root.iterdir() if p.is_dir()])
+async def run_cases(case_dirs: list[Path], concurrency: int) -> list[CaseResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_limited(case_dir: Path) -> CaseResult:
+        async with semaphore:
+            return await run_case(case_dir)
 
-    results: list[dict[str, Any]] = []
-    passed = 0
+    llm_metrics.listeners.append(_record_llm_call)
+    apply = agent_mod.apply_search_replace_many
+    agent_mod.apply_search_replace_many = _timed_apply(apply)
+    try:
+        # gather runs every case in its own task, so each one gets its own _current_case
+        return list(await asyncio.gather(*(run_limited(case_dir) for case_dir in case_dirs)))
+    finally:
+        agent_mod.apply_search_replace_many = apply
+        llm_metrics.listeners.remove(_record_llm_call)
+
+
+def compare(results: list[dict[str, Any]], baseline: dict[str, dict[str, Any]], threshold: float) -> list[str]:
+    regressions = []
+    for result in results:
+        before = baseline.get(result["case"])
+        if before is None:
+            continue
+        if before["passed"] and not result["passed"]:
+            regressions.append(f"{result['case']}: fails now ({result['error']})")
+        if (result["wall_seconds"] > before["wall_seconds"] * (1 + threshold)
+                and result["wall_seconds"] - before["wall_seconds"] > WALL_NOISE_FLOOR_S):
+            regressions.append(f"{result['case']}: wall time {before['wall_seconds']:.1f}s -> "
+                               f"{result['wall_seconds']:.1f}s")
+        if (result["cost"] > before["cost"] * (1 + threshold)
+                and result["cost"] - before["cost"] > COST_NOISE_FLOOR):
+            regressions.append(f"{result['case']}: cost ${before['cost']:.4f} -> ${result['cost']:.4f}")
+    return regressions
+
+
+def _cached_percent(cached_input_tokens: int, input_tokens: int) -> str:
+    return f"{cached_input_tokens / input_tokens:.0%}" if input_tokens else "-"
 
-    for case_dir in case_dirs:
-        r = await run_case(case_dir)
-        results.append(r.__dict__)
-        if r.passed:
-            passed += 1
 
-    runs_dir = Path(__file__).parent / "runs"
-    runs_dir.mkdir(parents=True, exist_ok=True)
-    out_path = runs_dir / "latest.json"
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", help="case names to run, all by default")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    case_dirs = sorted(p.parent for p in CASES_ROOT.rglob("case.json"))
+    if args.cases:
+        case_dirs = [p for p in case_dirs if p.relative_to(CASES_ROOT).as_posix() in args.cases]
+
+    started = time.perf_counter()
+    results = [asdict(r) for r in await run_cases(case_dirs, args.concurrency)]
+    total_seconds = time.perf_counter() - started
+
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = RUNS_DIR / "latest.json"
     out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
 
-    print(f"Passed {passed}/{len(results)}")
+    passed = sum(r["passed"] for r in results)
+    input_tokens = sum(r["input_tokens"] for r in results)
+    print(f"Passed {passed}/{len(results)} in {total_seconds:.1f}s, "
+          f"{_cached_percent(sum(r['cached_input_tokens'] for r in results), input_tokens)} of input tokens cached")
+    print(f"{'case':<32}{'result':>8}{'wall s':>9}{'edit ms':>9}{'calls':>7}{'tokens in/out':>18}{'cached':>8}"
+          f"{'cost $':>10}")
+    for r in results:
+        print(f"{r['case']:<32}{'PASS' if r['passed'] else 'FAIL':>8}{r['wall_seconds']:>9.1f}"
+              f"{r['edit_seconds'] * 1000:>9.1f}{r['llm_calls']:>7}"
+              f"{f'{r['input_tokens']}/{r['output_tokens']}':>18}"
+              f"{_cached_percent(r['cached_input_tokens'], r['input_tokens']):>8}{r['cost']:>10.4f}")
     for r in results:
         if not r["passed"]:
             print(f"- FAIL {r['case']}: {r['error']}")
 
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({r["case"]: r for r in results}, indent=2), encoding="utf-8")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+    if not BASELINE_PATH.exists():
+        print("No baseline yet, store one with --update-baseline")
+        return
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("Regressions against the baseline:")
+        for regression in regressions:
+            print(f"- {regression}")
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
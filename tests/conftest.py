@@ -0,0 +1,11 @@
+import pytest
+
+from breba_app import llm_executor as executor_mod
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_executor(monkeypatch):
+    """Rate limits and latency history are process wide, every test starts with a full bucket"""
+    monkeypatch.setattr(executor_mod.llm_executor, "bucket",
+                        executor_mod.TokenBucket(executor_mod.LLM_RATE_PER_SECOND, executor_mod.LLM_BURST))
+    monkeypatch.setattr(executor_mod.llm_executor, "_latencies", executor_mod.LLMExecutor()._latencies)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
 import pytest
 
 import breba_app.coder_agent.agent as agent_mod
-from breba_app.coder_agent.baml_client.types import LLMMessage, FileList
+from breba_app.coder_agent.baml_client.types import LLMMessage, FileList, FileEditPlan, FileEditTask
 from breba_app.filesystem import InMemoryFileStore, FileWrite
-from breba_app.search_replace_editing import HEAD_ERR, DIVIDER_ERR, UPDATED_ERR
+from breba_app.search_replace_editing import HEAD_ERR, DIVIDER_ERR, UPDATED_ERR, ApplyEditsError, EditRequest, \
+    FailedEdit
 from .conftest import compute_modified_files
 
 
@@ -59,7 +61,7 @@ async def test_agent_case_snapshots(monkeypatch, case_name: str, expected_modifi
     store = InMemoryFileStore(initial)
     before = store.snapshot()
 
-    async def fake_generate_search_replace_blocks(messages):
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
         return llm_output
 
     if getattr(agent_mod, "b", None) is None:
@@ -113,7 +115,7 @@ async def test_agent_search_block_mismatch(monkeypatch) -> None:
     store = InMemoryFileStore(initial)
     before = store.snapshot()
 
-    async def fake_generate_search_replace_blocks(messages):
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
         return mismatching_llm_output
 
     if getattr(agent_mod, "b", None) is None:
@@ -152,7 +154,7 @@ New content
     store = InMemoryFileStore(initial)
     before = store.snapshot()
 
-    async def fake_generate_search_replace_blocks(messages):
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
         return missing_file_output
 
     if getattr(agent_mod, "b", None) is None:
@@ -184,7 +186,7 @@ async def test_agent_partial_success(monkeypatch) -> None:
     store = InMemoryFileStore(initial)
     before = store.snapshot()
 
-    async def fake_generate_search_replace_blocks(messages):
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
         return llm_output
 
     async def fake_determine_files_to_edit(messages, files_list):
@@ -208,3 +210,167 @@ async def test_agent_partial_success(monkeypatch) -> None:
 
     assert result_msg.content == "ERROR: All edit attempts failed. Try making a more specific request."
     assert store.snapshot() == before, "FileStore should remain unchanged despite partial success"
+
+
+@pytest.mark.asyncio
+async def test_agent_uses_preselected_files(monkeypatch) -> None:
+    case_dir = Path(__file__).parent / "coder_agent_test_cases" / "modify_text"
+    initial, llm_output, expected = load_case(case_dir)
+    store = InMemoryFileStore({path: FileWrite(path, content.encode("utf-8"), "") for path, content in initial.items()})
+    seen_messages = []
+
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
+        seen_messages.extend(messages)
+        return llm_output
+
+    async def fail_read_files_to_edit(**kwargs):
+        raise AssertionError("files were already selected")
+
+    monkeypatch.setattr(agent_mod.b, "GenerateSearchReplaceBlocks", fake_generate_search_replace_blocks)
+    monkeypatch.setattr(agent_mod, "read_files_to_edit", fail_read_files_to_edit)
+
+    result_msg = await agent_mod.run_coder_agent(
+        messages=[LLMMessage(role="user", content="case=modify_text")],
+        filestore=store,
+        files_to_edit=(agent_mod._render_files({"index.html"}, store), {"index.html"}),
+    )
+
+    assert not result_msg.content.startswith("ERROR:"), result_msg.content
+    # Files come first so the prompt prefix is stable for provider prompt caching
+    assert "index.html" in seen_messages[0].content
+    assert store.read_text("index.html") == expected["index.html"]
+
+
+@pytest.mark.asyncio
+async def test_agent_retry_resends_only_failed_regions(monkeypatch) -> None:
+    sections = "\n".join(f'<section id="s{i}">\n<h2>Section {i}</h2>\n<p>Text {i}</p>\n</section>' for i in range(200))
+    page = f"<html>\n<body>\n{sections}\n</body>\n</html>\n"
+    store = InMemoryFileStore({
+        "index.html": FileWrite("index.html", page.encode("utf-8"), ""),
+        "styles.css": FileWrite("styles.css", b"h2 { color: red; }\n", ""),
+    })
+
+    def block(path: str, search: str, replace: str) -> str:
+        return f"{path}\n```\n{HEAD_ERR}\n{search}\n{DIVIDER_ERR}\n{replace}\n{UPDATED_ERR}\n```\n"
+
+    responses = [
+        block("styles.css", "h2 { color: red; }", "h2 { color: blue; }")
+        + block("index.html", '<section id="s120">\n<h2>Section 120</h2>\n<p>Text 12O</p>',
+                '<section id="s120">\n<h2>Section 120</h2>\n<p>New text</p>'),
+        block("index.html", "<h2>Section 120</h2>\n<p>Text 120</p>", "<h2>Section 120</h2>\n<p>New text</p>"),
+    ]
+    calls = []
+
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
+        calls.append(list(messages))
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(agent_mod.b, "GenerateSearchReplaceBlocks", fake_generate_search_replace_blocks)
+
+    result_msg = await agent_mod.run_coder_agent(
+        messages=[LLMMessage(role="user", content="Make the second section heading text blue")],
+        filestore=store,
+        files_to_edit=("", {"index.html", "styles.css"}),
+    )
+
+    assert result_msg.content == "UPDATED_FILES:\n- index.html\n- styles.css"
+    retry_files, retry_error = calls[1][-1].content, calls[1][-2].content
+    # The failed block was close to section 120, so only that region of index.html is resent
+    assert "<p>Text 120</p>" in retry_files
+    assert "Text 5</p>" not in retry_files
+    assert "styles.css" not in retry_files
+    assert "- styles.css: `h2 { color: red; }` -> `h2 { color: blue; }`" in retry_error
+    # The retry only appends to the first prompt, so its prefix can be served from the provider's cache
+    assert calls[1][:len(calls[0])] == calls[0]
+    assert "<p>New text</p>" in store.read_text("index.html")
+
+
+def test_retry_regions_follow_the_current_file() -> None:
+    lines = [f"<p>Line {i}</p>" for i in range(600)]
+    store = InMemoryFileStore({"index.html": FileWrite("index.html", "\n".join(lines).encode("utf-8"), "")})
+    search = "<p>Line 500</p>\n<p>Line 5O1</p>\n<p>Line 502</p>"
+    failed = FailedEdit(EditRequest("index.html", search, "<p>New</p>"), "no match", region=(500, 503))
+    # An edit later in the batch inserted lines above the region, the recorded one is now 300 lines off
+    store.write_text("index.html", "\n".join([f"<p>Intro {i}</p>" for i in range(300)] + lines))
+
+    blocks = agent_mod._render_retry_files(ApplyEditsError("failed", [], [], [], [failed]), store, query="",
+                                           widen=0)
+
+    assert "<p>Line 501</p>" in blocks["index.html"]
+    assert "<p>Line 200</p>" not in blocks["index.html"]
+
+
+@pytest.mark.asyncio
+async def test_agent_generates_multi_file_edits_in_parallel(monkeypatch) -> None:
+    pages = {name: f"<h1>{name}</h1>\n" for name in ("index.html", "about.html", "contact.html")}
+    store = InMemoryFileStore({path: FileWrite(path, content.encode("utf-8"), "") for path, content in pages.items()})
+    running, max_running, file_contexts = 0, 0, []
+
+    async def fake_plan_file_edits(messages, files):
+        return FileEditPlan(tasks=[FileEditTask(path=path, instructions=f"Uppercase the heading of {path}")
+                                   for path in files])
+
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        path = messages[-1].content.split()[2]
+        file_contexts.append(messages[-2].content)
+        return f"{path}\n```\n{HEAD_ERR}\n<h1>{path}</h1>\n{DIVIDER_ERR}\n<h1>{path.upper()}</h1>\n{UPDATED_ERR}\n```\n"
+
+    monkeypatch.setattr(agent_mod.b, "PlanFileEdits", fake_plan_file_edits)
+    monkeypatch.setattr(agent_mod.b, "GenerateSearchReplaceBlocks", fake_generate_search_replace_blocks)
+    monkeypatch.setattr(agent_mod, "MAX_PARALLEL_FILE_EDITS", 2)
+
+    result_msg = await agent_mod.run_coder_agent(
+        messages=[LLMMessage(role="user", content="Uppercase all headings")],
+        filestore=store,
+        files_to_edit=("", set(pages)),
+    )
+
+    assert result_msg.content == "UPDATED_FILES:\n- about.html\n- contact.html\n- index.html"
+    assert max_running == 2
+    # Every generation only sees its own file
+    assert all(sum(path in context for path in pages) == 1 for context in file_contexts)
+    assert store.read_text("about.html") == "<h1>ABOUT.HTML</h1>\n"
+
+
+@pytest.mark.asyncio
+async def test_failed_per_file_generation_falls_back_to_a_single_generation(monkeypatch) -> None:
+    pages = {name: f"<h1>{name}</h1>\n" for name in ("index.html", "about.html", "contact.html")}
+    store = InMemoryFileStore({path: FileWrite(path, content.encode("utf-8"), "") for path, content in pages.items()})
+    cancelled = []
+
+    async def fake_plan_file_edits(messages, files):
+        return FileEditPlan(tasks=[FileEditTask(path=path, instructions=f"Uppercase the heading of {path}")
+                                   for path in files])
+
+    async def fake_generate_search_replace_blocks(messages, baml_options=None):
+        if not messages[-1].content.startswith("Only edit"):
+            # The single generation for all files
+            return "".join(f"{path}\n```\n{HEAD_ERR}\n<h1>{path}</h1>\n{DIVIDER_ERR}\n<h1>{path.upper()}</h1>\n"
+                           f"{UPDATED_ERR}\n```\n" for path in pages)
+        path = messages[-1].content.split()[2]
+        if path == "about.html":
+            raise RuntimeError("provider error")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(path)
+            raise
+        return ""
+
+    monkeypatch.setattr(agent_mod.b, "PlanFileEdits", fake_plan_file_edits)
+    monkeypatch.setattr(agent_mod.b, "GenerateSearchReplaceBlocks", fake_generate_search_replace_blocks)
+
+    result_msg = await asyncio.wait_for(agent_mod.run_coder_agent(
+        messages=[LLMMessage(role="user", content="Uppercase all headings")],
+        filestore=store,
+        files_to_edit=("", set(pages)),
+    ), timeout=1)
+
+    assert result_msg.content == "UPDATED_FILES:\n- about.html\n- contact.html\n- index.html"
+    # The other files stopped generating as soon as one failed
+    assert sorted(cancelled) == ["contact.html", "index.html"]
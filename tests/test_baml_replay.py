@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.baml_replay import Cassette, ReplayBamlClient, ReplayMissError
+from breba_app.coder_agent.baml_client.types import FileList, LLMMessage
+
+
+class FakeStream:
+    def __init__(self, parts: list[str]):
+        self.parts = parts
+
+    async def __aiter__(self):
+        for part in self.parts:
+            await asyncio.sleep(0.02)
+            yield part
+
+    async def get_final_response(self) -> str:
+        return "".join(self.parts)
+
+
+class FakeStreamClient:
+    def Echo(self, text: str, baml_options: dict = {}) -> FakeStream:
+        return FakeStream(text.split())
+
+
+class FakeBamlClient:
+    def __init__(self):
+        self.stream = FakeStreamClient()
+        self.calls = 0
+
+    async def DetermineFilesToEdit(self, messages: list[LLMMessage], files: list[str],
+                                   baml_options: dict = {}) -> FileList:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return FileList(reasoning="", files=files[:1])
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_with_original_timing(tmp_path):
+    path = tmp_path / "cassette.json"
+    messages = [LLMMessage(role="user", content="Change the title")]
+    client = FakeBamlClient()
+
+    recorder = ReplayBamlClient(client, Cassette(path), mode="record")
+    recorded = await recorder.DetermineFilesToEdit(messages, ["index.html", "styles.css"])
+    stream = recorder.stream.Echo("a b c")
+    assert [part async for part in stream] == ["a", "b", "c"]
+    assert await stream.get_final_response() == "abc"
+    recorder.cassette.save()
+
+    replayer = ReplayBamlClient(client, Cassette.load(path), mode="replay", speed=1.0)
+    started = time.perf_counter()
+    replayed = await replayer.DetermineFilesToEdit(messages, ["index.html", "styles.css"])
+    assert time.perf_counter() - started >= 0.04
+    assert replayed == recorded and isinstance(replayed, FileList)
+    assert client.calls == 1
+
+    stream = replayer.stream.Echo("a b c")
+    started = time.perf_counter()
+    assert [part async for part in stream] == ["a", "b", "c"]
+    assert time.perf_counter() - started >= 0.05
+    assert await stream.get_final_response() == "abc"
+
+
+@pytest.mark.asyncio
+async def test_replay_falls_back_to_function_order_and_reports_misses(tmp_path):
+    path = tmp_path / "cassette.json"
+    client = FakeBamlClient()
+    recorder = ReplayBamlClient(client, Cassette(path), mode="record")
+    await recorder.DetermineFilesToEdit([LLMMessage(role="user", content="a")], ["index.html"])
+    recorder.cassette.save()
+
+    replayer = ReplayBamlClient(client, Cassette.load(path), mode="replay", speed=0)
+    result = await replayer.DetermineFilesToEdit([LLMMessage(role="user", content="changed")], ["index.html"])
+    assert result.files == ["index.html"]
+    with pytest.raises(ReplayMissError):
+        await replayer.DetermineFilesToEdit([LLMMessage(role="user", content="a")], ["index.html"])
@@ -0,0 +1,75 @@
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.context_budget import ContextWindow, count_tokens, truncate_message, FILES_PAYLOAD_PLACEHOLDER, \
+    TRUNCATED_NOTE
+
+
+def _conversation(turns: int, size: int = 400) -> list[LLMMessage]:
+    messages = []
+    for i in range(turns):
+        messages.append(LLMMessage(role="user", content=f"request {i} " + "x" * size))
+        messages.append(LLMMessage(role="assistant", content=f"response {i} " + "y" * size))
+    return messages
+
+
+def test_fit_keeps_recent_suffix_within_budget():
+    messages = _conversation(10)
+    window = ContextWindow()
+    budget = sum(count_tokens(m) for m in messages[-4:]) + 10
+
+    fitted = window.fit(messages, "UserResponseOrCoder", budget=budget)
+
+    assert fitted == messages[-4:]
+    assert fitted[0].role == "user"
+    usage = window.usage["UserResponseOrCoder"]
+    assert usage.used <= budget
+    assert (usage.kept, usage.evicted, usage.summarized) == (4, 16, False)
+
+
+def test_evicted_turns_are_replaced_by_summary():
+    messages = _conversation(10)
+    window = ContextWindow()
+    budget = sum(count_tokens(m) for m in messages[-4:]) + 10
+
+    fitted = window.fit(messages, "CoderAgent", summary="Built a bakery landing page", budget=budget)
+
+    assert fitted[0].content == "Summary of the earlier conversation:\nBuilt a bakery landing page"
+    assert fitted[1].role == "user"
+    assert window.usage["CoderAgent"].summarized
+    assert window.usage["CoderAgent"].used <= budget
+
+
+def test_counts_are_incremental_and_recounted_on_rewrites():
+    messages = _conversation(2)
+    window = ContextWindow()
+    total = window.total_tokens(messages)
+
+    messages.append(LLMMessage(role="user", content="more"))
+    assert window.total_tokens(messages) == total + count_tokens(messages[-1])
+
+    messages.pop(0)
+    assert window.total_tokens(messages) == sum(count_tokens(m) for m in messages)
+
+
+def test_file_payloads_are_stripped():
+    payload = "<files_available_for_editing>\nindex.html\n" + "z" * 10_000 + "\n</files_available_for_editing>"
+    messages = [LLMMessage(role="user", content=f"Edit this\n{payload}")]
+    window = ContextWindow()
+
+    fitted = window.fit(messages, "CoderAgent")
+
+    assert fitted[0].content == f"Edit this\n{FILES_PAYLOAD_PLACEHOLDER}"
+    assert window.usage["CoderAgent"].used < 100
+
+
+def test_oversized_latest_message_does_not_fit():
+    messages = [LLMMessage(role="user", content="x" * 1000)]
+    assert ContextWindow().fit(messages, "UserResponseOrCoder", budget=10) == []
+
+
+def test_truncate_message_fits_the_budget():
+    message = LLMMessage(role="user", content="z" * 10_000)
+    assert truncate_message(LLMMessage(role="user", content="short"), 100).content == "short"
+
+    truncated = truncate_message(message, 100)
+    assert count_tokens(truncated) <= 100
+    assert truncated.content.startswith("zzz") and truncated.content.endswith(TRUNCATED_NOTE)
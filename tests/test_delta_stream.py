@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from breba_app.delta_stream import text_delta, ThrottledDeltaSender, stream_to_message
+
+
+def test_text_delta():
+    assert text_delta("", "Hello") == (0, "Hello")
+    assert text_delta("Hello", "Hello world") == (5, " world")
+    assert text_delta("Hello wor", "Hello world") == (9, "ld")
+    # A rewritten tail is sent from the common prefix on
+    assert text_delta("Hello wrld", "Hello world") == (7, "orld")
+    assert text_delta("same", "same") == (4, "")
+
+
+class Receiver:
+    def __init__(self):
+        self.text = ""
+        self.messages = 0
+
+    async def __call__(self, offset: int, text: str):
+        self.messages += 1
+        self.text = self.text[:offset] + text
+
+
+@pytest.mark.asyncio
+async def test_throttled_sender_sends_latest_state_and_final_text():
+    receiver = Receiver()
+    sender = ThrottledDeltaSender(receiver, interval=0.05)
+    spec = "# Bakery website\n\n## Hero\nFresh bread every day\n"
+    for end in range(1, len(spec) + 1):
+        sender.update(spec[:end])
+    await asyncio.sleep(0.01)
+    # The first partial goes out immediately, the rest waits for the interval
+    assert receiver.messages == 1 and receiver.text == spec
+
+    sender.update(spec + "## Menu\n")
+    sender.update(spec + "## Menu\nBread $4")
+    await asyncio.sleep(0.01)
+    assert receiver.messages == 1
+
+    await sender.close(spec + "## Menu\nBread $4\n")
+    assert receiver.text == spec + "## Menu\nBread $4\n"
+    assert receiver.messages == 2
+
+
+@pytest.mark.asyncio
+async def test_throttled_sender_stops_without_a_receiver():
+    calls = 0
+
+    async def send(offset, text):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("no chainlit context")
+
+    sender = ThrottledDeltaSender(send, interval=0)
+    sender.update("a")
+    await asyncio.sleep(0.01)
+    sender.update("ab")
+    await sender.close("abc")
+    assert calls == 1
+
+
+class FakeMessage:
+    """stream_token semantics of a chainlit Message"""
+
+    def __init__(self):
+        self.content = ""
+        self.sent_chars = 0
+
+    async def stream_token(self, token: str, is_sequence: bool = False):
+        self.sent_chars += len(token)
+        self.content = token if is_sequence else self.content + token
+
+
+@pytest.mark.asyncio
+async def test_cumulative_partials_are_streamed_as_appended_tokens():
+    answer = " ".join(f"word{i}" for i in range(400))
+
+    async def partials():
+        for end in range(0, len(answer), 7):
+            yield answer[:end]
+            await asyncio.sleep(0)
+        yield answer[:-3] + "xyz"
+        yield answer
+
+    message = FakeMessage()
+    await stream_to_message(message, partials(), interval=0)
+    assert message.content == answer
+    # Close to the answer itself instead of the sum of all partials
+    assert message.sent_chars < 2 * len(answer)
@@ -1,8 +1,9 @@
+import difflib
 from pathlib import Path
 
 import pytest
 
-from breba_app.diff import get_diff, PatchApplyError, apply_diff_no_line_numbers
+from breba_app.diff import get_diff, PatchApplyError, apply_diff_no_line_numbers, unified_diff
 
 
 @pytest.fixture(scope="session")
@@ -72,3 +73,51 @@ def test_generated_diff_format(valid_diff):
     assert "<html lang=\"en\">" in valid_diff
     assert "<head>" in valid_diff
     assert "<body>" in valid_diff
+
+
+def test_roundtrip_two_sections(fixtures_dir):
+    original = read_text_normalized(fixtures_dir / "original_two_sections.html")
+    modified = read_text_normalized(fixtures_dir / "modified_two_sections.html")
+    diff = get_diff(original, modified)
+    assert apply_diff_no_line_numbers(original, diff) == modified
+
+
+def test_unified_diff_matches_difflib_format():
+    before = ["<html>", "<body>", "<h1>Hello</h1>", "<p>One</p>", "<p>Two</p>", "</body>", "</html>"]
+    after = ["<html>", "<body>", "<h1>Hello Universe</h1>", "<p>One</p>", "<p>Two</p>", "<p>Three</p>", "</body>",
+             "</html>"]
+    expected = list(difflib.unified_diff(before, after, fromfile="before", tofile="after", lineterm=""))
+    assert list(unified_diff(before, after, fromfile="before", tofile="after")) == expected
+
+
+def test_apply_out_of_order_hunks():
+    original = "\n".join(f"<p>line {i}</p>" for i in range(40)) + "\n"
+    diff = """--- before
++++ after
+@@ -30,3 +30,3 @@
+ <p>line 29</p>
+-<p>line 30</p>
++<p>line thirty</p>
+ <p>line 31</p>
+@@ -2,3 +2,3 @@
+ <p>line 1</p>
+-<p>line 2</p>
++<p>line two</p>
+ <p>line 3</p>
+"""
+    result = apply_diff_no_line_numbers(original, diff).splitlines()
+    assert result[2] == "<p>line two</p>"
+    assert result[30] == "<p>line thirty</p>"
+    assert len(result) == 40
+
+
+def test_roundtrip_large_page():
+    original = [f"<div class=\"card c{i % 50}\">item {i}</div>" for i in range(20_000)]
+    modified = list(original)
+    for i in range(0, len(modified), 1000):
+        modified[i] = f"<div class=\"card\">changed {i}</div>"
+    del modified[500:510]
+    modified.insert(15_000, "<section>new</section>")
+
+    diff = get_diff("\n".join(original), "\n".join(modified))
+    assert apply_diff_no_line_numbers("\n".join(original), diff) == "\n".join(modified)
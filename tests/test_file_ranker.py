@@ -0,0 +1,76 @@
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.coder_agent.file_ranker import select_files_to_edit, FileIndex, _doc_cache
+from breba_app.filesystem import FileWrite, InMemoryFileStore
+from breba_app.filesystem.in_memory_store import from_raw_strings
+
+PAGE = """<html>
+<head><link rel="stylesheet" href="styles.css"></head>
+<body>{body}<script src="./script.js"></script></body>
+</html>
+"""
+
+
+def _ask(content: str) -> list[LLMMessage]:
+    return [LLMMessage(role="user", content="Build me a site"), LLMMessage(role="assistant", content="Done"),
+            LLMMessage(role="user", content=content)]
+
+
+def test_single_page_site_is_selected_with_assets_and_sitemap():
+    store = from_raw_strings({
+        "index.html": PAGE.format(body="<h1>Hello World</h1>"),
+        "styles.css": "h1 { color: red; }",
+        "script.js": "",
+        "sitemap.xml": "<urlset/>",
+        "robots.txt": "",
+    })
+    selected = select_files_to_edit(messages=_ask("Change the heading to Hello Universe"), filestore=store)
+    assert selected == {"index.html", "styles.css", "script.js", "sitemap.xml"}
+
+
+def test_binary_assets_are_not_in_the_working_set():
+    page = PAGE.format(body='<img src="hero.png"><a href="menu.pdf">Menu</a><h1>Hello World</h1>')
+    store = InMemoryFileStore({
+        "index.html": FileWrite("index.html", page.encode("utf-8")),
+        "styles.css": FileWrite("styles.css", b"h1 { color: red; }"),
+        "hero.png": FileWrite("hero.png", b"\x89PNG\r\n\x1a\n\xff\xd8"),
+        "menu.pdf": FileWrite("menu.pdf", b"%PDF-1.4\n\xe2\xe3\xcf\xd3"),
+    })
+    selected = select_files_to_edit(messages=_ask("Change the heading to Hello Universe"), filestore=store)
+    assert selected == {"index.html", "styles.css"}
+
+
+def test_clear_winner_among_pages():
+    store = from_raw_strings({
+        "index.html": PAGE.format(body="<h1>Acme</h1><p>We build rockets</p>"),
+        "pricing.html": PAGE.format(body="<h1>Plans</h1><p>Basic plan costs $10 per month</p>"),
+        "about.html": PAGE.format(body="<h1>About Acme</h1><p>Founded in 1999</p>"),
+        "styles.css": "",
+        "sitemap.xml": "<urlset/>",
+    })
+    selected = select_files_to_edit(messages=_ask("Raise the basic plan price to $12"), filestore=store)
+    assert selected == {"pricing.html", "styles.css", "sitemap.xml"}
+
+    # File name matches count even when the words differ slightly
+    ranking = FileIndex.from_filestore(store, ["about.html", "index.html", "pricing.html"]).rank("update prices")
+    assert ranking[0][0] == "pricing.html"
+
+
+def test_ambiguous_requests_fall_back_to_llm():
+    store = from_raw_strings({
+        "index.html": PAGE.format(body="<footer>Acme</footer>"),
+        "about.html": PAGE.format(body="<footer>Acme</footer>"),
+    })
+    assert select_files_to_edit(messages=_ask("Make the footer darker"), filestore=store) is None
+    assert select_files_to_edit(messages=_ask("Update the about page on every page"), filestore=store) is None
+    assert select_files_to_edit(messages=_ask("Hello"), filestore=from_raw_strings({"a.css": ""})) is None
+
+
+def test_documents_are_cached_by_content():
+    _doc_cache.clear()
+    store = from_raw_strings({"index.html": "<h1>Hi</h1>", "about.html": "<h1>About</h1>"})
+    select_files_to_edit(messages=_ask("about"), filestore=store)
+    assert len(_doc_cache) == 2
+
+    store.write_text("index.html", "<h1>Hi there</h1>")
+    select_files_to_edit(messages=_ask("about"), filestore=store)
+    assert len(_doc_cache) == 3
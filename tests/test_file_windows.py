@@ -0,0 +1,50 @@
+from breba_app.coder_agent.file_windows import select_regions, render_file_window, MAX_WIDEN, CONTEXT_LINES
+
+SECTION = """<section id="s{i}">
+<h2>Section {i}</h2>
+<p>Paragraph {i}</p>
+</section>"""
+
+
+def _page(sections: int) -> str:
+    body = "\n".join(SECTION.format(i=i) for i in range(sections))
+    return f"<html>\n<body>\n{body}\n<footer>Phone 555-0100</footer>\n</body>\n</html>"
+
+
+def test_small_files_are_sent_in_full():
+    assert select_regions("index.html", _page(10), "phone") is None
+    assert render_file_window("index.html", _page(10), "phone") is None
+
+
+def test_regions_cover_matching_sections_with_context():
+    page = _page(300)
+    lines = page.split("\n")
+    footer = next(i for i, line in enumerate(lines) if "Phone" in line)
+
+    regions = select_regions("index.html", page, "Change the phone number")
+
+    assert regions == [(footer - CONTEXT_LINES, len(lines) - 1)]
+    window = render_file_window("index.html", page, "Change the phone number")
+    assert f"index.html lines {footer - CONTEXT_LINES + 1}-{len(lines)} of {len(lines)}" in window
+    assert "<outline>" in window
+    assert "Paragraph 150" not in window
+
+
+def test_anchor_expands_to_enclosing_section():
+    page = _page(300)
+    lines = page.split("\n")
+    start = lines.index('<section id="s150">')
+
+    regions = select_regions("index.html", page, "Paragraph 150 should be bold")
+
+    assert any(first <= start - CONTEXT_LINES and last >= start + 3 + CONTEXT_LINES for first, last in regions)
+
+
+def test_windows_widen_until_full_file():
+    page = _page(300)
+    narrow = select_regions("index.html", page, "phone")
+    wide = select_regions("index.html", page, "phone", widen=1)
+    assert wide[0][0] < narrow[0][0]
+    assert select_regions("index.html", page, "phone", widen=MAX_WIDEN) is None
+    # Nothing relevant means the coder needs the whole file
+    assert select_regions("index.html", page, "zebra") is None
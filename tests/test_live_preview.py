@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from breba_app.coder_agent import live_preview
+from breba_app.coder_agent.live_preview import LivePreview, completed_edits
+from breba_app.filesystem import OverlayFileStore
+from breba_app.filesystem.in_memory_store import from_raw_strings
+from breba_app.search_replace_editing import HEAD_ERR, DIVIDER_ERR, UPDATED_ERR
+
+
+def block(path: str, search: str, replace: str) -> str:
+    return f"{path}\n```\n{HEAD_ERR}\n{search}\n{DIVIDER_ERR}\n{replace}\n{UPDATED_ERR}\n```\n"
+
+
+class FakeUI:
+    def __init__(self):
+        self.patches: list[tuple[str, str]] = []
+        self.done = 0
+
+    async def publish(self, path: str, content: str):
+        self.patches.append((path, content))
+
+    async def end(self):
+        self.done += 1
+
+
+def test_only_complete_blocks_are_used():
+    text = block("index.html", "<h1>A</h1>", "<h1>B</h1>") + "styles.css\n```\n" + HEAD_ERR + "\nh1 {"
+    edits = completed_edits(text)
+    assert [(edit.path, edit.replace) for edit in edits] == [("index.html", "<h1>B</h1>\n")]
+
+
+@pytest.mark.asyncio
+async def test_partial_states_are_debounced_and_latest_wins():
+    store = from_raw_strings({"index.html": "<h1>A</h1>\n<p>x</p>\n", "styles.css": "h1 { color: red; }\n",
+                              "script.js": "let a = 1;\n"})
+    ui = FakeUI()
+    preview = LivePreview(ui.publish, ui.end, debounce=0.05)
+    preview.start(OverlayFileStore(store))
+    feed = preview.feeder()
+
+    first = block("index.html", "<h1>A</h1>", "<h1>B</h1>")
+    feed(first[:20])
+    feed(first)
+    await asyncio.sleep(0.01)
+    assert ui.patches == [("index.html", "<h1>B</h1>\n<p>x</p>\n")]
+
+    second = first + block("index.html", "<p>x</p>", "<p>y</p>") + block("script.js", "let a = 1;", "let a = 2;")
+    feed(second)
+    third = second + block("styles.css", "h1 { color: red; }", "h1 { color: blue; }")
+    feed(third)
+    # Within the debounce window nothing more is sent
+    assert len(ui.patches) == 1
+    await asyncio.sleep(0.1)
+    assert ui.patches[1:] == [("index.html", "<h1>B</h1>\n<p>y</p>\n"), ("styles.css", "h1 { color: blue; }\n")]
+
+    # The coder failed: the original files are the final state
+    await preview.close(store)
+    assert ui.patches[3:] == [("index.html", "<h1>A</h1>\n<p>x</p>\n"), ("styles.css", "h1 { color: red; }\n")]
+    assert ui.done == 1
+    feed(third + block("index.html", "<h1>A</h1>", "<h1>C</h1>"))
+    await asyncio.sleep(0.1)
+    assert len(ui.patches) == 5
+
+
+@pytest.mark.asyncio
+async def test_preview_stops_when_there_is_no_ui():
+    store = from_raw_strings({"index.html": "<h1>A</h1>\n"})
+    calls = 0
+
+    async def publish(path, content):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("no chainlit context")
+
+    preview = LivePreview(publish, debounce=0)
+    preview.start(store)
+    preview.feed(block("index.html", "<h1>A</h1>", "<h1>B</h1>"))
+    await asyncio.sleep(0.01)
+    preview.feed(block("index.html", "<h1>A</h1>", "<h1>B</h1>") + block("index.html", "<h1>B</h1>", "<h1>C</h1>"))
+    await asyncio.sleep(0.01)
+    await preview.close(store)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_each_block_is_applied_once_and_only_on_an_exact_match(monkeypatch):
+    applied = []
+    original_do_replace = live_preview.do_replace
+
+    def do_replace(content, search, replace):
+        applied.append(search)
+        return original_do_replace(content, search, replace)
+
+    monkeypatch.setattr(live_preview, "do_replace", do_replace)
+    store = from_raw_strings({"index.html": "<h1>A</h1>\n<p>x</p>\n"})
+    ui = FakeUI()
+    preview = LivePreview(ui.publish, debounce=0)
+    preview.start(store)
+
+    text = block("index.html", "<h1>A</h1>", "<h1>B</h1>")
+    preview.feed(text)
+    # Close to <p>x</p>, but only the real edit may take the fuzzy match
+    text += block("index.html", "<p>X</p>", "<p>y</p>")
+    preview.feed(text)
+    text += block("index.html", "<h1>B</h1>", "<h1>C</h1>")
+    preview.feed(text)
+    await asyncio.sleep(0.01)
+
+    assert applied == ["<h1>A</h1>\n", "<p>X</p>\n", "<h1>B</h1>\n"]
+    assert ui.patches[-1] == ("index.html", "<h1>C</h1>\n<p>x</p>\n")
@@ -0,0 +1,83 @@
+import pytest
+
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.llm_cache import ResponseCache, cached_llm_call, cache_key, baml_client_of
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_key_is_canonical():
+    messages = [LLMMessage(role="user", content="Hi")]
+    key = cache_key("F", "client", (messages,), {"files": {"b", "a"}})
+    assert key == cache_key("F", "client", ([LLMMessage(role="user", content="Hi")],), {"files": {"a", "b"}})
+    assert key != cache_key("F", "other_client", (messages,), {"files": {"a", "b"}})
+    assert key != cache_key("G", "client", (messages,), {"files": {"a", "b"}})
+
+
+@pytest.mark.asyncio
+async def test_cached_call_hits_expires_and_reports_stats():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    calls = []
+
+    @cached_llm_call("Echo", client="test", ttl=10, cache=cache)
+    async def echo(text: str) -> list[str]:
+        calls.append(text)
+        return [text]
+
+    assert await echo("a") == ["a"]
+    result = await echo("a")
+    assert result == ["a"]
+    # Cached values are copies, mutating a result does not poison the cache
+    result.append("mutated")
+    assert await echo("a") == ["a"]
+    assert calls == ["a"]
+
+    clock.now = 11
+    await echo("a")
+    assert calls == ["a", "a"]
+    assert cache.stats() == {"Echo": {"hits": 2, "misses": 2, "hit_rate": 0.5}}
+
+
+@pytest.mark.asyncio
+async def test_cache_is_size_bounded_and_skips_errors():
+    cache = ResponseCache(max_entries=2)
+    calls = []
+
+    @cached_llm_call("Fail", client="test", cache=cache)
+    async def fail(n: int) -> int:
+        calls.append(n)
+        if n < 0:
+            raise RuntimeError("boom")
+        return n
+
+    for n in (1, 2, 3):
+        await fail(n)
+    assert len(cache) == 2
+    await fail(1)
+    assert calls == [1, 2, 3, 1]
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await fail(-1)
+    assert calls[-2:] == [-1, -1]
+
+
+def test_baml_client_follows_the_function_definition():
+    client = 'client<llm> Fast {\n  provider openai\n  options {\n    model "gpt-5-mini"\n  }\n}\n'
+    files = {"clients.baml": client,
+             "f.baml": 'function Pick(files: string[]) -> string {\n  client Fast\n  prompt #"{{ files }}"#\n}\n'}
+    key = baml_client_of(files, "Pick")
+    assert key.startswith("Fast@")
+
+    assert baml_client_of({**files, "clients.baml": client.replace("gpt-5-mini", "gpt-5")}, "Pick") != key
+    moved = {**files, "f.baml": files["f.baml"].replace("client Fast", 'client "openai/gpt-4o"')}
+    assert baml_client_of(moved, "Pick").startswith("openai/gpt-4o@")
+    with pytest.raises(ValueError):
+        baml_client_of(files, "Missing")
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from breba_app import llm_executor as executor_mod
+from breba_app.llm_executor import LLMExecutor, TokenBucket, LLMDeadlineExceeded, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 100
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_retry_after_reads_the_provider_delay():
+    assert retry_after(ProviderError(429, "Rate limit reached. Please try again in 1.5s.")) == 1.5
+    assert retry_after(ProviderError(503, "retry-after: 200ms")) == 0.2
+    assert retry_after(ProviderError(502)) == 0.0
+    assert retry_after(ProviderError(400, "try again in 3s")) is None
+    assert retry_after(ValueError("try again in 3s")) is None
+
+
+@pytest.mark.asyncio
+async def test_run_retries_after_rate_limit(monkeypatch):
+    monkeypatch.setattr(executor_mod, "RETRY_BASE_DELAY", 0.001)
+    executor = LLMExecutor()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ProviderError(429, "try again in 1ms")
+        return "ok"
+
+    assert await executor.run("F", call) == "ok"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_retry_other_errors():
+    executor = LLMExecutor()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise ProviderError(400)
+
+    with pytest.raises(ProviderError):
+        await executor.run("F", call)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_enforces_deadline():
+    executor = LLMExecutor()
+
+    async def call():
+        await asyncio.sleep(1)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        await executor.run("F", call, deadline=0.01)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_returns_the_first_answer(monkeypatch):
+    executor = LLMExecutor()
+    for _ in range(executor_mod.MIN_HEDGE_SAMPLES):
+        executor.record_latency("F", 0.01)
+    assert executor.p95("F") == 0.01
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        # The first request stalls, the hedge answers quickly
+        await asyncio.sleep(1 if len(attempts) == 1 else 0)
+        return len(attempts)
+
+    assert await executor.run("F", call, hedge=True) == 2
+    assert len(attempts) == 2
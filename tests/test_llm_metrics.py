@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from baml_py import Collector
+
+from breba_app.controllers.usage_controller import usage_cost, INPUT_TOKEN_COEFFICIENT, OUTPUT_TOKEN_COEFFICIENT
+from breba_app.llm_metrics import LLMMetrics, CallRecord, LatencyHistogram, instrument, usage_scope
+
+
+class FakeStream:
+    def __init__(self, parts: list[str]):
+        self.parts = parts
+
+    async def __aiter__(self):
+        for part in self.parts:
+            await asyncio.sleep(0)
+            yield part
+
+    async def get_final_response(self) -> str:
+        return "".join(self.parts)
+
+
+class FakeStreamClient:
+    def __init__(self):
+        self.options = []
+
+    def Echo(self, text: str, baml_options: dict = {}) -> FakeStream:
+        self.options.append(baml_options)
+        return FakeStream(text.split())
+
+
+class FakeBamlClient:
+    def __init__(self):
+        self.stream = FakeStreamClient()
+        self.options = []
+
+    async def Echo(self, text: str, baml_options: dict = {}) -> str:
+        self.options.append(baml_options)
+        if text == "fail":
+            raise RuntimeError("provider down")
+        return text
+
+    def with_options(self, **kwargs):
+        return self
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) is None
+    for ms in (100, 300, 300, 800, 150_000):
+        histogram.observe(ms)
+    assert histogram.quantile(0.5) == 500
+    assert histogram.quantile(0.8) == 1_000
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_usage_is_accumulated_per_product_and_client():
+    metrics = LLMMetrics()
+    seen = []
+    metrics.listeners.append(lambda record, owner: seen.append(owner))
+    metrics.record(CallRecord(function="F", client="A", duration_ms=10, input_tokens=5, output_tokens=1))
+    with usage_scope("user", "p1"):
+        metrics.record(CallRecord(function="F", client="A", duration_ms=10, input_tokens=10, output_tokens=2))
+        metrics.record(CallRecord(function="G", client="A", duration_ms=10, input_tokens=1, output_tokens=1,
+                                  retries=2))
+        metrics.record(CallRecord(function="G", client="B", duration_ms=10, input_tokens=3, output_tokens=0))
+
+    assert seen == [None, ("user", "p1"), ("user", "p1"), ("user", "p1")]
+    usage = metrics.take_usage("user", "p1")
+    assert usage["A"]["input_tokens"] == 11 and usage["A"]["output_tokens"] == 3
+    assert usage["B"]["input_tokens"] == 3
+    assert metrics.take_usage("user", "p1") == {}
+
+    summary = metrics.summary()
+    assert summary["F/A"]["calls"] == 2 and summary["F/A"]["input_tokens"] == 15
+    assert summary["G/A"]["retries"] == 2
+    assert summary["G/B"]["cached_ratio"] == 0
+
+
+def test_cached_input_ratio():
+    metrics = LLMMetrics()
+    metrics.record(CallRecord(function="F", client="A", duration_ms=10, input_tokens=1_000, cached_input_tokens=0))
+    metrics.record(CallRecord(function="F", client="A", duration_ms=10, input_tokens=1_000, cached_input_tokens=900))
+    metrics.record(CallRecord(function="G", client="A", duration_ms=10))
+
+    summary = metrics.summary()
+    assert summary["F/A"]["cached_ratio"] == pytest.approx(0.45)
+    assert summary["G/A"]["cached_ratio"] is None
+
+
+def test_usage_cost_counts_output_tokens():
+    usage = {"unknown-model": {"input_tokens": 1_000, "output_tokens": 500, "total_tokens": 1_500}}
+    assert usage_cost(usage) == pytest.approx(1_000 * INPUT_TOKEN_COEFFICIENT + 500 * OUTPUT_TOKEN_COEFFICIENT)
+    assert usage_cost({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_client_records_calls_and_failures():
+    metrics = LLMMetrics()
+    client = FakeBamlClient()
+    b = instrument(client, metrics)
+
+    assert await b.Echo("hello") == "hello"
+    with pytest.raises(RuntimeError):
+        await b.Echo("fail")
+    # Non-function attributes are passed through
+    assert b.with_options() is client
+
+    assert all(isinstance(options["collector"], Collector) for options in client.options)
+    stats = metrics.stats[("Echo", "unknown")]
+    assert stats.calls == 2 and stats.failures == 1
+    assert stats.duration.total == 2
+
+
+@pytest.mark.asyncio
+async def test_instrumented_stream_records_time_to_first_token():
+    metrics = LLMMetrics()
+    client = FakeBamlClient()
+    b = instrument(client, metrics)
+    existing = Collector(name="existing")
+
+    stream = b.stream.Echo("a b c", baml_options={"collector": existing})
+    assert [part async for part in stream] == ["a", "b", "c"]
+    assert await stream.get_final_response() == "abc"
+
+    # Collectors passed by the caller are kept
+    assert client.stream.options[0]["collector"][0] is existing
+    stats = metrics.stats[("Echo", "unknown")]
+    assert stats.calls == 1
+    assert stats.ttft.total == 1
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from breba_app.coder_agent import model_router as router_mod
+from breba_app.coder_agent.model_router import (ModelRouter, RoutingFeatures, FAST_CLIENT, STANDARD_CLIENT,
+                                                STRONG_CLIENT)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_regular_edits_stay_on_the_fast_client_and_restructuring_goes_to_the_strong_one():
+    router = ModelRouter(clock=FakeClock())
+    simple = RoutingFeatures(request="Change the button color to blue", file_count=1, context_chars=2_000)
+    regular = RoutingFeatures(request="Add a testimonials section", file_count=2, context_chars=8_000)
+    complex_ = RoutingFeatures(request="Restructure the site into a responsive layout", file_count=2)
+    assert router.route("F", simple)[0] == FAST_CLIENT
+    assert router.route("F", regular)[0] == FAST_CLIENT
+    assert router.route("F", complex_)[0] == STRONG_CLIENT
+    # Many files or a large context are treated as complex, retries move to stronger clients
+    assert router.route("F", RoutingFeatures(request="Fix the typo", file_count=5))[0] == STRONG_CLIENT
+    assert router.route("F", RoutingFeatures(request="Fix the typo", file_count=1, retry=1))[0] == STANDARD_CLIENT
+    assert router.route("F", RoutingFeatures(request="Fix the typo", retry=5)) == [STRONG_CLIENT, STANDARD_CLIENT,
+                                                                                  FAST_CLIENT]
+
+
+def test_failing_client_is_skipped_until_cooldown_ends():
+    clock = FakeClock()
+    router = ModelRouter(clock=clock)
+    simple = RoutingFeatures(request="Change the title text", file_count=1)
+    for _ in range(3):
+        router.stats[FAST_CLIENT].record(latency=None, failed=True, now=clock())
+    assert router.route("F", simple) == [STANDARD_CLIENT, STRONG_CLIENT, FAST_CLIENT]
+
+    clock.now += router_mod.COOLDOWN_SECONDS + 1
+    assert router.route("F", simple)[0] == FAST_CLIENT
+
+
+def test_slow_client_is_degraded_until_a_probe_call():
+    clock = FakeClock()
+    router = ModelRouter(clock=clock)
+    font = RoutingFeatures(request="Change the font", file_count=1)
+    router.stats[FAST_CLIENT].record(latency=router_mod.FIRST_TOKEN_TIMEOUTS[FAST_CLIENT], failed=False, now=0)
+    assert router.route("F", font)[0] == STANDARD_CLIENT
+
+    clock.now += router_mod.PROBE_INTERVAL_SECONDS
+    assert router.route("F", font)[0] == FAST_CLIENT
+    # A fast answer to the probe brings the client back
+    for _ in range(5):
+        router.stats[FAST_CLIENT].record(latency=1.0, failed=False, now=clock())
+    assert router.route("F", font)[0] == FAST_CLIENT
+
+
+@pytest.mark.asyncio
+async def test_call_falls_back_when_the_first_token_is_late(monkeypatch):
+    monkeypatch.setitem(router_mod.FIRST_TOKEN_TIMEOUTS, FAST_CLIENT, 0.01)
+    router = ModelRouter()
+    called = []
+
+    async def call(client: str, progress) -> str:
+        called.append(client)
+        if client == FAST_CLIENT:
+            await asyncio.sleep(1)
+        progress()
+        return client
+
+    result = await router.call("F", RoutingFeatures(request="Change the link color", file_count=1), call)
+    assert result == STANDARD_CLIENT
+    assert called == [FAST_CLIENT, STANDARD_CLIENT]
+    assert router.stats[FAST_CLIENT].error_rate > 0
+    assert router.stats[STANDARD_CLIENT].latency is not None
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_fall_back_on_other_errors():
+    router = ModelRouter()
+
+    async def call(client: str, progress) -> str:
+        raise ValueError(client)
+
+    with pytest.raises(ValueError):
+        await router.call("F", RoutingFeatures(), call)
+
+
+@pytest.mark.asyncio
+async def test_long_generation_is_not_cut_off_while_tokens_arrive(monkeypatch):
+    monkeypatch.setitem(router_mod.FIRST_TOKEN_TIMEOUTS, FAST_CLIENT, 0.05)
+    monkeypatch.setattr(router_mod, "STALL_TIMEOUT_SECONDS", 0.05)
+    router = ModelRouter()
+    called = []
+
+    async def call(client: str, progress) -> str:
+        called.append(client)
+        # Runs for several times the timeouts, but never goes quiet for long
+        for _ in range(10):
+            await asyncio.sleep(0.02)
+            progress()
+        if client == FAST_CLIENT:
+            await asyncio.sleep(1)
+        return client
+
+    result = await router.call("F", RoutingFeatures(request="Fix the typo", file_count=1), call)
+    # The first client stalled after its last token
+    assert result == STANDARD_CLIENT
+    assert called == [FAST_CLIENT, STANDARD_CLIENT]
+    assert router.stats[STANDARD_CLIENT].latency < 0.05
@@ -0,0 +1,224 @@
+import asyncio
+import gc
+
+import pytest
+
+from breba_app import orchestrator, status_service
+from breba_app.coder_agent.baml_client.stream_types import Coder as CoderStream, ResponseToUser as ResponseToUserStream
+from breba_app.coder_agent.baml_client.types import LLMMessage, Coder, ResponseToUser
+from breba_app.context_budget import budget_for, count_tokens
+from breba_app.filesystem.in_memory_store import from_raw_strings
+from breba_app.orchestrator import OrchestratorState, MESSAGE_TOO_LARGE_MSG, edit_product, save_state, load_state
+
+
+@pytest.fixture(autouse=True)
+def no_ui(monkeypatch):
+    async def no_signal():
+        return
+
+    monkeypatch.setattr(status_service, "signal_task_started", no_signal)
+    monkeypatch.setattr(status_service, "signal_task_completed", no_signal)
+
+
+def _state(messages: list[LLMMessage] | None = None) -> OrchestratorState:
+    return OrchestratorState(messages=messages or [], executive_summary="",
+                             filestore=from_raw_strings({"index.html": "<h1>Acme</h1>"}))
+
+
+def test_latest_message_over_budget_is_truncated():
+    huge = LLMMessage(role="user", content="Use this copy:\n" + "lorem ipsum " * 100_000)
+    state = _state([LLMMessage(role="user", content="Build me a site"), huge])
+
+    fitted = state.fit_messages("CoderAgent")
+
+    assert len(fitted) == 1
+    assert fitted[0].content.startswith("Use this copy:")
+    assert count_tokens(fitted[0]) <= budget_for("CoderAgent")
+
+
+def test_spec_over_budget_is_truncated_instead_of_evicted():
+    spec = "<spec>" + "section details " * 50_000
+    state = _state([LLMMessage(role="user", content="Build me a bakery site"),
+                    LLMMessage(role="assistant", content=spec),
+                    LLMMessage(role="user", content="Let's use this specification to build the website")])
+
+    fitted = state.fit_spec_handoff("CoderAgent")
+
+    assert [message.role for message in fitted] == ["user", "assistant", "user"]
+    assert fitted[0].content == "Build me a bakery site"
+    assert fitted[1].content.startswith("<spec>section details")
+    assert sum(count_tokens(message) for message in fitted) <= budget_for("CoderAgent")
+
+
+def test_spec_within_budget_is_sent_as_is():
+    messages = [LLMMessage(role="user", content="Build me a bakery site"),
+                LLMMessage(role="assistant", content="<spec>Bakery</spec>"),
+                LLMMessage(role="user", content="Let's use this specification to build the website")]
+
+    assert _state(list(messages)).fit_spec_handoff("CoderAgent") == messages
+
+
+@pytest.mark.asyncio
+async def test_message_too_large_is_rejected(monkeypatch):
+    state = _state()
+    save_state("user", "too-large", state)
+
+    async def unexpected(**kwargs):
+        raise AssertionError("UserResponseOrCoder must not be called")
+
+    monkeypatch.setattr(orchestrator, "stream_user_response_or_coder", unexpected)
+    replies = []
+
+    async def stream_to_user(reply):
+        replies.append(reply)
+
+    async def coder_completed(*args):
+        raise AssertionError("The coder must not run")
+
+    await edit_product("user", "too-large", "lorem ipsum " * 100_000, coder_completed, stream_to_user)
+
+    assert replies == [MESSAGE_TOO_LARGE_MSG]
+    assert load_state("user", "too-large").messages == []
+
+
+class FakeStream:
+    """UserResponseOrCoder stream: the partials, then the final response (or its error)"""
+
+    def __init__(self, partials: list, final):
+        self.partials = partials
+        self.final = final
+        self.yielded = 0
+
+    async def __aiter__(self):
+        for partial in self.partials:
+            self.yielded += 1
+            yield partial
+            await asyncio.sleep(0.01)
+
+    async def get_final_response(self):
+        if isinstance(self.final, Exception):
+            raise self.final
+        return self.final
+
+
+class Speculation:
+    """Fake read_files_to_edit that records how it was started and how it ended"""
+
+    def __init__(self, stream: FakeStream, *, duration: float = 0.0, error: Exception | None = None):
+        self.stream = stream
+        self.duration = duration
+        self.error = error
+        self.started_after: list[int] = []
+        self.cancelled = False
+
+    async def __call__(self, *, original_context, filestore):
+        self.started_after.append(self.stream.yielded)
+        try:
+            await asyncio.sleep(self.duration)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return "index.html contents", {"index.html"}
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    """Runs edit_product on a fake stream, the coder and the event bus are faked"""
+    coder_calls = []
+    replies = []
+
+    async def run_coder(messages, file_store, files_to_edit=None):
+        coder_calls.append(files_to_edit)
+        return LLMMessage(role="assistant", content="Done")
+
+    async def emit(event, **kwargs):
+        return
+
+    async def stream_to_user(reply):
+        if isinstance(reply, str):
+            replies.append(reply)
+            return
+        async for token in reply:
+            replies.append(token)
+
+    async def coder_completed(*args):
+        return
+
+    monkeypatch.setattr(orchestrator, "_run_coder_with_preview", run_coder)
+    monkeypatch.setattr(orchestrator.event_bus, "emit", emit)
+
+    async def run(stream: FakeStream, speculation: Speculation):
+        async def stream_user_response_or_coder(**kwargs):
+            return stream
+
+        monkeypatch.setattr(orchestrator, "stream_user_response_or_coder", stream_user_response_or_coder)
+        monkeypatch.setattr(orchestrator, "read_files_to_edit", speculation)
+        save_state("user", "speculation", _state())
+        await edit_product("user", "speculation", "Add a testimonials section", coder_completed, stream_to_user)
+
+    run.coder_calls = coder_calls
+    run.replies = replies
+    return run
+
+
+@pytest.mark.asyncio
+async def test_file_selection_starts_on_first_coder_partial_and_is_reused(chat):
+    stream = FakeStream([CoderStream(), CoderStream(invoke_coder=True), CoderStream(invoke_coder=True)],
+                        Coder(invoke_coder=True))
+    speculation = Speculation(stream)
+
+    await chat(stream, speculation)
+
+    # Started once, while the rest of the stream was still coming
+    assert speculation.started_after == [2]
+    assert chat.coder_calls == [("index.html contents", {"index.html"})]
+
+
+@pytest.mark.asyncio
+async def test_file_selection_is_cancelled_when_the_answer_is_for_the_user(chat):
+    stream = FakeStream([CoderStream(invoke_coder=True), ResponseToUserStream(response_to_user="Which section?")],
+                        ResponseToUser(response_to_user="Which section?"))
+    speculation = Speculation(stream, duration=10)
+
+    await chat(stream, speculation)
+
+    assert speculation.cancelled
+    assert chat.coder_calls == []
+    assert chat.replies == ["Which section?"]
+
+
+@pytest.mark.asyncio
+async def test_file_selection_is_cancelled_when_the_stream_fails(chat):
+    stream = FakeStream([CoderStream(invoke_coder=True)], RuntimeError("provider error"))
+    speculation = Speculation(stream, duration=10)
+
+    with pytest.raises(RuntimeError):
+        await chat(stream, speculation)
+
+    assert speculation.cancelled
+    assert chat.coder_calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_speculation_leaves_no_unretrieved_task_exception(chat):
+    unretrieved = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: unretrieved.append(context["message"]))
+    try:
+        for final in (ResponseToUser(response_to_user="Hello"), RuntimeError("provider error")):
+            stream = FakeStream([CoderStream(invoke_coder=True), ResponseToUserStream(response_to_user="Hello")],
+                                final)
+            speculation = Speculation(stream, error=ValueError("no files"))
+            try:
+                await chat(stream, speculation)
+            except RuntimeError:
+                pass
+            assert not speculation.cancelled
+        await asyncio.sleep(0.05)
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unretrieved == []
@@ -0,0 +1,101 @@
+import hashlib
+
+import pytest
+
+from breba_app.filesystem import OverlayFileStore
+from breba_app.filesystem.in_memory_store import from_raw_strings
+from breba_app.search_replace_editing import apply_edits_many, EditRequest
+
+
+class CountingStore:
+    """Wraps an InMemoryFileStore and counts reads so we can assert on overlay caching."""
+
+    def __init__(self, initial: dict[str, str]):
+        self._store = from_raw_strings(initial)
+        self.reads = 0
+
+    def read_text(self, path: str) -> str:
+        self.reads += 1
+        return self._store.read_text(path)
+
+    def write_text(self, path: str, content: str) -> None:
+        self._store.write_text(path, content)
+
+    def list_files(self) -> list[str]:
+        return self._store.list_files()
+
+    def file_exists(self, path: str) -> bool:
+        return self._store.file_exists(path)
+
+
+@pytest.fixture
+def base():
+    return CountingStore({"index.html": "<h1>Hello</h1>\n", "styles.css": "h1 { color: red; }\n"})
+
+
+def test_reads_fall_through_and_are_cached(base):
+    overlay = OverlayFileStore(base)
+    assert overlay.read_text("index.html") == "<h1>Hello</h1>\n"
+    assert overlay.read_text("index.html") == "<h1>Hello</h1>\n"
+    assert base.reads == 1
+    with pytest.raises(FileNotFoundError):
+        overlay.read_text("missing.html")
+
+
+def test_writes_do_not_reach_base_until_commit(base):
+    overlay = OverlayFileStore(base)
+    overlay.write_text("index.html", "<h1>Hi</h1>\n")
+    overlay.write_text("faq.html", "<h1>FAQ</h1>\n")
+
+    assert overlay.read_text("index.html") == "<h1>Hi</h1>\n"
+    assert base.read_text("index.html") == "<h1>Hello</h1>\n"
+    assert not base.file_exists("faq.html")
+    assert overlay.list_files() == ["faq.html", "index.html", "styles.css"]
+
+    assert overlay.commit() == ["faq.html", "index.html"]
+    assert base.read_text("index.html") == "<h1>Hi</h1>\n"
+    assert base.read_text("faq.html") == "<h1>FAQ</h1>\n"
+    assert overlay.dirty == set()
+
+
+def test_modified_files_ignores_identical_writes(base):
+    overlay = OverlayFileStore(base)
+    overlay.write_text("index.html", "<h1>Hello</h1>\n")
+    overlay.write_text("styles.css", "h1 { color: blue; }\n")
+
+    assert overlay.dirty == {"index.html", "styles.css"}
+    assert overlay.modified_files() == ["styles.css"]
+    assert overlay.changes() == {"styles.css": "h1 { color: blue; }\n"}
+
+
+def test_rollback_discards_writes(base):
+    overlay = OverlayFileStore(base)
+    overlay.write_text("index.html", "<h1>Broken</h1>\n")
+    overlay.rollback()
+
+    assert overlay.read_text("index.html") == "<h1>Hello</h1>\n"
+    assert overlay.modified_files() == []
+    assert overlay.commit() == []
+    assert base.read_text("index.html") == "<h1>Hello</h1>\n"
+
+
+def test_sha256_is_cached_per_entry(base):
+    overlay = OverlayFileStore(base)
+    expected = hashlib.sha256("<h1>Hello</h1>\n".encode("utf-8")).hexdigest()
+    assert overlay.sha256("index.html") == expected
+    overlay.write_text("index.html", "<h1>Hi</h1>\n")
+    assert overlay.sha256("index.html") == hashlib.sha256("<h1>Hi</h1>\n".encode("utf-8")).hexdigest()
+
+
+def test_apply_edits_many_on_overlay(base):
+    overlay = OverlayFileStore(base)
+    edits = [
+        EditRequest("index.html", "<h1>Hello</h1>\n", "<h1>Hello Universe</h1>\n"),
+        EditRequest("about.html", "", "<h1>About</h1>\n"),
+    ]
+    apply_edits_many(overlay, edits)
+
+    assert overlay.modified_files() == ["about.html", "index.html"]
+    assert base.read_text("index.html") == "<h1>Hello</h1>\n"
+    assert "about.html" in overlay
+    assert "missing.html" not in overlay
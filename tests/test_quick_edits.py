@@ -0,0 +1,126 @@
+from datetime import date
+
+from breba_app.coder_agent.agent import run_quick_edit
+from breba_app.coder_agent.quick_edits import match_quick_edit
+from breba_app.filesystem.in_memory_store import from_raw_strings
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <title>Crumb Bakery</title>
+  <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+  <h1>Fresh bread every day</h1>
+  <p>Call us at <a href="tel:+15551234567">(555) 123-4567</a> or write to hello@crumb.com</p>
+  <a class="btn" href="#menu">See the menu</a>
+  <footer>Questions? (555) 123-4567</footer>
+</body>
+</html>
+"""
+
+STYLES = """body {
+  color: #333;
+}
+
+.btn {
+  background-color: #c0392b;
+  color: white;
+}
+
+.btn:hover {
+  background-color: #a93226;
+}
+"""
+
+SITEMAP = """<urlset>
+  <url>
+    <loc>https://crumb.com/</loc>
+    <lastmod>2024-01-01</lastmod>
+  </url>
+</urlset>
+"""
+
+
+def _store(**overrides):
+    files = {"index.html": PAGE, "styles.css": STYLES, "sitemap.xml": SITEMAP}
+    files.update(overrides)
+    return from_raw_strings(files)
+
+
+def test_title_is_changed_and_sitemap_touched():
+    store = _store()
+    applied, message = run_quick_edit(request="Please change the title to Crumb & Co.", filestore=store)
+    assert applied.intent == "title"
+    assert "<title>Crumb &amp; Co</title>" in store.read_text("index.html")
+    assert f"<lastmod>{date.today().isoformat()}</lastmod>" in store.read_text("sitemap.xml")
+    assert message.content == "UPDATED_FILES:\n- index.html\n- sitemap.xml"
+
+
+def test_button_color_changes_only_the_button_rule():
+    store = _store()
+    applied, _ = run_quick_edit(request="make the button blue", filestore=store)
+    assert applied.intent == "color"
+    styles = store.read_text("styles.css")
+    assert ".btn {\n  background-color: blue;" in styles
+    assert "background-color: #a93226;" in styles
+    assert store.read_text("sitemap.xml") == SITEMAP
+
+
+def test_phone_number_is_replaced_everywhere_including_tel_links():
+    store = _store()
+    run_quick_edit(request="Replace the phone number with +1 555 987 6543", filestore=store)
+    page = store.read_text("index.html")
+    assert 'href="tel:+15559876543">+1 555 987 6543</a>' in page
+    assert "Questions? +1 555 987 6543" in page
+    assert "123-4567" not in page
+
+
+def test_email_is_replaced_in_links_and_text_but_not_asset_names():
+    page = PAGE.replace("<h1>", '<img src="hero@2x.png" alt="Bread"><h1>').replace(
+        "write to hello@crumb.com", 'write to <a href="mailto:hello@crumb.com?subject=Hi">hello@crumb.com</a>')
+    store = _store(**{"index.html": page})
+    applied, _ = run_quick_edit(request="Change the email to orders@crumb.com", filestore=store)
+    assert applied.intent == "email"
+    page = store.read_text("index.html")
+    assert '<a href="mailto:orders@crumb.com?subject=Hi">orders@crumb.com</a>' in page
+    assert 'src="hero@2x.png"' in page
+    assert "hello@crumb.com" not in page
+
+
+def test_phone_numbers_in_scripts_are_never_rewritten():
+    script = '<script>var orderLimit = "800 555 0199";</script>\n</body>'
+    store = _store(**{"index.html": PAGE.replace("</body>", script)})
+    run_quick_edit(request="Replace the phone number with +1 555 987 6543", filestore=store)
+    page = store.read_text("index.html")
+    assert "Questions? +1 555 987 6543" in page
+    assert 'var orderLimit = "800 555 0199";' in page
+
+    # The shown number is also in JSON-LD, the coder has to keep them consistent
+    json_ld = '<script type="application/ld+json">{"telephone": "(555) 123-4567"}</script>\n</body>'
+    store = _store(**{"index.html": PAGE.replace("</body>", json_ld)})
+    assert match_quick_edit("Replace the phone number with +1 555 987 6543", store) is None
+    # Two different numbers are shown
+    store = _store(**{"index.html": PAGE.replace("Questions? (555) 123-4567", "Questions? (555) 765-4321")})
+    assert match_quick_edit("Replace the phone number with +1 555 987 6543", store) is None
+
+
+def test_quoted_text_is_replaced_in_visible_text_only():
+    store = _store()
+    run_quick_edit(request='Change "See the menu" to "Browse our menu"', filestore=store)
+    assert '<a class="btn" href="#menu">Browse our menu</a>' in store.read_text("index.html")
+
+    # "btn" only appears in markup, the coder has to decide what the user means
+    assert match_quick_edit('Replace "btn" with "button"', store) is None
+
+
+def test_ambiguous_or_compound_requests_fall_back_to_the_llm():
+    store = _store(**{"about.html": PAGE.replace("Crumb Bakery", "About us")})
+    # Two pages have a title
+    assert match_quick_edit("Change the title to Crumb & Co", store) is None
+    # Not in the catalog
+    assert match_quick_edit("Add a gallery section with six photos", store) is None
+    assert match_quick_edit("Make the button blue and change the heading to Hello", _store()) is None
+    # No rule sets the link color yet
+    assert match_quick_edit("make the links red", _store()) is None
+    assert match_quick_edit("make the button bluish", _store()) is None
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+import breba_app.coder_agent.scaffold as scaffold_mod
+from breba_app.coder_agent.baml_client.types import SitePlan, SiteSection, SectionCode
+from breba_app.filesystem import InMemoryFileStore
+
+PLAN = SitePlan(
+    title="Acme & Co",
+    description="Fresh bread daily",
+    design_tokens=":root { --color-primary: #c00; }",
+    base_css="body { color: var(--color-primary); }",
+    sections=[
+        SiteSection(id="hero", tag="header", instructions="Big title"),
+        SiteSection(id="pricing", tag="section", instructions="Three plans"),
+        SiteSection(id="footer", tag="footer", instructions="Contacts"),
+    ],
+)
+
+
+@pytest.mark.asyncio
+async def test_sections_are_generated_concurrently_and_stitched(monkeypatch):
+    running, max_running = 0, 0
+
+    async def fake_plan(spec, assets):
+        return PLAN
+
+    async def fake_generate_section(spec, plan, section, assets):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return SectionCode(html=f'<{section.tag} id="{section.id}">{section.instructions}</{section.tag}>',
+                           css=f"#{section.id} {{ padding: 1rem; }}")
+
+    monkeypatch.setattr(scaffold_mod.b, "PlanSiteSections", fake_plan)
+    monkeypatch.setattr(scaffold_mod.b, "GenerateSection", fake_generate_section)
+    monkeypatch.setattr(scaffold_mod, "MAX_PARALLEL_SECTIONS", 2)
+    store = InMemoryFileStore()
+
+    modified = await scaffold_mod.scaffold_site(spec="A bakery", filestore=store)
+
+    assert modified == ["index.html", "robots.txt", "sitemap.xml", "styles.css", "tokens.css"]
+    assert max_running == 2
+    index = store.read_text("index.html")
+    assert "<title>Acme &amp; Co</title>" in index
+    assert index.index('id="hero"') < index.index('id="pricing"') < index.index('id="footer"')
+    assert '<link rel="stylesheet" href="tokens.css">' in index
+    assert store.read_text("tokens.css") == ":root { --color-primary: #c00; }\n"
+    assert "/* pricing */\n#pricing { padding: 1rem; }" in store.read_text("styles.css")
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_written_when_a_section_fails(monkeypatch):
+    async def fake_plan(spec, assets):
+        return PLAN
+
+    cancelled = []
+
+    async def fake_generate_section(spec, plan, section, assets):
+        if section.id == "pricing":
+            raise RuntimeError("LLM failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(section.id)
+            raise
+        return SectionCode(html="<header></header>", css="")
+
+    monkeypatch.setattr(scaffold_mod.b, "PlanSiteSections", fake_plan)
+    monkeypatch.setattr(scaffold_mod.b, "GenerateSection", fake_generate_section)
+    store = InMemoryFileStore()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(scaffold_mod.scaffold_site(spec="A bakery", filestore=store), timeout=1)
+    assert store.list_files() == []
+    # The sections still being generated are cancelled, not left running
+    assert sorted(cancelled) == ["footer", "hero"]
+
+
+@pytest.mark.asyncio
+async def test_uploaded_assets_are_given_to_the_plan_and_every_section(monkeypatch):
+    assets = "https://cdn/acme/1/assets contains the following files:\n- logo.png (Company logo)"
+    seen = []
+
+    async def fake_plan(spec, assets):
+        seen.append(("plan", assets))
+        return PLAN
+
+    async def fake_generate_section(spec, plan, section, assets):
+        seen.append((section.id, assets))
+        return SectionCode(html=f'<{section.tag} id="{section.id}"></{section.tag}>', css="")
+
+    monkeypatch.setattr(scaffold_mod.b, "PlanSiteSections", fake_plan)
+    monkeypatch.setattr(scaffold_mod.b, "GenerateSection", fake_generate_section)
+
+    await scaffold_mod.scaffold_site(spec="A bakery", filestore=InMemoryFileStore(), assets=assets)
+
+    assert sorted(seen) == sorted([("plan", assets), ("hero", assets), ("pricing", assets), ("footer", assets)])
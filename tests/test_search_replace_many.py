@@ -1181,4 +1181,31 @@ def test_apply_search_replace_many_empty_file(search_replace_block, file_content
     except ApplyEditsError as e:
         assert "Content is empty" in str(e)
     else:
-        assert False, "Must raise error"
\ No newline at end of file
+        assert False, "Must raise error"
+
+
+def test_apply_search_replace_many_failed_edits_carry_regions():
+    content = "<ul>\n<li>One</li>\n<li>Two</li>\n<li>Three</li>\n</ul>\n"
+    search_replace = """index.html
+```
+<<<<<<< SEARCH
+<li>Two</li>
+<li>Thre</li>
+</ul>
+=======
+<li>Two</li>
+<li>Four</li>
+</ul>
+>>>>>>> REPLACE
+```
+"""
+    files = {"index.html": content}
+    try:
+        apply_search_replace_many(files, search_replace)
+    except ApplyEditsError as e:
+        assert len(e.failed_edits) == 1
+        assert e.failed_edits[0].edit.path == "index.html"
+        assert e.failed_edits[0].region == (2, 5)
+        assert e.failed_edits[0].message == e.failed[0]
+    else:
+        assert False, "Must raise error"
@@ -0,0 +1,97 @@
+from breba_app.coder_agent.baml_client.types import LLMMessage
+from breba_app.coder_agent.site_outline import build_outline, page_spec, relevant_sections, _outline_cache, \
+    FULL_PAGE_MAX_BYTES
+from breba_app.filesystem import FileWrite, InMemoryFileStore, OverlayFileStore
+from breba_app.filesystem.in_memory_store import from_raw_strings
+
+SECTION = """    <section id="section-{i}">
+        <h2>Section {i}</h2>
+        <p>Paragraph about topic {i} with some filler text to make the page bigger than the limit.</p>
+    </section>
+"""
+
+
+def _page(sections: int) -> str:
+    body = "".join(SECTION.format(i=i) for i in range(sections))
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Acme Bakery</title>
+    <meta name="description" content="Fresh bread daily">
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+    <header><nav><a href="#section-0">Home</a></nav><h1>Acme <em>Bakery</em></h1></header>
+    <main>
+{body}    </main>
+    <footer id="contact"><p>Call us at 555-0100<br>Open daily</footer>
+    <script src="script.js"></script>
+</body>
+</html>
+"""
+
+
+def test_outline_structure():
+    outline = build_outline(_page(2))
+
+    assert outline.title == "Acme Bakery"
+    assert outline.description == "Fresh bread daily"
+    assert outline.assets == ["styles.css", "script.js"]
+    assert outline.links == ["#section-0"]
+    assert [(node.label, node.depth) for node in outline.nodes] == [
+        ("header", 0), ("nav", 1), ("main", 0), ("section#section-0", 1), ("section#section-1", 1),
+        ("footer#contact", 0),
+    ]
+    assert outline.nodes[0].headings == ["h1 Acme Bakery"]
+    assert outline.nodes[3].headings == ["h2 Section 0"]
+    # Unclosed <p> inside the footer does not leave the footer open
+    assert outline.nodes[-1].full_text == "Call us at 555-0100 Open daily"
+    html = _page(2)
+    section = outline.nodes[3]
+    assert html.encode("utf-8")[section.start:section.end].decode().startswith('<section id="section-0">')
+    assert html.encode("utf-8")[section.start:section.end].decode().endswith("</section>")
+
+
+def test_outline_is_cached_by_content():
+    _outline_cache.clear()
+    assert build_outline(_page(2)) is build_outline(_page(2))
+    assert len(_outline_cache) == 1
+
+
+def test_small_pages_are_sent_in_full():
+    page = _page(1)
+    assert len(page) < FULL_PAGE_MAX_BYTES
+    store = from_raw_strings({"index.html": page})
+    assert page_spec(store, "index.html") == page
+    assert page_spec(store, "missing.html") == ""
+    assert relevant_sections(store, "index.html", [LLMMessage(role="user", content="Change topic 0")]) == ""
+
+
+def test_large_pages_are_outlined_and_relevant_sections_sent_separately():
+    page = _page(200)
+    store = from_raw_strings({"index.html": page, "styles.css": "x" * 2048})
+    messages = [LLMMessage(role="user", content="What is the phone number to call us?")]
+
+    spec = page_spec(store, "index.html")
+    sections = relevant_sections(store, "index.html", messages)
+
+    assert len(spec) < len(page) / 2
+    assert "title: Acme Bakery" in spec
+    assert "assets: styles.css (2.0 KB), script.js" in spec
+    assert "  - section#section-199" in spec
+    assert sections == "- footer#contact\n  text: Call us at 555-0100 Open daily"
+    # The outline ahead of the conversation does not change with the request
+    assert "text:" not in spec
+
+
+def test_binary_assets_are_listed_without_decoding():
+    page = _page(200).replace("<main>", '<main><img src="./hero.png">')
+    store = InMemoryFileStore({
+        "index.html": FileWrite("index.html", page.encode("utf-8")),
+        "styles.css": FileWrite("styles.css", b"x" * 2048),
+        "hero.png": FileWrite("hero.png", b"\x89PNG\r\n\x1a\n\xff\xd8\xff" * 100),
+    })
+
+    spec = page_spec(OverlayFileStore(store), "index.html")
+
+    assert "assets: styles.css (2.0 KB), ./hero.png, script.js" in spec
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from breba_app import status_service
+from breba_app.status_service import agent_task_context, update_status, Task, _current_task
+
+
+class FakeMessage:
+    def __init__(self):
+        self.content = ""
+        self.rendered: list[str] = []
+        self.sent = 0
+
+    async def stream_token(self, token: str, is_sequence: bool = False):
+        await asyncio.sleep(0.01)
+        self.content = token if is_sequence else self.content + token
+        self.rendered.append(self.content)
+
+    async def send(self):
+        self.sent += 1
+
+
+@pytest.fixture
+def fake_message(monkeypatch):
+    message = FakeMessage()
+
+    async def no_signal():
+        return
+
+    monkeypatch.setattr(status_service, "signal_task_started", no_signal)
+    monkeypatch.setattr(status_service, "signal_task_completed", no_signal)
+    monkeypatch.setattr(status_service, "STATUS_FRAME_SECONDS", 0.02)
+    original_init = Task.__init__
+
+    def init(self):
+        original_init(self)
+        self.msg = message
+
+    monkeypatch.setattr(Task, "__init__", init)
+    return message
+
+
+@pytest.mark.asyncio
+async def test_superseded_statuses_are_dropped(fake_message):
+    async with agent_task_context():
+        update_status("Thinking...")
+        await asyncio.sleep(0)
+        for i in range(20):
+            update_status(f"Step {i}")
+        await asyncio.sleep(0.1)
+        update_status("Done")
+    await asyncio.sleep(0.1)
+
+    assert fake_message.rendered == ["Thinking...", "Step 19", "Done"]
+    assert fake_message.sent == 1
+    assert _current_task.get() is None
+
+
+@pytest.mark.asyncio
+async def test_task_completion_does_not_wait_for_statuses(fake_message):
+    started = time.perf_counter()
+    async with agent_task_context():
+        update_status("Coder is writing the code... " * 20)
+        update_status("The website is ready to be deployed. Use the 🚀 from the sidebar to deploy your website")
+    assert time.perf_counter() - started < 0.01
+
+    await asyncio.sleep(0.1)
+    assert fake_message.rendered[-1].startswith("The website is ready")
+    assert fake_message.sent == 1
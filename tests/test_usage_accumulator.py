@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from breba_app.controllers import usage_controller
+from breba_app.controllers.usage_controller import UsageAccumulator
+
+
+class FakeWriter:
+    def __init__(self, fail: int = 0):
+        self.writes = []
+        self.fail = fail
+
+    async def __call__(self, pending):
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("mongo unavailable")
+        self.writes.append({product_id: dict(counters) for product_id, counters in pending.items()})
+
+
+@pytest.mark.asyncio
+async def test_usage_is_aggregated_and_written_in_one_batch():
+    writer = FakeWriter()
+    accumulator = UsageAccumulator(write=writer)
+    accumulator.add("alice", "p1", cost=0.5, input_tokens=100, output_tokens=10)
+    accumulator.add("alice", "p1", cost=0.25, input_tokens=50, output_tokens=5)
+    accumulator.add("alice", "p2", cost=1.0, input_tokens=10)
+    accumulator.add("bob", "p3", cost=2.0)
+    assert writer.writes == []
+    assert accumulator.pending("p1") == {"cost": 0.75, "input_tokens": 150, "output_tokens": 15}
+
+    await accumulator.flush()
+    assert len(writer.writes) == 1
+    assert writer.writes[0]["p1"] == {"cost": 0.75, "input_tokens": 150, "output_tokens": 15}
+    assert set(writer.writes[0]) == {"p1", "p2", "p3"}
+    assert accumulator.pending("p1") == {}
+    assert accumulator.session_totals("alice") == {"cost": 1.75, "input_tokens": 160, "output_tokens": 15}
+
+    # Nothing pending, nothing written
+    await accumulator.flush()
+    assert len(writer.writes) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_counters():
+    writer = FakeWriter(fail=1)
+    accumulator = UsageAccumulator(write=writer)
+    accumulator.add("alice", "p1", cost=0.5)
+    await accumulator.flush()
+    accumulator.add("alice", "p1", cost=0.25)
+    await accumulator.flush()
+    assert writer.writes == [{"p1": {"cost": 0.75, "input_tokens": 0, "output_tokens": 0}}]
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_many_products_are_pending_and_on_stop(monkeypatch):
+    monkeypatch.setattr(usage_controller, "FLUSH_MAX_PRODUCTS", 2)
+    writer = FakeWriter()
+    accumulator = UsageAccumulator(write=writer)
+    accumulator.start(interval=60)
+    accumulator.add("alice", "p1", cost=0.1)
+    accumulator.add("alice", "p2", cost=0.1)
+    await asyncio.sleep(0)
+    assert len(writer.writes) == 1
+
+    accumulator.add("alice", "p3", cost=0.1)
+    await accumulator.stop()
+    assert writer.writes[1] == {"p3": {"cost": 0.1, "input_tokens": 0, "output_tokens": 0}}
+
+
+def test_report_usage_does_not_touch_the_database(monkeypatch):
+    accumulator = UsageAccumulator(write=FakeWriter())
+    monkeypatch.setattr(usage_controller, "usage_accumulator", accumulator)
+    usage_controller.report_usage("alice", "p1", {"CustomGPT5Mini": {"input_tokens": 1_000_000, "output_tokens": 0,
+                                                                     "total_tokens": 1_000_000}})
+    assert accumulator.pending("p1") == {"cost": pytest.approx(0.25), "input_tokens": 1_000_000, "output_tokens": 0}
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from breba_app.filesystem import FileWrite
+from breba_app.filesystem import versioned_r2
 from breba_app.filesystem.versioned_r2 import VersionedR2FileSystem, NotFound
 
 
@@ -39,6 +40,8 @@ def mock_s3():
 
 @pytest.fixture
 def fs(mock_s3):
+    versioned_r2._read_cache.clear()
+    versioned_r2._diff_cache.clear()
     return VersionedR2FileSystem(
         bucket_name="test-bucket",
         root_prefix="s1/alice",
@@ -128,3 +131,59 @@ def test_batch_write_atomic(fs, mock_s3):
 
     # Ensure pointer still at old version (1)
     assert fs.get_version() == 1
+
+
+@pytest.fixture
+def versioned_s3(mock_s3):
+    """mock_s3 that can also list version prefixes, so consecutive writes create consecutive versions"""
+
+    def list_objects_v2(Bucket, Prefix, Delimiter=None, **kwargs):
+        prefixes = {Prefix + key[len(Prefix):].split("/")[0] + "/"
+                    for bucket, key in mock_s3._storage if bucket == Bucket and key.startswith(Prefix)}
+        return {"CommonPrefixes": [{"Prefix": prefix} for prefix in sorted(prefixes)]} if prefixes else {}
+
+    mock_s3.list_objects_v2.side_effect = list_objects_v2
+    return mock_s3
+
+
+def _object_reads(mock_s3) -> list[str]:
+    return [call.kwargs["Key"] for call in mock_s3.get_object.call_args_list if "/manifests/" not in call.kwargs["Key"]]
+
+
+def test_diff_versions_only_reads_changed_files(fs, versioned_s3):
+    fs.batch_write([
+        FileWrite(path="index.html", content="<h1>Hello</h1>\n<p>Intro</p>\n"),
+        FileWrite(path="styles.css", content="h1 { color: red; }\n"),
+    ])
+    fs.batch_write([
+        FileWrite(path="index.html", content="<h1>Hello Universe</h1>\n<p>Intro</p>\n"),
+        FileWrite(path="faq.html", content="<h1>FAQ</h1>\n"),
+    ])
+    versioned_s3.get_object.reset_mock()
+
+    diffs = fs.diff_versions(1, 2)
+
+    assert [(d.path, d.status) for d in diffs] == [("faq.html", "added"), ("index.html", "modified")]
+    assert diffs[1].diff.startswith("--- v1/index.html\n+++ v2/index.html\n")
+    assert "-<h1>Hello</h1>\n+<h1>Hello Universe</h1>\n" in diffs[1].diff
+    assert not any(key.endswith("styles.css") for key in _object_reads(versioned_s3))
+
+
+def test_diff_versions_is_memoized(fs, versioned_s3):
+    fs.write_file("index.html", "one\n")
+    fs.write_file("index.html", "two\n")
+    first = fs.diff_versions(1, 2)
+    versioned_s3.get_object.reset_mock()
+
+    assert fs.diff_versions(1, 2) == first
+    assert _object_reads(versioned_s3) == []
+
+
+@pytest.mark.asyncio
+async def test_read_file_uses_read_cache(fs, mock_s3):
+    fs.write_file("index.html", "hello")
+    await fs.read_file("index.html")
+    mock_s3.get_object.reset_mock()
+
+    assert await fs.read_text("index.html") == "hello"
+    assert _object_reads(mock_s3) == []